@@ -0,0 +1,54 @@
+import contextvars
+import datetime
+import json
+import logging
+import os
+
+# Set per request by the API middleware; every record logged while handling it carries the id
+request_id_var = contextvars.ContextVar("request_id", default=None)
+
+# Attributes every LogRecord has; anything else was passed through ``extra=``
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message, request id and any ``extra`` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.datetime.fromtimestamp(record.created, tz=datetime.timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        request_id = request_id_var.get()
+        if request_id:
+            entry["request_id"] = request_id
+        for key, value in vars(record).items():
+            if key not in _RESERVED and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def configure_logging(level: str = None):
+    """Send the ``trip_planner`` loggers to stderr as JSON lines (idempotent).
+
+    The level comes from ``LOG_LEVEL`` when not given.
+    """
+    root = logging.getLogger("trip_planner")
+    root.setLevel((level or os.getenv("LOG_LEVEL", "INFO")).upper())
+    if not any(isinstance(handler.formatter, JsonFormatter) for handler in root.handlers):
+        handler = logging.StreamHandler()
+        handler.setFormatter(JsonFormatter())
+        root.addHandler(handler)
+        root.propagate = False
+    return root
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Logger under the ``trip_planner`` hierarchy, e.g. ``get_logger(__name__)``."""
+    if not logging.getLogger("trip_planner").handlers:
+        configure_logging()
+    return logging.getLogger(f"trip_planner.{name}")
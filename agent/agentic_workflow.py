@@ -1,16 +1,45 @@
 from utils.models_loader import ModelLoader
 from prompt_library.prompt import SYSTEM_PROMPT
+import json
+import time
+from typing import Annotated, Optional
+from langchain_core.messages import AIMessage, SystemMessage, ToolMessage
 from langgraph.graph import StateGraph, MessagesState, END, START
-from langgraph.prebuilt import ToolNode, tools_condition
+from pydantic import ValidationError
+from agent.tool_executor import ParallelToolExecutor
+from agent.research import ResearchStage
+from agent.context import ContextBudget, compact_payload
+from utils.metrics import observe_llm_turn
+from utils.itinerary import ITINERARY_TOOL, Itinerary
 from tools.weather_tool import WeatherInfoTool
 from tools.place_search_tool import PlaceSearchTool
 from tools.calculator_tool import CalculatorTool
 from tools.currency_conversion_tool import CurrencyConverterTool
 
+def extend_latencies(records: Optional[list], new: Optional[list]) -> list:
+    """Reducer for ``tool_latencies``: tool steps append their records and None clears them.
+
+    Callers start each run with ``"tool_latencies": None`` in its input, so
+    a checkpointed thread reports only the current run's tool calls.
+    """
+    if new is None:
+        return []
+    return (records or []) + new
+
+
+class TripPlannerState(MessagesState):
+    """Conversation messages plus per-tool latency records, pre-fetched research and the final itinerary."""
+    tool_latencies: Annotated[list, extend_latencies]
+    research: dict
+    itinerary: Optional[dict]
+
+
 class GraphBuilder():
-    def __init__(self,model_provider: str = "groq"):
+    def __init__(self,model_provider: str = "groq", checkpointer=None):
+        self.checkpointer = checkpointer
         self.model_loader = ModelLoader(model_provider=model_provider)
         self.llm = self.model_loader.load_llm()
+        self.model_name = self.model_loader.model_label()
         
         self.tools = []
         
@@ -24,27 +53,90 @@ class GraphBuilder():
                            * self.calculator_tools.calculator_tool_list,
                            * self.currency_converter_tools.currency_converter_tool_list])
         
-        self.llm_with_tools = self.llm.bind_tools(tools=self.tools)
-        
+        # The model submits its final plan by "calling" the Itinerary schema
+        self.llm_with_tools = self.llm.bind_tools(tools=[*self.tools, Itinerary])
+        self.tool_executor = ParallelToolExecutor.from_config(self.tools, self.model_loader.config)
+
+        graph_settings = self.model_loader.config.get("graph", {}) or {}
+        self.mode = graph_settings.get("mode", "react")
+        if self.mode not in ("react", "research"):
+            raise ValueError(f"Unknown graph mode: {self.mode}")
+        self.research_stage = None
+        if self.mode == "research":
+            self.research_stage = ResearchStage(timeout=graph_settings.get("research_timeout_seconds", 20))
+
+        self.context_budget = ContextBudget.from_config(self.model_loader.config)
+
         self.graph = None
         
         self.system_prompt = SYSTEM_PROMPT
 
-    def agent_function(self,state: MessagesState):
+    async def agent_function(self,state: TripPlannerState):
         """Main agent function"""
-        user_question = state["messages"]
-        input_question = [self.system_prompt] + user_question
-        response = self.llm_with_tools.invoke(input_question)
-        return {"messages": [response]}
+        system_messages = [self.system_prompt]
+        if state.get("research"):
+            research = compact_payload(state["research"], self.context_budget.max_tool_output_chars)
+            system_messages.append(SystemMessage(
+                content="Pre-fetched research for this trip (use it instead of calling tools "
+                        "for the same data):\n" + json.dumps(research, ensure_ascii=False, default=str)
+            ))
+        # Saved threads keep growing; only what fits the token budget goes to the model
+        input_question = self.context_budget.build(system_messages, state["messages"])
+        start = time.perf_counter()
+        response = await self.llm_with_tools.ainvoke(input_question)
+        observe_llm_turn(self.model_name, time.perf_counter() - start, getattr(response, "usage_metadata", None))
+        # A saved thread may hold the previous question's itinerary; this turn answers a new one
+        return {"messages": [response], "itinerary": None}
+
+    def route_after_agent(self, state: TripPlannerState):
+        tool_calls = getattr(state["messages"][-1], "tool_calls", None)
+        if not tool_calls:
+            return END
+        return "itinerary" if any(call["name"] == ITINERARY_TOOL for call in tool_calls) else "tools"
+
+    def itinerary_function(self, state: TripPlannerState):
+        """Validate the submitted itinerary and render it as the final answer.
+
+        Validation errors go back to the model as the tool result, so it can
+        resubmit the plan with the fields fixed.
+        """
+        messages, itinerary = [], None
+        for call in state["messages"][-1].tool_calls:
+            if call["name"] != ITINERARY_TOOL:
+                content, status = "Not run: call other tools before submitting the itinerary.", "error"
+            else:
+                try:
+                    itinerary = Itinerary.model_validate(call["args"])
+                    content, status = "Itinerary accepted.", "success"
+                except ValidationError as e:
+                    problems = "\n".join(f"- {'.'.join(map(str, error['loc']))}: {error['msg']}" for error in e.errors())
+                    content, status = f"Invalid itinerary, fix these fields and call {ITINERARY_TOOL} again:\n{problems}", "error"
+            messages.append(ToolMessage(content=content, name=call["name"], tool_call_id=call["id"], status=status))
+        if itinerary is None:
+            return {"messages": messages}
+        messages.append(AIMessage(content=itinerary.to_markdown()))
+        return {"messages": messages, "itinerary": itinerary.model_dump()}
+
+    @staticmethod
+    def route_after_itinerary(state: TripPlannerState):
+        return END if state.get("itinerary") else "agent"
+
     def build_graph(self):
-        graph_builder=StateGraph(MessagesState)
+        graph_builder=StateGraph(TripPlannerState)
         graph_builder.add_node("agent", self.agent_function)
-        graph_builder.add_node("tools", ToolNode(tools=self.tools))
-        graph_builder.add_edge(START,"agent")
-        graph_builder.add_conditional_edges("agent",tools_condition)
+        graph_builder.add_node("tools", self.tool_executor)
+        graph_builder.add_node("itinerary", self.itinerary_function)
+        if self.research_stage is not None:
+            graph_builder.add_node("research", self.research_stage)
+            graph_builder.add_edge(START,"research")
+            graph_builder.add_edge("research","agent")
+        else:
+            graph_builder.add_edge(START,"agent")
+        graph_builder.add_conditional_edges("agent", self.route_after_agent, ["tools", "itinerary", END])
+        graph_builder.add_conditional_edges("itinerary", self.route_after_itinerary, ["agent", END])
         graph_builder.add_edge("tools","agent")
         graph_builder.add_edge("agent",END)
-        self.graph = graph_builder.compile()
+        self.graph = graph_builder.compile(checkpointer=self.checkpointer)
         return self.graph
         
     def __call__(self):
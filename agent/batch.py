@@ -0,0 +1,140 @@
+"""Bulk trip planning: JSONL of questions in, JSONL of answers out.
+
+Each input line is an object with a ``question`` and an optional ``id``
+(``request_id`` is accepted too). Lines without an id are keyed by their
+line number. Results are written as soon as each item finishes, so output
+order follows completion order. Only items that succeeded are skipped when
+a run is resumed.
+
+    python -m agent.batch questions.jsonl --output plans.jsonl --parallel 4
+
+Items run in one process, so they share the weather, exchange-rate and
+place caches: a destination fetched for one item is free for the next.
+"""
+import asyncio
+import json
+import os
+import time
+from typing import AsyncIterator, Awaitable, Callable, Iterable, List
+
+
+def read_items(lines: Iterable[str]) -> List[dict]:
+    """Parse JSONL into ``{"id", "question"}`` items, skipping blank lines."""
+    items = []
+    for number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        record = json.loads(line)
+        if not isinstance(record, dict):
+            raise ValueError(f"line {number}: expected a JSON object")
+        question = record.get("question")
+        if not question or not isinstance(question, str):
+            raise ValueError(f"line {number}: missing 'question'")
+        item_id = record.get("id") or record.get("request_id") or f"line-{number}"
+        items.append({"id": str(item_id), "question": question})
+    return items
+
+
+def completed_ids(output_path: str) -> set:
+    """Ids already answered successfully in ``output_path``; a torn last line is ignored."""
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+    with open(output_path, encoding="utf-8") as file:
+        for line in file:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if record.get("status") == "ok":
+                done.add(record["id"])
+    return done
+
+
+async def run_batch(items: List[dict], answer: Callable[[str], Awaitable[dict]], max_parallel: int = 4,
+                    timeout: float = None) -> AsyncIterator[dict]:
+    """Run ``answer(question)`` for every item, at most ``max_parallel`` at once.
+
+    Yields one result per item as it finishes. A failed or timed-out item
+    yields an ``"error"`` result; it does not stop the batch.
+    """
+    pending = iter(items)
+    results = asyncio.Queue()
+
+    async def worker():
+        for item in pending:
+            start = time.perf_counter()
+            record = {"id": item["id"], "question": item["question"]}
+            try:
+                async with asyncio.timeout(timeout):
+                    outcome = await answer(item["question"])
+                record.update(status="ok", **outcome)
+            except Exception as e:
+                error = "Trip planning timed out" if isinstance(e, TimeoutError) else str(e)
+                record.update(status="error", error=error)
+            record["latency_ms"] = round((time.perf_counter() - start) * 1000, 1)
+            await results.put(record)
+
+    workers = [asyncio.create_task(worker()) for _ in range(max(1, min(max_parallel, len(items))))]
+    try:
+        for _ in range(len(items)):
+            yield await results.get()
+    finally:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+
+def graph_answerer(react_app) -> Callable[[str], Awaitable[dict]]:
+    """``answer(question)`` that runs the compiled agent graph directly."""
+    async def answer(question: str) -> dict:
+        output = await react_app.ainvoke({"messages": [question], "tool_latencies": None})
+        return {"answer": output["messages"][-1].content, "itinerary": output.get("itinerary"),
+                "tool_latencies": output.get("tool_latencies", [])}
+    return answer
+
+
+async def _main(args):
+    from agent.graph_manager import GraphManager
+
+    with open(args.input, encoding="utf-8") as file:
+        items = read_items(file)
+    done = completed_ids(args.output)
+    todo = [item for item in items if item["id"] not in done]
+    print(f"{len(items)} items, {len(done)} already done, {len(todo)} to run")
+    if not todo:
+        return
+
+    react_app = GraphManager(model_provider=args.model_provider).get()
+    succeeded = 0
+    # A crash mid-write leaves a torn last line; continue on a fresh one
+    torn = False
+    if os.path.exists(args.output) and os.path.getsize(args.output):
+        with open(args.output, "rb") as file:
+            file.seek(-1, os.SEEK_END)
+            torn = file.read(1) != b"\n"
+    with open(args.output, "a", encoding="utf-8") as out:
+        if torn:
+            out.write("\n")
+        async for record in run_batch(todo, graph_answerer(react_app), args.parallel, args.timeout):
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            # One line per finished item reaches the disk, so a crash loses at most the items in flight
+            out.flush()
+            succeeded += record["status"] == "ok"
+            print(f"[{record['status']}] {record['id']} ({record['latency_ms']} ms)")
+    print(f"{succeeded}/{len(todo)} succeeded; rerun the same command to retry failures")
+
+
+if __name__ == "__main__":
+    import argparse
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Answer a JSONL file of trip questions")
+    parser.add_argument("input", help="JSONL with a 'question' (and optional 'id') per line")
+    parser.add_argument("--output", required=True, help="JSONL results; existing successful ids are skipped")
+    parser.add_argument("--parallel", type=int, default=4, help="items planned at once")
+    parser.add_argument("--timeout", type=float, default=300, help="seconds allowed per item")
+    parser.add_argument("--model-provider", default=os.getenv("MODEL_PROVIDER", "groq"))
+    asyncio.run(_main(parser.parse_args()))
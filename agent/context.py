@@ -0,0 +1,144 @@
+import json
+from langchain_core.messages import HumanMessage, SystemMessage, ToolMessage, trim_messages
+from langchain_core.messages.utils import count_tokens_approximately
+
+
+def _truncate(text: str, max_chars: int) -> str:
+    if len(text) <= max_chars:
+        return text
+    return text[:max_chars].rstrip() + " …[truncated]"
+
+
+def _compact_weather_slot(slot: dict) -> dict:
+    main = slot.get("main", {})
+    weather = (slot.get("weather") or [{}])[0]
+    return {
+        "time": slot.get("dt_txt") or slot.get("dt"),
+        "temp": main.get("temp"),
+        "min": main.get("temp_min"),
+        "max": main.get("temp_max"),
+        "humidity": main.get("humidity"),
+        "pop": slot.get("pop"),
+        "condition": weather.get("description") or weather.get("main"),
+    }
+
+
+def compact_payload(data, max_chars: int = 2000):
+    """Reduce a raw upstream payload to the fields the planner actually uses.
+
+    Handles OpenWeather current/forecast responses and Tavily result dicts;
+    anything else is passed through with long strings and lists cut down.
+    """
+    if isinstance(data, dict):
+        if "list" in data and "city" in data:
+            city = data.get("city", {})
+            return {"city": city.get("name"), "country": city.get("country"),
+                    "forecast": [_compact_weather_slot(slot) for slot in data["list"]]}
+        if "main" in data and "weather" in data:
+            return {"place": data.get("name"), **_compact_weather_slot(data),
+                    "wind_speed": data.get("wind", {}).get("speed")}
+        if "results" in data and "query" in data:
+            compact = {"answer": data.get("answer")} if data.get("answer") else {}
+            compact["results"] = [
+                {"title": r.get("title"), "content": _truncate(str(r.get("content", "")), 300)}
+                for r in data["results"][:5]
+            ]
+            return compact
+        return {key: compact_payload(value, max_chars) for key, value in data.items()
+                if value not in (None, "", [], {})}
+    if isinstance(data, list):
+        return [compact_payload(item, max_chars) for item in data[:10]]
+    if isinstance(data, str):
+        return _truncate(data, max_chars)
+    return data
+
+
+def compact_tool_output(result, max_chars: int = 2000) -> str:
+    """Turn a tool result into a compact string for a ToolMessage."""
+    if isinstance(result, str):
+        try:
+            result = json.loads(result)
+        except ValueError:
+            return _truncate(result, max_chars)
+    text = json.dumps(compact_payload(result, max_chars), ensure_ascii=False, default=str,
+                      separators=(",", ":"))
+    return _truncate(text, max_chars)
+
+
+class ContextBudget:
+    """Builds the message list for each LLM call within a token budget.
+
+    Tool messages are compacted. The current turn (the latest question and
+    the tool calls and results that followed it) is always sent; if it
+    alone exceeds ``max_input_tokens`` its tool results are cut down
+    further. Earlier turns are limited to the last ``max_history_messages``
+    and then to whatever tokens are left. Earlier questions that fall out
+    of the window are listed, not summarized, in a short note so the model
+    still knows what was asked before.
+    """
+
+    # Tool results of the current turn are never cut below this many characters
+    MIN_TOOL_OUTPUT_CHARS = 200
+
+    def __init__(self, max_input_tokens: int = 6000, max_history_messages: int = 40,
+                 max_tool_output_chars: int = 2000):
+        self.max_input_tokens = max_input_tokens
+        self.max_history_messages = max_history_messages
+        self.max_tool_output_chars = max_tool_output_chars
+
+    @classmethod
+    def from_config(cls, config) -> "ContextBudget":
+        context = config.get("context", {}) or {}
+        memory = config.get("memory", {}) or {}
+        return cls(
+            max_input_tokens=context.get("max_input_tokens", 6000),
+            max_history_messages=memory.get("max_history_messages", 40),
+            max_tool_output_chars=context.get("max_tool_output_chars", 2000),
+        )
+
+    @staticmethod
+    def count_tokens(messages: list) -> int:
+        return count_tokens_approximately(messages)
+
+    @staticmethod
+    def _compact(message, max_chars: int):
+        if isinstance(message, ToolMessage) and len(str(message.content)) > max_chars:
+            return message.model_copy(update={"content": compact_tool_output(message.content, max_chars)})
+        return message
+
+    def _fit_current_turn(self, turn: list, budget: int) -> list:
+        """Halve the tool output limit of the current turn until it fits ``budget`` or hits the floor."""
+        max_chars = self.max_tool_output_chars
+        while self.count_tokens(turn) > budget and max_chars > self.MIN_TOOL_OUTPUT_CHARS:
+            max_chars = max(max_chars // 2, self.MIN_TOOL_OUTPUT_CHARS)
+            turn = [self._compact(message, max_chars) for message in turn]
+        return turn
+
+    def build(self, system_messages: list, history: list) -> list:
+        history = [self._compact(message, self.max_tool_output_chars) for message in history]
+        start = next((i for i in range(len(history) - 1, -1, -1) if isinstance(history[i], HumanMessage)), 0)
+        earlier = history[:start]
+        budget = max(self.max_input_tokens - self.count_tokens(system_messages), 0)
+        # Dropping the current tool results would make the model call the same tools again, forever
+        current = self._fit_current_turn(history[start:], budget)
+
+        room = budget - self.count_tokens(current)
+        window = earlier[len(earlier) - max(self.max_history_messages - len(current), 0):]
+        kept = []
+        if window and room > 0:
+            kept = trim_messages(
+                window,
+                max_tokens=room,
+                token_counter=count_tokens_approximately,
+                strategy="last",
+                start_on="human",
+            )
+
+        kept_ids = {id(message) for message in kept}
+        dropped = [m for m in earlier if isinstance(m, HumanMessage) and id(m) not in kept_ids]
+        if dropped:
+            earlier_questions = "; ".join(_truncate(str(m.content), 200) for m in dropped[-5:])
+            system_messages = system_messages + [
+                SystemMessage(content=f"Earlier in this conversation the user asked: {earlier_questions}")
+            ]
+        return system_messages + kept + current
@@ -0,0 +1,136 @@
+import os
+import tempfile
+import threading
+from utils.config_loader import CONFIG_PATH
+from utils.metrics import span
+from LOGGER.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class GraphManager:
+    """Owns the compiled agent graph for the whole process.
+
+    The graph is built once (normally from the FastAPI lifespan hook) and the
+    same compiled graph is handed to every request. A compiled LangGraph graph
+    keeps no per-run state, so sharing it across concurrent requests is safe.
+    The graph is rebuilt when ``config/config.yaml`` changes on disk or when
+    ``reload()`` is called explicitly. Only what the graph is built from
+    (model, prompt, tools, context budget, research) is reloaded; the
+    server, cache, jobs, batch and plans sections are read once at startup.
+    """
+
+    def __init__(self, model_provider: str = "groq", config_path: str = CONFIG_PATH):
+        self.model_provider = model_provider
+        self.config_path = config_path
+        self.version = 0
+        self.model_name = None
+        self.llm = None
+        self.checkpointer = None
+        self._graph = None
+        self._config_mtime = None
+        self._lock = threading.Lock()
+        self._png_lock = threading.Lock()
+        self._png_cache = None
+
+    def _current_mtime(self):
+        try:
+            return os.path.getmtime(self.config_path)
+        except OSError:
+            return None
+
+    def _build(self):
+        # LangGraph, the provider SDKs and the tools load here rather than at import,
+        # so the API process can answer /health before the first build finishes
+        from agent.agentic_workflow import GraphBuilder
+        mtime = self._current_mtime()
+        with span("graph.build", "GRAPH_BUILD_SECONDS"):
+            builder = GraphBuilder(model_provider=self.model_provider, checkpointer=self.checkpointer)
+            graph = builder()
+        self.model_name = builder.model_name
+        self.llm = builder.llm
+        self._graph = graph
+        self._config_mtime = mtime
+        self.version += 1
+        logger.info("agent graph built", extra={"graph_version": self.version, "model": self.model_name})
+        return graph
+
+    def current(self):
+        """The compiled graph if it is built and the config is unchanged, else None; never builds."""
+        graph = self._graph
+        if graph is not None and self._current_mtime() == self._config_mtime:
+            return graph
+        return None
+
+    def get(self):
+        """Return the compiled graph, rebuilding it first if the config changed."""
+        graph = self._graph
+        if graph is not None and self._current_mtime() == self._config_mtime:
+            return graph
+        with self._lock:
+            if self._graph is None or self._current_mtime() != self._config_mtime:
+                return self._build()
+            return self._graph
+
+    def reload(self):
+        """Force a rebuild of the graph, e.g. after rotating API keys."""
+        with self._lock:
+            return self._build()
+
+    def attach_checkpointer(self, checkpointer):
+        """Compile the graph with ``checkpointer`` from now on, rebuilding it if already built."""
+        with self._lock:
+            self.checkpointer = checkpointer
+            if self._graph is not None:
+                self._build()
+
+    def render_png(self) -> bytes:
+        """Return the Mermaid PNG of the current graph, rendered once per graph version.
+
+        Rendering may call out to mermaid.ink, so callers on the event loop
+        should run this in a worker thread.
+        """
+        graph = self.get()
+        version = self.version
+        cached = self._png_cache
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        with self._png_lock:
+            cached = self._png_cache
+            if cached is not None and cached[0] == version:
+                return cached[1]
+            png = graph.get_graph().draw_mermaid_png()
+            self._png_cache = (version, png)
+            return png
+
+    def save_png(self, path: str = "my_graph.png") -> str:
+        """Write the graph PNG atomically so concurrent writers never leave a torn file."""
+        png = self.render_png()
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".png.tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(png)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return path
+
+    @property
+    def is_built(self) -> bool:
+        return self._graph is not None
+
+
+if __name__ == "__main__":
+    import argparse
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Render the agent graph to a PNG file")
+    parser.add_argument("--output", default="my_graph.png")
+    parser.add_argument("--model-provider", default="groq")
+    args = parser.parse_args()
+    saved = GraphManager(model_provider=args.model_provider).save_png(args.output)
+    print(f"Graph saved as '{saved}'")
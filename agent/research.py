@@ -0,0 +1,133 @@
+import asyncio
+import os
+import re
+from typing import Optional
+from langchain_core.messages import HumanMessage
+from utils.response_cache import normalize_query
+from utils.weather_info import WeatherForecastTool
+from utils.place_info_search import TavilyPlaceSearchTool
+from utils.currency_converter import CurrencyConverter
+from utils.destination_index import resolve
+from LOGGER.logging import get_logger
+
+logger = get_logger(__name__)
+
+# "to Jaipur", "in New Delhi", "visit Goa" ... the capitalised words that follow
+_PLACE_AFTER = re.compile(
+    r"\b(?:to|in|at|visit|visiting|around|explore|for)\s+([A-Z][\w'-]*(?:[ ,]+[A-Z][\w'-]*)*)"
+)
+_MONTHS = (r"jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?"
+           r"|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?")
+_DATE = re.compile(
+    rf"\b\d{{4}}-\d{{2}}-\d{{2}}\b|\b\d{{1,2}}(?:st|nd|rd|th)?\s+(?:{_MONTHS})\b|\b(?:{_MONTHS})(?:\s+\d{{1,2}})?\b",
+    re.IGNORECASE,
+)
+_CURRENCY_CODE = re.compile(r"\b[A-Z]{3}\b")
+_DEFAULT_CURRENCIES = ("USD", "EUR", "GBP", "INR")
+
+
+def explicit_destination(question: str) -> Optional[str]:
+    """The place named after "to", "in", "visit" ... in the question, if any."""
+    for match in _PLACE_AFTER.finditer(question):
+        candidate = match.group(1).strip(" ,")
+        if not re.fullmatch(_MONTHS, candidate, re.IGNORECASE):
+            return candidate
+    return None
+
+
+def extract_trip_details(question: str) -> dict:
+    """Pull the destination, trip length and any date mentions out of a question.
+
+    A destination found in the destination index is reported under its
+    canonical name and id, and its local currency joins the rates to fetch.
+    """
+    normalized = normalize_query(question)
+    destination = explicit_destination(question)
+    if destination is None and normalized.destination:
+        destination = normalized.destination.title()
+    currencies = set(_CURRENCY_CODE.findall(question)) | set(_DEFAULT_CURRENCIES)
+    known = resolve(destination) if destination else None
+    if known is not None:
+        destination = known.name
+        currencies.add(known.currency)
+    return {
+        "destination": destination,
+        "destination_id": known.id if known else None,
+        "country": known.country if known else None,
+        "days": normalized.days,
+        "dates": [m.group(0) for m in _DATE.finditer(question)],
+        "currencies": sorted(currencies),
+    }
+
+
+class ResearchStage:
+    """Deterministic pre-fetch node that runs ahead of the first LLM turn.
+
+    It extracts the destination from the latest question and runs weather,
+    place search and exchange-rate lookups concurrently. The results are
+    stored in ``state["research"]``; ``GraphBuilder.agent_function`` hands
+    them to the model so it can write the plan without a chain of tool
+    round trips. Lookups whose API key is not configured are skipped, and a
+    lookup that fails or exceeds ``timeout`` is simply left out.
+    """
+
+    def __init__(self, timeout: float = 20):
+        self.timeout = timeout
+        weather_key = os.getenv("OPENWEATHERMAP_API_KEY")
+        exchange_key = os.getenv("EXCHANGE_RATE_API_KEY")
+        self.weather = WeatherForecastTool(weather_key) if weather_key else None
+        self.places = TavilyPlaceSearchTool() if os.getenv("TAVILY_API_KEY") else None
+        self.currency = CurrencyConverter(exchange_key) if exchange_key else None
+
+    @staticmethod
+    def _latest_question(messages: list) -> Optional[str]:
+        for message in reversed(messages):
+            if isinstance(message, HumanMessage):
+                return message.content if isinstance(message.content, str) else str(message.content)
+        return None
+
+    async def _forecast(self, place: str, days: Optional[int]) -> dict:
+        record = await self.weather.aget_forecast(place, days or 5)
+        return record.to_dict() if record else {}
+
+    async def _exchange_rates(self, currencies: list) -> dict:
+        rates = await asyncio.to_thread(self.currency.get_rates)
+        return {code: rates[code] for code in currencies if code in rates}
+
+    async def _guarded(self, coro):
+        try:
+            return await asyncio.wait_for(coro, self.timeout)
+        except Exception as e:
+            logger.warning("research lookup skipped", extra={"error": repr(e)})
+            return None
+
+    async def __call__(self, state: dict):
+        question = self._latest_question(state["messages"])
+        if not question:
+            return {}
+        # Follow-ups in a saved thread reuse the research already in state
+        # unless they explicitly name a different destination
+        previous = state.get("research")
+        if previous:
+            named = explicit_destination(question)
+            known = resolve(named) if named else None
+            same = (known is not None and known.id == previous["trip"].get("destination_id")) or (
+                named and named.lower() == str(previous["trip"].get("destination") or "").lower())
+            if not named or same:
+                return {}
+        details = extract_trip_details(question)
+        place = details["destination"]
+
+        lookups = {}
+        if place and self.weather is not None:
+            lookups["current_weather"] = self.weather.aget_current_weather(place)
+            lookups["weather_forecast"] = self._forecast(place, details["days"])
+        if place and self.places is not None:
+            lookups["places"] = self.places.asearch_all(place)
+        if self.currency is not None:
+            lookups["exchange_rates"] = self._exchange_rates(details["currencies"])
+
+        results = await asyncio.gather(*(self._guarded(coro) for coro in lookups.values()))
+        research = {"trip": details}
+        research.update({name: result for name, result in zip(lookups, results) if result})
+        return {"research": research}
@@ -0,0 +1,77 @@
+import json
+from langchain_core.utils.json import parse_partial_json
+from utils.itinerary import ITINERARY_TOOL, partial_markdown
+
+
+def _text_of(content) -> str:
+    """Flatten message content (str or list of content blocks) into plain text."""
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "".join(
+            block.get("text", "") if isinstance(block, dict) else str(block)
+            for block in content
+        )
+    return str(content or "")
+
+
+def format_sse(event: str, data) -> str:
+    """Encode one Server-Sent Event frame."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+
+async def stream_agent_events(react_app, messages: dict, config: dict = None):
+    """Run the graph and yield ``(event, data)`` pairs as the run progresses.
+
+    Events:
+        token      -- a chunk of LLM output text, ``{"text": ...}``
+        tool_start -- a tool call began, ``{"name": ..., "input": ...}``
+        tool_end   -- a tool call finished, ``{"name": ...}``
+        done       -- the run finished, ``{"answer": <final message text>, "itinerary": <dict or None>}``
+
+    A submitted itinerary arrives as streamed tool-call arguments rather than
+    text, so its Markdown is rendered as the arguments come in and sent as
+    tokens, with the rest once the itinerary node accepts it. ``done`` always
+    carries the full answer, which is what to show if the plan was rejected
+    and resubmitted after part of it was streamed.
+    """
+    final_answer, itinerary = "", None
+    # Tool-call argument buffers of the current LLM turn, by index, and the itinerary Markdown sent so far
+    calls, sent = {}, ""
+    async for event in react_app.astream_events(messages, config=config, version="v2"):
+        kind = event["event"]
+        if kind == "on_chat_model_start":
+            calls, sent = {}, ""
+        elif kind == "on_chat_model_stream":
+            chunk = event["data"]["chunk"]
+            text = _text_of(chunk.content)
+            if text:
+                yield "token", {"text": text}
+            for part in getattr(chunk, "tool_call_chunks", None) or []:
+                call = calls.setdefault(part.get("index"), {"name": None, "args": ""})
+                call["name"] = call["name"] or part.get("name")
+                call["args"] += part.get("args") or ""
+                if call["name"] != ITINERARY_TOOL:
+                    continue
+                data = parse_partial_json(call["args"])
+                markdown = partial_markdown(data) if isinstance(data, dict) else ""
+                if len(markdown) > len(sent) and markdown.startswith(sent):
+                    yield "token", {"text": markdown[len(sent):]}
+                    sent = markdown
+        elif kind == "on_tool_start":
+            yield "tool_start", {"name": event["name"], "input": event["data"].get("input")}
+        elif kind == "on_tool_end":
+            yield "tool_end", {"name": event["name"]}
+        elif kind == "on_chain_end" and event["name"] == "itinerary":
+            output = event["data"].get("output")
+            if isinstance(output, dict) and output.get("itinerary"):
+                markdown = _text_of(output["messages"][-1].content)
+                if markdown.startswith(sent) and len(markdown) > len(sent):
+                    yield "token", {"text": markdown[len(sent):]}
+            sent = ""
+        elif kind == "on_chain_end" and not event.get("parent_ids"):
+            output = event["data"].get("output")
+            if isinstance(output, dict) and output.get("messages"):
+                final_answer = _text_of(output["messages"][-1].content)
+                itinerary = output.get("itinerary")
+    yield "done", {"answer": final_answer, "itinerary": itinerary}
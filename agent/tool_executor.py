@@ -0,0 +1,79 @@
+import asyncio
+import time
+from langchain_core.messages import ToolMessage
+from langchain_core.runnables import RunnableConfig
+from agent.context import compact_tool_output
+from utils.metrics import observe_tool_call
+
+
+class ParallelToolExecutor:
+    """Runs every tool call of an AI turn concurrently, each under its own timeout.
+
+    At most ``max_parallel_calls`` tools run at once. A tool that times out
+    or raises is answered with a short fallback ToolMessage instead of
+    failing the turn, so one slow upstream cannot stall the whole plan. The
+    latency and outcome of each call are returned under ``tool_latencies``
+    so they accumulate in the graph state. Results are compacted before they
+    are stored, so raw upstream payloads never reach the prompt.
+    """
+
+    def __init__(self, tools: list, max_parallel_calls: int = 8, default_timeout: float = 20,
+                 timeouts: dict = None, max_output_chars: int = 2000):
+        self.tools_by_name = {tool.name: tool for tool in tools}
+        self.max_parallel_calls = max_parallel_calls
+        self.default_timeout = default_timeout
+        self.timeouts = timeouts or {}
+        self.max_output_chars = max_output_chars
+
+    @classmethod
+    def from_config(cls, tools: list, config: dict) -> "ParallelToolExecutor":
+        settings = config.get("tools", {}) or {}
+        context = config.get("context", {}) or {}
+        return cls(
+            tools,
+            max_parallel_calls=settings.get("max_parallel_calls", 8),
+            default_timeout=settings.get("default_timeout_seconds", 20),
+            timeouts=settings.get("timeouts", {}),
+            max_output_chars=context.get("max_tool_output_chars", 2000),
+        )
+
+    async def _run_call(self, call: dict, semaphore: asyncio.Semaphore, config: RunnableConfig):
+        name = call["name"]
+        timeout = self.timeouts.get(name, self.default_timeout)
+        tool = self.tools_by_name.get(name)
+        status = "success"
+        async with semaphore:
+            start = time.perf_counter()
+            if tool is None:
+                status = "error"
+                content = f"Error: {name} is not a valid tool, try one of {sorted(self.tools_by_name)}."
+            else:
+                try:
+                    result = await asyncio.wait_for(tool.ainvoke(call["args"], config=config), timeout)
+                    content = compact_tool_output(result, self.max_output_chars)
+                except asyncio.TimeoutError:
+                    status = "timeout"
+                    content = (f"{name} did not respond within {timeout}s. "
+                               f"Continue the plan without this information.")
+                except Exception as e:
+                    status = "error"
+                    content = f"Error: {name} failed ({e}). Continue the plan without this information."
+            elapsed = time.perf_counter() - start
+        observe_tool_call(name, status, elapsed)
+
+        message = ToolMessage(
+            content=content,
+            name=name,
+            tool_call_id=call["id"],
+            status="success" if status == "success" else "error",
+        )
+        return message, {"tool": name, "status": status, "latency_ms": round(elapsed * 1000, 1)}
+
+    async def __call__(self, state: dict, config: RunnableConfig):
+        tool_calls = state["messages"][-1].tool_calls
+        semaphore = asyncio.Semaphore(self.max_parallel_calls)
+        results = await asyncio.gather(*(self._run_call(call, semaphore, config) for call in tool_calls))
+        return {
+            "messages": [message for message, _ in results],
+            "tool_latencies": [latency for _, latency in results],
+        }
@@ -1,8 +1,12 @@
-from flask import Flask, render_template, send_from_directory, jsonify, request
+from flask import Flask, render_template, send_from_directory, jsonify, request, Response, stream_with_context
 import os
 import datetime
+import json
 import requests
-import re
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from utils.currency_localizer import CurrencyLocalizer, KeywordMatcher
+from utils.destination_index import get_index
 
 app = Flask(__name__)
 
@@ -11,23 +15,127 @@ os.makedirs('templates', exist_ok=True)
 os.makedirs('static', exist_ok=True)
 
 # Configuration for your AI backend
-AI_BACKEND_URL = "http://localhost:8000"  # Your FastAPI backend URL
+AI_BACKEND_URL = os.getenv("AI_BACKEND_URL", "http://localhost:8000")  # Your FastAPI backend URL
+# Connecting should be quick; a full plan may take as long as the backend's request timeout (120 s).
+# For streams the read timeout is the longest allowed gap between two events.
+BACKEND_TIMEOUT = (
+    float(os.getenv("AI_BACKEND_CONNECT_TIMEOUT", "3.05")),
+    float(os.getenv("AI_BACKEND_READ_TIMEOUT", "130")),
+)
+# One pooled connection per concurrent chat a gevent worker accepts (worker_connections in gunicorn.conf.py)
+BACKEND_POOL_SIZE = int(os.getenv("AI_BACKEND_POOL_SIZE", os.getenv("WEB_WORKER_CONNECTIONS", "500")))
+
+
+def _build_backend_session() -> requests.Session:
+    """Keep-alive connection pool to the backend, shared by every chat.
+
+    Only failures to connect are retried: a request that reached the backend
+    may already be planning, and repeating a POST would start a second run.
+    """
+    session = requests.Session()
+    retry = Retry(total=2, connect=2, read=0, status=0, other=0, backoff_factor=0.2)
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=BACKEND_POOL_SIZE, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+backend = _build_backend_session()
 
 
 def localize_currency(text: str, user_message: str) -> str:
-    """Convert USD symbol to INR for India-specific queries.
-    Simple heuristic: if the user asks about India-related trips (keywords),
-    replace currency symbol `$` with `₹` when it looks like a money amount.
+    """Write `$` amounts in the local currency of the trip the user asked about.
+
+    The currency is the one the user names ("in INR", "€"), else that of the
+    first known destination in the message; see utils/currency_localizer.py.
     """
-    if not isinstance(text, str):
-        return text
+    return CurrencyLocalizer.for_message(user_message).localize(text)
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
 
-    msg = (user_message or "").lower()
-    india_keywords = ["india", "manali", "inr", "rupee", "₹", "delhi", "mumbai", "goa", "himachal", "bali inr"]
-    if any(k in msg for k in india_keywords):
-        # Replace $ when followed by a number (optionally with commas and decimals)
-        return re.sub(r"\$(?=\d|\s*\d)", "₹", text)
-    return text
+def _iter_backend_events(response):
+    """Parse the backend's Server-Sent Events into (event, data) pairs.
+
+    Raises json.JSONDecodeError on a data payload that is not JSON.
+    """
+    event, data_lines = "message", []
+    for line in response.iter_lines(decode_unicode=True):
+        if line is None:
+            continue
+        if line == "":
+            if data_lines:
+                yield event, json.loads("\n".join(data_lines))
+            event, data_lines = "message", []
+        elif line.startswith("event:"):
+            event = line[len("event:"):].strip()
+        elif line.startswith("data:"):
+            data_lines.append(line[len("data:"):].strip())
+
+
+def ask_backend(path: str, user_message: str, thread_id=None, **kwargs):
+    """POST the question to the backend, starting a new thread if it does not know ``thread_id``."""
+    response = backend.post(f"{AI_BACKEND_URL}{path}",
+                            json={"question": user_message, "thread_id": thread_id}, **kwargs)
+    if response.status_code == 404 and thread_id is not None:
+        # The backend lost the conversation (e.g. its checkpoints were reset); its reply carries the new thread id
+        response.close()
+        response = backend.post(f"{AI_BACKEND_URL}{path}",
+                                json={"question": user_message, "thread_id": None}, **kwargs)
+    return response
+
+
+def _fallback_events(user_message: str):
+    """The offline fallback answer as a token event followed by done."""
+    fallback = generate_fallback_response(user_message)
+    yield _sse("token", {"text": fallback})
+    yield _sse("done", {"answer": fallback, 'timestamp': datetime.datetime.now().isoformat()})
+
+
+def stream_chat(user_message: str, thread_id=None):
+    """Proxy the backend's /query/stream as SSE, localizing token text on the fly."""
+    try:
+        response = ask_backend("/query/stream", user_message, thread_id, stream=True, timeout=BACKEND_TIMEOUT)
+    except requests.exceptions.RequestException as e:
+        print(f"AI Backend Error: {e}")
+        response = None
+
+    if response is None or response.status_code != 200:
+        if response is not None:
+            response.close()
+        yield from _fallback_events(user_message)
+        return
+
+    localizer = CurrencyLocalizer.for_message(user_message)
+    started = False
+    with response:
+        try:
+            for event, data in _iter_backend_events(response):
+                started = True
+                if event == "token":
+                    text = localizer.feed(data.get("text", ""))
+                    if text:
+                        yield _sse("token", {"text": text})
+                    continue
+                held = localizer.flush()
+                if held:
+                    yield _sse("token", {"text": held})
+                if event == "done":
+                    data["answer"] = localizer.localize(data.get("answer", ""))
+                    data["timestamp"] = datetime.datetime.now().isoformat()
+                yield _sse(event, data)
+        except requests.exceptions.RequestException as e:
+            print(f"AI Backend stream error: {e}")
+            yield _sse("error", {"error": "Connection to the AI backend was interrupted"})
+        except json.JSONDecodeError as e:
+            # A malformed event: answer offline if nothing reached the client yet
+            print(f"AI Backend sent a malformed event: {e}")
+            if started:
+                yield _sse("error", {"error": "The AI backend sent a malformed response"})
+            else:
+                yield from _fallback_events(user_message)
 
 @app.route('/')
 def index():
@@ -45,20 +153,27 @@ def chat():
     try:
         data = request.get_json()
         user_message = data.get('message', '')
+        thread_id = data.get('thread_id')
         
         if not user_message:
             return jsonify({'error': 'No message provided'}), 400
+
+        if 'text/event-stream' in request.headers.get('Accept', ''):
+            return Response(
+                stream_with_context(stream_chat(user_message, thread_id)),
+                mimetype='text/event-stream',
+                headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+            )
         
         # Call your actual AI backend
         try:
-            response = requests.post(
-                f"{AI_BACKEND_URL}/query",
-                json={"question": user_message},
-                timeout=30
-            )
+            response = ask_backend("/query", user_message, thread_id, timeout=BACKEND_TIMEOUT)
             
+            itinerary = None
             if response.status_code == 200:
                 ai_response = response.json().get('answer', 'No response from AI')
+                itinerary = response.json().get('itinerary')
+                thread_id = response.json().get('thread_id', thread_id)
             else:
                 # Fallback to intelligent response if AI backend fails
                 ai_response = generate_fallback_response(user_message)
@@ -67,12 +182,15 @@ def chat():
             print(f"AI Backend Error: {e}")
             # Fallback to intelligent response if AI backend is unavailable
             ai_response = generate_fallback_response(user_message)
+            itinerary = None
         
         # Localize currency symbols when appropriate
         ai_response = localize_currency(ai_response, user_message)
         
         return jsonify({
             'response': ai_response,
+            'itinerary': itinerary,
+            'thread_id': thread_id,
             'timestamp': datetime.datetime.now().isoformat()
         })
     
@@ -243,21 +361,33 @@ def places():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+FALLBACK_RESPONSES = {
+    'paris': "Paris is a beautiful city! Here are some recommendations:\n\n• Best time to visit: April-June or September-October\n• Must-see attractions: Eiffel Tower, Louvre Museum, Notre-Dame Cathedral\n• Budget: $150-300/day for mid-range travel\n• Weather: Check current conditions before booking",
+    'budget': "I can help you plan your travel budget! Here's what to consider:\n\n• Transportation (flights, local transport)\n• Accommodation (hotels, hostels, vacation rentals)\n• Food and dining\n• Activities and attractions\n• Emergency fund\n\nWhat type of trip are you planning?",
+    'weather': "I can help you check weather conditions for your destination! Just let me know:\n\n• City and country\n• Travel dates\n• What activities you're planning\n\nThis will help me give you the most relevant weather information.",
+    'japan': "Japan is amazing! Here are the best times to visit:\n\n• Spring (March-May): Cherry blossoms, mild weather\n• Summer (June-August): Festivals, but hot and humid\n• Fall (September-November): Beautiful autumn colors\n• Winter (December-February): Snow, hot springs, skiing\n\nWhat interests you most about Japan?"
+}
+
+
+def _fallback_keywords() -> dict:
+    keywords = {topic: topic for topic in FALLBACK_RESPONSES}
+    # Any Japanese destination in the index leads to the Japan answer too
+    keywords.update({name: "japan" for name, destination in get_index().names() if destination.country == "JP"})
+    return keywords
+
+
+# Scans a message once for every topic above, however many keywords there are
+_FALLBACK_TOPICS = KeywordMatcher(_fallback_keywords())
+
+
 def generate_fallback_response(user_message):
     """Generate intelligent fallback response when AI backend is unavailable"""
-    responses = {
-        'paris': "Paris is a beautiful city! Here are some recommendations:\n\n• Best time to visit: April-June or September-October\n• Must-see attractions: Eiffel Tower, Louvre Museum, Notre-Dame Cathedral\n• Budget: $150-300/day for mid-range travel\n• Weather: Check current conditions before booking",
-        'budget': "I can help you plan your travel budget! Here's what to consider:\n\n• Transportation (flights, local transport)\n• Accommodation (hotels, hostels, vacation rentals)\n• Food and dining\n• Activities and attractions\n• Emergency fund\n\nWhat type of trip are you planning?",
-        'weather': "I can help you check weather conditions for your destination! Just let me know:\n\n• City and country\n• Travel dates\n• What activities you're planning\n\nThis will help me give you the most relevant weather information.",
-        'japan': "Japan is amazing! Here are the best times to visit:\n\n• Spring (March-May): Cherry blossoms, mild weather\n• Summer (June-August): Festivals, but hot and humid\n• Fall (September-November): Beautiful autumn colors\n• Winter (December-February): Snow, hot springs, skiing\n\nWhat interests you most about Japan?"
-    }
-    
-    user_message_lower = user_message.lower()
-    
-    for keyword, response in responses.items():
-        if keyword in user_message_lower:
+    found = {topic for _, topic in _FALLBACK_TOPICS.finditer(user_message or "")}
+    # Topics keep their order of precedence above, whatever their order in the message
+    for topic, response in FALLBACK_RESPONSES.items():
+        if topic in found:
             return response
-    
+
     # Default response
     return "I'd love to help you plan your trip! I can assist with:\n\n• Destination recommendations\n• Budget planning\n• Weather information\n• Travel tips and advice\n\nWhat specific aspect of travel planning would you like help with?"
 
@@ -271,6 +401,7 @@ if __name__ == '__main__':
     print("Starting Flask server...")
     print(f"AI Backend URL: {AI_BACKEND_URL}")
     print("Open your browser and go to: http://localhost:5000")
+    print("Development server only; for many concurrent chats run: gunicorn -c gunicorn.conf.py app:app")
     print("Press Ctrl+C to stop the server")
     
     app.run(
@@ -0,0 +1,56 @@
+"""Compare per-request graph setup against the process-level GraphManager.
+
+Run from the repository root:
+
+    python benchmarks/bench_graph_setup.py --requests 50
+
+No network calls are made: building ChatGroq only needs a key to be present,
+so a dummy GROQ_API_KEY is used when none is configured.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("GROQ_API_KEY", "benchmark-dummy-key")
+
+from agent.agentic_workflow import GraphBuilder
+from agent.graph_manager import GraphManager
+
+
+def time_calls(fn, n: int) -> list:
+    samples = []
+    for _ in range(n):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def report(label: str, samples: list):
+    samples = sorted(samples)
+    p95 = samples[max(0, int(len(samples) * 0.95) - 1)]
+    print(f"{label:<28} mean={statistics.mean(samples):9.3f} ms  "
+          f"p50={statistics.median(samples):9.3f} ms  p95={p95:9.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20, help="simulated requests per mode")
+    args = parser.parse_args()
+
+    per_request = time_calls(lambda: GraphBuilder(model_provider="groq")(), args.requests)
+
+    manager = GraphManager(model_provider="groq")
+    startup = time_calls(manager.get, 1)
+    shared = time_calls(manager.get, args.requests)
+
+    report("per-request GraphBuilder", per_request)
+    report("GraphManager startup", startup)
+    report("GraphManager per request", shared)
+
+
+if __name__ == "__main__":
+    main()
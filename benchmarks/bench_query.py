@@ -0,0 +1,133 @@
+"""Offline load test of the /query endpoint at several concurrency levels.
+
+Run from the repository root:
+
+    python benchmarks/bench_query.py --concurrency 1 8 32 --requests 64
+
+The scripted fake chat model (``llm.fake`` in the config) stands in for Groq,
+and the stubs in benchmarks/stub_services.py stand in for OpenWeather,
+ExchangeRate-API and Tavily, so no keys or network are needed and every run
+takes the same tool path. Requests go through the real FastAPI app in
+process (lifespan, scheduler, graph, tools), via an ASGI transport.
+Reports throughput, p50/p95/p99 latency and memory per concurrency level.
+"""
+import argparse
+import asyncio
+import os
+import resource
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import yaml
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import stub_services
+
+
+def write_config(args) -> str:
+    """Derive a benchmark config from config/config.yaml and return its path."""
+    with open(os.path.join(ROOT, "config", "config.yaml")) as file:
+        config = yaml.safe_load(file)
+    config["llm"]["fake"]["latency_seconds"] = args.llm_latency_ms / 1000
+    config["llm"]["router"]["enabled"] = False
+    config["graph"]["mode"] = args.mode
+    # Every request is a fresh conversation and must reach the graph
+    config["memory"]["enabled"] = False
+    config["cache"]["response"]["enabled"] = False
+    config["plans"]["enabled"] = False
+    config["server"]["max_concurrent_requests"] = max(args.concurrency)
+    config["server"]["max_queued_requests"] = max(args.concurrency)
+    handle = tempfile.NamedTemporaryFile("w", suffix=".yaml", delete=False)
+    with handle:
+        yaml.safe_dump(config, handle)
+    return handle.name
+
+
+def percentile(samples: list, pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def run_level(client, concurrency: int, total: int, question: str) -> dict:
+    latencies, failures = [], 0
+    gate = asyncio.Semaphore(concurrency)
+
+    async def one():
+        nonlocal failures
+        async with gate:
+            start = time.perf_counter()
+            response = await client.post("/query", json={"question": question})
+            latencies.append((time.perf_counter() - start) * 1000)
+            if response.status_code != 200:
+                failures += 1
+
+    tracemalloc.reset_peak()
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    elapsed = time.perf_counter() - start
+    return {
+        "concurrency": concurrency,
+        "rps": total / elapsed,
+        "p50": statistics.median(latencies),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+        "failures": failures,
+        "peak_mb": tracemalloc.get_traced_memory()[1] / 2**20,
+    }
+
+
+async def bench(args):
+    import httpx
+    import main
+
+    async with main.app.router.lifespan_context(main.app):
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            await run_level(client, 1, args.warmup, args.question)
+            return [await run_level(client, level, args.requests, args.question) for level in args.concurrency]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--requests", type=int, default=32, help="requests per concurrency level")
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--mode", choices=["react", "research"], default="research",
+                        help="graph mode; research also exercises the upstream clients")
+    parser.add_argument("--llm-latency-ms", type=float, default=200, help="per-turn fake LLM latency")
+    parser.add_argument("--upstream-latency-ms", type=float, default=50, help="per-call stub latency")
+    parser.add_argument("--question", default="Plan a 3 day trip to Goa for 2 people under $500")
+    args = parser.parse_args()
+
+    server = stub_services.serve(latency=args.upstream_latency_ms / 1000)
+    config_path = write_config(args)
+    # Must be set before main is imported: the config path and clients read them at import
+    os.environ.update(stub_services.environment(server))
+    os.environ.update({"TRIP_PLANNER_CONFIG": config_path, "MODEL_PROVIDER": "fake"})
+    # Per-request logs would dominate the output and the timings
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    os.chdir(ROOT)
+
+    tracemalloc.start()
+    try:
+        results = asyncio.run(bench(args))
+    finally:
+        server.shutdown()
+        os.unlink(config_path)
+
+    print(f"{'conc':>5} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'fail':>5} {'peak MB':>8}")
+    for row in results:
+        print(f"{row['concurrency']:>5} {row['rps']:>8.1f} {row['p50']:>9.1f} {row['p95']:>9.1f} "
+              f"{row['p99']:>9.1f} {row['failures']:>5} {row['peak_mb']:>8.1f}")
+    # ru_maxrss is KiB on Linux
+    print(f"max RSS: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Report which imports dominate the cold start of a module (``main`` by default).
+
+Run from the repository root:
+
+    python benchmarks/import_time.py --top 20
+    python benchmarks/import_time.py --module agent.agentic_workflow
+
+Wraps ``python -X importtime`` in a fresh interpreter, so nothing is cached
+from this process, and lists the slowest imports by cumulative time.
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def import_times(module: str) -> list:
+    """``(cumulative_us, self_us, depth, name)`` for every import ``module`` triggers."""
+    env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    env.setdefault("GROQ_API_KEY", "import-time-dummy-key")
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=ROOT, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise SystemExit(result.stderr.strip().splitlines()[-1])
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((int(cumulative_us), int(self_us), depth, name.strip()))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--top", type=int, default=15, help="number of slowest imports to list")
+    args = parser.parse_args()
+
+    rows = import_times(args.module)
+    total = next((row[0] for row in rows if row[3] == args.module), sum(row[1] for row in rows))
+    print(f"import {args.module}: {total / 1000:.0f} ms, {len(rows)} modules")
+    print(f"{'cumulative ms':>14} {'self ms':>8}  module")
+    for cumulative_us, self_us, depth, name in sorted(rows, reverse=True)[:args.top]:
+        print(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>8.1f}  {'  ' * depth}{name}")
+
+
+if __name__ == "__main__":
+    main()
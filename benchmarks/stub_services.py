@@ -0,0 +1,144 @@
+"""Local stand-ins for the OpenWeather, ExchangeRate-API and Tavily endpoints.
+
+Each stub answers with a small, fixed payload in the provider's format after
+an optional delay, so benchmarks exercise the real HTTP clients, caches and
+retries without a network or API keys. Run standalone to poke at it:
+
+    python benchmarks/stub_services.py --port 8765 --latency-ms 50
+
+and point the app at it with the base-URL variables printed on startup.
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+RATES = {"USD": 1.0, "INR": 83.2, "EUR": 0.92, "GBP": 0.79, "JPY": 149.5, "AED": 3.67, "THB": 35.9}
+
+
+def current_weather(city: str) -> dict:
+    return {
+        "name": city,
+        "weather": [{"id": 800, "main": "Clear", "description": "clear sky"}],
+        "main": {"temp": 27.5, "feels_like": 29.0, "temp_min": 26.0, "temp_max": 29.0, "humidity": 62},
+        "wind": {"speed": 3.1},
+        "sys": {"country": "IN"},
+        "timezone": 19800,
+    }
+
+
+def forecast(city: str, count: int) -> dict:
+    start = 1_700_000_000
+    slots = [{
+        "dt": start + i * 3 * 3600,
+        "main": {"temp": 24 + i % 8, "temp_min": 23 + i % 8, "temp_max": 26 + i % 8, "humidity": 70},
+        "weather": [{"id": 500 if i % 5 == 0 else 801, "main": "Clouds", "description": "few clouds"}],
+        "pop": 0.4 if i % 5 == 0 else 0.1,
+    } for i in range(count)]
+    return {"cnt": count, "list": slots, "city": {"name": city, "country": "IN", "timezone": 19800}}
+
+
+def exchange_rates(base: str) -> dict:
+    base = base.upper()
+    pivot = RATES.get(base, 1.0)
+    return {
+        "result": "success",
+        "base_code": base,
+        "time_next_update_unix": int(time.time()) + 3600,
+        "conversion_rates": {code: rate / pivot for code, rate in RATES.items()},
+    }
+
+
+def tavily_search(query: str) -> dict:
+    return {
+        "query": query,
+        "answer": f"Stub answer for '{query}': a fort, a lake-side market and a local thali restaurant.",
+        "results": [
+            {"title": f"Result {i} for {query}", "url": f"https://example.com/{i}",
+             "content": "Placeholder content from the benchmark stub.", "score": 0.9 - i / 10}
+            for i in range(3)
+        ],
+    }
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    # Set per server by serve(); seconds slept before every answer
+    latency = 0.0
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, payload: dict):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        url = urlparse(self.path)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        # Known destinations are queried by coordinates, others by name
+        place = params.get("q") or f"{params.get('lat', '')},{params.get('lon', '')}"
+        parts = [part for part in url.path.split("/") if part]
+        if parts[:1] == ["weather"]:
+            return self._send(200, current_weather(place))
+        if parts[:1] == ["forecast"]:
+            return self._send(200, forecast(place, int(params.get("cnt", 40))))
+        # ExchangeRate-API: /<key>/latest/<base>
+        if len(parts) == 3 and parts[1] == "latest":
+            return self._send(200, exchange_rates(parts[2]))
+        self._send(404, {"error": f"no stub for {url.path}"})
+
+    def do_POST(self):
+        time.sleep(self.latency)
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        if urlparse(self.path).path.rstrip("/") == "/search":
+            return self._send(200, tavily_search(body.get("query", "")))
+        self._send(404, {"error": f"no stub for {self.path}"})
+
+
+def serve(port: int = 0, latency: float = 0.0) -> ThreadingHTTPServer:
+    """Start the stubs on a background thread; ``port=0`` picks a free port."""
+    handler = type("ConfiguredStubHandler", (StubHandler,), {"latency": latency})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def environment(server: ThreadingHTTPServer) -> dict:
+    """Environment variables that point the app's clients at ``server``."""
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    return {
+        "OPENWEATHER_BASE_URL": base,
+        "EXCHANGE_RATE_BASE_URL": base,
+        "TAVILY_API_BASE_URL": base,
+        "OPENWEATHERMAP_API_KEY": "stub-key",
+        "EXCHANGE_RATE_API_KEY": "stub-key",
+        "TAVILY_API_KEY": "stub-key",
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="delay added to every answer")
+    args = parser.parse_args()
+
+    server = serve(args.port, args.latency_ms / 1000)
+    for key, value in environment(server).items():
+        print(f"export {key}={value}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
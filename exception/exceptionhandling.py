@@ -0,0 +1,18 @@
+class TripPlannerError(Exception):
+    """Base class for errors raised by the trip planner service."""
+
+
+class SchedulerQueueFullError(TripPlannerError):
+    """Raised when the request queue is full and a new request must be shed."""
+
+
+class JobQueueFullError(TripPlannerError):
+    """Raised when too many background jobs are already waiting to run."""
+
+
+class UnknownThreadError(TripPlannerError):
+    """Raised when a request names a conversation thread this server never started."""
+
+
+class InvalidWebhookError(TripPlannerError):
+    """Raised when a webhook URL is not https or points at a host the server must not call."""
@@ -0,0 +1,17 @@
+# Production settings for the Flask web tier: gunicorn -c gunicorn.conf.py app:app
+#
+# gevent workers patch sockets so every chat is a cheap greenlet instead of an
+# OS thread: a worker blocked on a 40 s plan (or an open SSE stream) costs a
+# few KB, and one process holds hundreds of concurrent chats. All greenlets
+# share the keep-alive pool to the backend (AI_BACKEND_POOL_SIZE in app.py).
+import os
+
+bind = os.getenv("WEB_BIND", "0.0.0.0:5000")
+workers = int(os.getenv("WEB_WORKERS", "2"))
+worker_class = "gevent"
+# Concurrent chats per worker; app.py sizes its backend pool from the same variable
+worker_connections = int(os.getenv("WEB_WORKER_CONNECTIONS", "500"))
+# Streams stay open for a whole plan, longer than the backend's request timeout
+timeout = 180
+graceful_timeout = 30
+keepalive = 5
@@ -1,15 +1,93 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Header, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from agent.agentic_workflow import GraphBuilder
-from utils.save_to_document import save_document
-from starlette.responses import JSONResponse
+from agent.graph_manager import GraphManager
+from agent.streaming import stream_agent_events, format_sse
+from agent.batch import read_items, run_batch
+from utils.config_loader import load_config
+from utils.request_scheduler import RequestScheduler
+from utils.response_cache import ResponseCache
+from utils.job_queue import JobQueue
+from prompt_library.prompt import PROMPT_VERSION
+from exception.exceptionhandling import (SchedulerQueueFullError, JobQueueFullError, UnknownThreadError,
+                                         InvalidWebhookError)
+from utils.plan_store import PlanStore
+from utils.itinerary import cache_payload, from_cache_payload
+from utils import metrics
+from LOGGER.logging import get_logger, request_id_var
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import JSONResponse, Response, StreamingResponse
+import asyncio
+import json
 import os
+import time
+import uuid
 import datetime
+import hmac
+from typing import Optional
 from dotenv import load_dotenv
 from pydantic import BaseModel
 load_dotenv()
 
-app = FastAPI(title="AI Trip Planner API", version="1.0.0")
+logger = get_logger("api")
+
+config = load_config()
+graph_manager = GraphManager(model_provider=os.getenv("MODEL_PROVIDER", "groq"))
+scheduler = RequestScheduler.from_config(config)
+response_cache = ResponseCache.from_config(config)
+job_queue = JobQueue.from_config(config)
+plan_store = PlanStore.from_config(config)
+memory_settings = config.get("memory", {}) or {}
+batch_settings = config.get("batch", {}) or {}
+
+# Startup build of the agent graph, running in a worker thread while the server already answers /health
+warmup_task = None
+# Rebuilds run in a worker thread, one at a time
+graph_lock = asyncio.Lock()
+
+def start_warmup():
+    global warmup_task
+    warmup_task = asyncio.create_task(run_in_threadpool(graph_manager.get))
+    job_queue.start(run_job)
+
+async def stop_background_work():
+    await job_queue.stop()
+    if plan_store is not None:
+        # Let queued plan writes reach the disk
+        await run_in_threadpool(plan_store.close)
+
+async def ready_graph():
+    """Return the compiled graph, waiting for the startup build if it is still running.
+
+    A rebuild after a config change runs in a worker thread, so the event
+    loop keeps serving other requests meanwhile.
+    """
+    if warmup_task is not None and not warmup_task.done():
+        await asyncio.shield(warmup_task)
+    graph = graph_manager.current()
+    if graph is not None:
+        return graph
+    async with graph_lock:
+        return await run_in_threadpool(graph_manager.get)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Build the agent graph once per process, in the background; requests reuse it
+    if memory_settings.get("enabled", False):
+        from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+        checkpoint_path = memory_settings.get("checkpoint_path", "./cache/checkpoints.sqlite3")
+        os.makedirs(os.path.dirname(os.path.abspath(checkpoint_path)), exist_ok=True)
+        async with AsyncSqliteSaver.from_conn_string(checkpoint_path) as checkpointer:
+            graph_manager.attach_checkpointer(checkpointer)
+            start_warmup()
+            yield
+            await stop_background_work()
+    else:
+        start_warmup()
+        yield
+        await stop_background_work()
+
+app = FastAPI(title="AI Trip Planner API", version="1.0.0", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -19,8 +97,73 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+async def run_in_slot(coro_factory):
+    """Run a background job in a scheduler slot; the job queue applies its own, longer timeout."""
+    async with scheduler.slot():
+        return await coro_factory()
+
+async def run_job(job):
+    return await answer_question(job.question, job.thread_id, run_in_slot)
+
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    """Tag every log record of a request with its id and time the request."""
+    request_id = request.headers.get("X-Request-ID") or uuid.uuid4().hex
+    token = request_id_var.set(request_id)
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        response.headers["X-Request-ID"] = request_id
+        return response
+    finally:
+        # Streaming responses are timed up to their first byte; the stream itself is logged by its handler
+        seconds = time.perf_counter() - start
+        route = request.scope.get("route")
+        path = getattr(route, "path", "unmatched")
+        metrics.observe_request(path, status, seconds)
+        logger.info("request", extra={"method": request.method, "path": path, "status": status,
+                                      "duration_ms": round(seconds * 1000, 1)})
+        request_id_var.reset(token)
+
 class QueryRequest(BaseModel):
     question: str
+    # Continue a saved conversation; a new thread is started when omitted
+    thread_id: Optional[str] = None
+
+class JobRequest(QueryRequest):
+    # Higher runs first
+    priority: int = 0
+    # The finished job is POSTed here
+    webhook_url: Optional[str] = None
+
+async def thread_config(react_app, thread_id: Optional[str]):
+    """Resolve the thread id and the run config for a request.
+
+    Without an id a new thread is started. An id with no checkpoint was not
+    issued by this server, so it raises UnknownThreadError instead of
+    silently starting a fresh conversation under that id.
+    """
+    if graph_manager.checkpointer is None:
+        return None, None
+    if thread_id is None:
+        thread_id = uuid.uuid4().hex
+        return thread_id, {"configurable": {"thread_id": thread_id}}
+    run_config = {"configurable": {"thread_id": thread_id}}
+    if (await react_app.aget_state(run_config)).created_at is None:
+        raise UnknownThreadError(f"Unknown thread_id {thread_id!r}; omit it to start a new conversation")
+    return thread_id, run_config
+
+async def remember_exchange(react_app, run_config, question: str, answer: str):
+    """Record a cache-served exchange in the thread so follow-ups have its context."""
+    if run_config is not None:
+        from langchain_core.messages import AIMessage, HumanMessage
+        await react_app.aupdate_state(
+            run_config,
+            {"messages": [HumanMessage(content=question), AIMessage(content=answer)]},
+            as_node="agent",
+        )
 
 @app.get("/")
 async def root():
@@ -28,45 +171,288 @@ async def root():
 
 @app.get("/health")
 async def health():
+    """Liveness: the process is up, whether or not the agent graph is built yet"""
     return {"status": "healthy", "timestamp": datetime.datetime.now().isoformat()}
 
+@app.get("/ready")
+async def ready():
+    """Readiness: 503 until the agent graph is built, so new replicas only get traffic they can serve"""
+    if not graph_manager.is_built:
+        failed = warmup_task is not None and warmup_task.done() and warmup_task.exception() is not None
+        return JSONResponse(status_code=503, content={"status": "failed" if failed else "starting"})
+    return {"status": "ready", "graph_version": graph_manager.version}
+
+@app.post("/admin/reload")
+async def reload_graph(x_admin_token: Optional[str] = Header(default=None)):
+    """Rebuild the agent graph; needs the ADMIN_TOKEN env var set and sent as X-Admin-Token.
+
+    Only the graph is rebuilt. Changes to the server, cache, jobs, batch and
+    plans settings take effect on restart.
+    """
+    admin_token = os.getenv("ADMIN_TOKEN")
+    if not admin_token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if x_admin_token is None or not hmac.compare_digest(x_admin_token, admin_token):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+    async with graph_lock:
+        await run_in_threadpool(graph_manager.reload)
+    return {"status": "reloaded", "graph_version": graph_manager.version}
+
+@app.get("/metrics")
+async def prometheus_metrics():
+    """Prometheus histograms for requests, graph builds, LLM turns, tool and upstream calls, and cache lookups"""
+    rendered = metrics.render()
+    if rendered is None:
+        return JSONResponse(status_code=501, content={"error": "prometheus_client is not installed"})
+    body, content_type = rendered
+    return Response(content=body, media_type=content_type)
+
+@app.get("/scheduler")
+async def scheduler_stats():
+    return scheduler.stats()
+
+@app.get("/llm/stats")
+async def llm_stats():
+    """Rolling latency and error rate per route when the LLM router is enabled"""
+    stats = getattr(graph_manager.llm, "stats", None)
+    return stats() if callable(stats) else {"router": False}
+
+@app.get("/cache/stats")
+async def cache_stats():
+    if response_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **await run_in_threadpool(response_cache.stats)}
+
+async def cached_answer(question: str):
+    """``(answer, itinerary)`` from the response cache, or None on a miss."""
+    if response_cache is None:
+        return None
+    payload = await run_in_threadpool(response_cache.get, question, graph_manager.model_name, PROMPT_VERSION)
+    return None if payload is None else from_cache_payload(payload)
+
+async def store_answer(question: str, answer: str, itinerary: Optional[dict]):
+    if response_cache is not None and answer:
+        await run_in_threadpool(response_cache.put, question, cache_payload(answer, itinerary),
+                                graph_manager.model_name, PROMPT_VERSION)
+
+def record_plan(question: str, answer: str, started: float, thread_id: Optional[str],
+                itinerary: Optional[dict] = None):
+    """Queue a freshly generated plan for the plan store; the response does not wait for the write."""
+    if plan_store is not None and answer:
+        plan_store.save_async(question, answer, model=graph_manager.model_name,
+                              latency_ms=round((time.perf_counter() - started) * 1000, 1), thread_id=thread_id,
+                              itinerary=itinerary)
+
+@app.get("/plans/search")
+async def search_plans(q: Optional[str] = None, destination: Optional[str] = None,
+                       max_budget: Optional[int] = None, currency: Optional[str] = None,
+                       days: Optional[int] = None, text: Optional[str] = None, limit: int = 10):
+    """Previous plans, from a plain request ("Goa under ₹50k") in q or from explicit filters"""
+    if plan_store is None:
+        return JSONResponse(status_code=404, content={"error": "Plan store is disabled"})
+    limit = max(1, min(limit, 100))
+    if q:
+        plans = await run_in_threadpool(plan_store.search_question, q, limit)
+    else:
+        plans = await run_in_threadpool(plan_store.search, destination, max_budget, currency, days, text, limit)
+    return {"count": len(plans), "plans": plans}
+
+@app.get("/plans/stats")
+async def plan_stats():
+    if plan_store is None:
+        return {"enabled": False}
+    return {"enabled": True, **await run_in_threadpool(plan_store.stats)}
+
+@app.get("/graph.png")
+async def graph_png():
+    """Mermaid rendering of the agent graph, cached per graph version"""
+    try:
+        png = await run_in_threadpool(graph_manager.render_png)
+    except Exception as e:
+        return JSONResponse(status_code=502, content={"error": f"Graph rendering failed: {e}"})
+    return Response(content=png, media_type="image/png",
+                    headers={"ETag": f'"graph-v{graph_manager.version}"'})
+
+async def answer_question(question: str, thread_id: Optional[str], run) -> dict:
+    """Answer from the response cache, or run the agent graph via ``run(coro_factory)``."""
+    started = time.perf_counter()
+    react_app = await ready_graph()
+    resolved_thread_id, run_config = await thread_config(react_app, thread_id)
+
+    # Follow-ups depend on the thread's history, so only new conversations use the cache
+    cached = await cached_answer(question) if thread_id is None else None
+    if cached is not None:
+        logger.info("answered from response cache")
+        answer, itinerary = cached
+        await remember_exchange(react_app, run_config, question, answer)
+        return {"answer": answer, "itinerary": itinerary, "cached": True, "thread_id": resolved_thread_id}
+
+    # Prepare messages for the AI; None clears the tool latencies of earlier turns on this thread
+    messages = {"messages": [question], "tool_latencies": None}
+    output = await run(lambda: react_app.ainvoke(messages, config=run_config))
+
+    # Extract the AI response
+    tool_latencies, itinerary = [], None
+    if isinstance(output, dict) and "messages" in output:
+        final_output = output["messages"][-1].content  # Last AI response, the rendered itinerary if one was submitted
+        tool_latencies = output.get("tool_latencies", [])
+        itinerary = output.get("itinerary")
+    else:
+        final_output = str(output)
+
+    summary = {"answer_preview": final_output[:100], "tool_calls": len(tool_latencies),
+               "structured": itinerary is not None}
+    if tool_latencies:
+        slowest = max(tool_latencies, key=lambda t: t["latency_ms"])
+        summary.update(slowest_tool=slowest["tool"], slowest_tool_ms=slowest["latency_ms"])
+    logger.info("query answered", extra=summary)
+    if thread_id is None:
+        await store_answer(question, final_output, itinerary)
+    record_plan(question, final_output, started, resolved_thread_id, itinerary)
+    return {"answer": final_output, "itinerary": itinerary, "tool_latencies": tool_latencies,
+            "thread_id": resolved_thread_id}
+
 @app.post("/query")
 async def query_travel_agent(query: QueryRequest):
     try:
-        print(f"Received query: {query.question}")
-        graph = GraphBuilder(model_provider="groq")
-        react_app = graph()
-        
-        png_graph = react_app.get_graph().draw_mermaid_png()
-        with open("my_graph.png", "wb") as f:
-            f.write(png_graph)
-
-        print(f"Graph saved as 'my_graph.png' in {os.getcwd()}")
-        
-        # Prepare messages for the AI
-        messages = {"messages": [query.question]}
-        output = react_app.invoke(messages)
-
-        # Extract the AI response
-        if isinstance(output, dict) and "messages" in output:
-            final_output = output["messages"][-1].content  # Last AI response
-        else:
-            final_output = str(output)
-        
-        print(f"AI Response: {final_output[:100]}...")  # Log first 100 chars
-        return {"answer": final_output}
-        
+        logger.info("query received", extra={"question": query.question, "thread_id": query.thread_id})
+        return await answer_question(query.question, query.thread_id, scheduler.run)
+
+    except UnknownThreadError as e:
+        return JSONResponse(status_code=404, content={"error": str(e)})
+    except SchedulerQueueFullError as e:
+        logger.warning("rejecting query, scheduler is saturated", extra={"error": str(e)})
+        return JSONResponse(status_code=503, content={"error": "Server busy, please retry shortly"},
+                            headers={"Retry-After": "5"})
+    except TimeoutError:
+        logger.warning("query timed out")
+        return JSONResponse(status_code=504, content={"error": "Trip planning timed out"})
     except Exception as e:
-        print(f"Error in query_travel_agent: {str(e)}")
+        logger.exception("query failed")
         return JSONResponse(status_code=500, content={"error": str(e)})
 
+@app.post("/jobs", status_code=202)
+async def submit_job(request: JobRequest):
+    """Queue a trip plan and return its job id at once; poll GET /jobs/{id} or wait for the webhook"""
+    if request.thread_id is not None:
+        try:
+            await thread_config(await ready_graph(), request.thread_id)
+        except UnknownThreadError as e:
+            return JSONResponse(status_code=404, content={"error": str(e)})
+    if request.webhook_url is not None:
+        try:
+            await job_queue.check_webhook(request.webhook_url)
+        except InvalidWebhookError as e:
+            return JSONResponse(status_code=400, content={"error": str(e)})
+    try:
+        job, deduplicated = job_queue.submit(request.question, request.thread_id,
+                                             request.priority, request.webhook_url)
+    except JobQueueFullError as e:
+        logger.warning("rejecting job, queue is full", extra={"error": str(e)})
+        return JSONResponse(status_code=503, content={"error": "Job queue is full, please retry shortly"},
+                            headers={"Retry-After": "30"})
+    logger.info("job submitted", extra={"job_id": job.id, "deduplicated": deduplicated})
+    return {**job.to_dict(), "deduplicated": deduplicated}
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown job")
+    return job.to_dict()
+
+@app.delete("/jobs/{job_id}")
+async def cancel_job(job_id: str):
+    job = job_queue.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown job")
+    return job.to_dict()
+
+@app.get("/jobs")
+async def job_stats():
+    return job_queue.stats()
+
+@app.post("/batch")
+async def batch_query(request: Request, parallel: Optional[int] = None):
+    """Plan every question of a JSONL body; results stream back as JSONL in completion order"""
+    try:
+        items = read_items((await request.body()).decode("utf-8").splitlines())
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"error": f"Invalid JSONL: {e}"})
+    limit = batch_settings.get("max_parallel", 4)
+    parallel = min(parallel or limit, limit)
+    logger.info("batch received", extra={"items": len(items), "parallel": parallel})
+
+    async def results():
+        async for record in run_batch(items, lambda q: answer_question(q, None, run_in_slot),
+                                      parallel, scheduler.timeout):
+            yield json.dumps(record, ensure_ascii=False, default=str) + "\n"
+
+    return StreamingResponse(results(), media_type="application/x-ndjson")
+
+@app.post("/query/stream")
+async def query_travel_agent_stream(query: QueryRequest):
+    """Stream LLM tokens and tool progress for a trip plan as Server-Sent Events"""
+    started = time.perf_counter()
+    react_app = await ready_graph()
+    try:
+        thread_id, run_config = await thread_config(react_app, query.thread_id)
+    except UnknownThreadError as e:
+        return JSONResponse(status_code=404, content={"error": str(e)})
+
+    cached = await cached_answer(query.question) if query.thread_id is None else None
+    if cached is not None:
+        logger.info("answered streamed query from response cache")
+        answer, itinerary = cached
+        await remember_exchange(react_app, run_config, query.question, answer)
+
+        async def cached_stream():
+            yield format_sse("token", {"text": answer})
+            yield format_sse("done", {"answer": answer, "itinerary": itinerary, "cached": True,
+                                      "thread_id": thread_id})
+
+        return StreamingResponse(cached_stream(), media_type="text/event-stream",
+                                 headers={"Cache-Control": "no-cache"})
+
+    try:
+        scheduler.check_capacity()
+    except SchedulerQueueFullError as e:
+        logger.warning("rejecting streamed query, scheduler is saturated", extra={"error": str(e)})
+        return JSONResponse(status_code=503, content={"error": "Server busy, please retry shortly"},
+                            headers={"Retry-After": "5"})
+
+    logger.info("streamed query received", extra={"question": query.question, "thread_id": query.thread_id})
+    messages = {"messages": [query.question], "tool_latencies": None}
+
+    async def event_stream():
+        try:
+            async with asyncio.timeout(scheduler.timeout):
+                async with scheduler.slot():
+                    async for event, data in stream_agent_events(react_app, messages, run_config):
+                        if event == "done":
+                            data["thread_id"] = thread_id
+                            if query.thread_id is None:
+                                await store_answer(query.question, data["answer"], data.get("itinerary"))
+                            record_plan(query.question, data["answer"], started, thread_id, data.get("itinerary"))
+                        yield format_sse(event, data)
+        except SchedulerQueueFullError:
+            yield format_sse("error", {"error": "Server busy, please retry shortly"})
+        except TimeoutError:
+            yield format_sse("error", {"error": "Trip planning timed out"})
+        except Exception as e:
+            logger.exception("streamed query failed")
+            yield format_sse("error", {"error": str(e)})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 if __name__ == "__main__":
     import uvicorn
-    print("🚀 Starting AI Trip Planner API...")
-    print("📡 API will be available at: http://localhost:8000")
-    print("🔍 Health check: http://localhost:8000/health")
-    print("💬 Chat endpoint: http://localhost:8000/query")
-    print("Press Ctrl+C to stop")
+    logger.info("starting AI Trip Planner API on http://localhost:8000 "
+                "(health: /health, chat: /query, streaming: /query/stream, metrics: /metrics)")
     
     uvicorn.run(
         "main:app",
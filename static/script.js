@@ -33,6 +33,9 @@ let chatMessages = [
     }
 ];
 
+// Conversation thread on the backend, so follow-up questions continue the same plan
+let threadId = null;
+
 function addMessage(sender, text) {
     const timestamp = new Date().toLocaleTimeString([], { hour: '2-digit', minute: '2-digit' });
     const message = {
@@ -89,73 +92,106 @@ function sendMessage() {
     if (message) {
         addMessage('user', message);
         input.value = '';
-        
-        // Show typing indicator
-        const typingId = `typing-${Date.now()}`;
-        const timestamp = new Date().toLocaleTimeString([], { hour: '2-digit', minute: '2-digit' });
-        chatMessages.push({ sender: 'bot', text: 'Typing...', time: timestamp, id: typingId, typing: true });
-        displayMessages();
-        scrollToBottom();
-
-        // Call backend AI
-        fetch('/api/chat', {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({ message })
-        })
-        .then(async (res) => {
-            if (!res.ok) {
-                throw new Error(`HTTP ${res.status}`);
-            }
-            return res.json();
-        })
-        .then((data) => {
-            // Remove typing indicator
-            chatMessages = chatMessages.filter(m => !m.typing);
-            const aiText = (data && data.response) ? data.response : generateAIResponse(message);
-            addMessage('bot', aiText);
-        })
-        .catch((err) => {
-            console.error('Chat API error:', err);
-            // Remove typing indicator and fallback
-            chatMessages = chatMessages.filter(m => !m.typing);
-            addMessage('bot', generateAIResponse(message));
-        });
+        requestAIResponse(message);
     }
 }
 
 function quickMessage(text) {
     addMessage('user', text);
+    requestAIResponse(text);
+}
+
+// Re-render only the bubble of the message being streamed
+function updateStreamingMessage(msg) {
+    const bodies = document.querySelectorAll('#chatMessages .message-body');
+    const body = bodies[bodies.length - 1];
+    if (body) {
+        body.innerHTML = window.marked ? marked.parse(String(msg.text)) : String(msg.text);
+    }
+    scrollToBottom();
+}
+
+// Parse a Server-Sent Events frame into { event, data }
+function parseSSEFrame(frame) {
+    let event = 'message';
+    const dataLines = [];
+    frame.split('\n').forEach(line => {
+        if (line.startsWith('event:')) {
+            event = line.slice(6).trim();
+        } else if (line.startsWith('data:')) {
+            dataLines.push(line.slice(5).trim());
+        }
+    });
+    return { event, data: dataLines.length ? JSON.parse(dataLines.join('\n')) : {} };
+}
 
-    // Show typing indicator
+async function requestAIResponse(message) {
+    // Show typing indicator, which becomes the streamed answer once tokens arrive
     const typingId = `typing-${Date.now()}`;
     const timestamp = new Date().toLocaleTimeString([], { hour: '2-digit', minute: '2-digit' });
-    chatMessages.push({ sender: 'bot', text: 'Typing...', time: timestamp, id: typingId, typing: true });
+    const botMessage = { sender: 'bot', text: 'Typing...', time: timestamp, id: typingId, typing: true };
+    chatMessages.push(botMessage);
     displayMessages();
     scrollToBottom();
 
-    // Call backend AI
-    fetch('/api/chat', {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({ message: text })
-    })
-    .then(async (res) => {
-        if (!res.ok) {
+    let streamedText = '';
+    let finished = false;
+    try {
+        const res = await fetch('/api/chat', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json', 'Accept': 'text/event-stream' },
+            body: JSON.stringify({ message, thread_id: threadId })
+        });
+        if (!res.ok || !res.body) {
             throw new Error(`HTTP ${res.status}`);
         }
-        return res.json();
-    })
-    .then((data) => {
-        chatMessages = chatMessages.filter(m => !m.typing);
-        const aiText = (data && data.response) ? data.response : generateAIResponse(text);
-        addMessage('bot', aiText);
-    })
-    .catch((err) => {
+
+        const reader = res.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        while (!finished) {
+            const { value, done } = await reader.read();
+            if (done) {
+                break;
+            }
+            buffer += decoder.decode(value, { stream: true });
+            let boundary;
+            while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                const frame = buffer.slice(0, boundary);
+                buffer = buffer.slice(boundary + 2);
+                const { event, data } = parseSSEFrame(frame);
+                if (event === 'token') {
+                    streamedText += data.text || '';
+                    botMessage.text = streamedText;
+                    botMessage.typing = false;
+                    updateStreamingMessage(botMessage);
+                } else if (event === 'tool_start' && !streamedText) {
+                    botMessage.text = `Looking up ${data.name}...`;
+                    updateStreamingMessage(botMessage);
+                } else if (event === 'done') {
+                    threadId = data.thread_id || threadId;
+                    botMessage.text = data.answer || streamedText || generateAIResponse(message);
+                    finished = true;
+                } else if (event === 'error') {
+                    throw new Error(data.error || 'Stream error');
+                }
+            }
+        }
+        if (!finished && !streamedText) {
+            throw new Error('Stream ended without a response');
+        }
+        if (!finished) {
+            botMessage.text = streamedText;
+        }
+    } catch (err) {
         console.error('Chat API error:', err);
-        chatMessages = chatMessages.filter(m => !m.typing);
-        addMessage('bot', generateAIResponse(text));
-    });
+        botMessage.text = streamedText || generateAIResponse(message);
+    }
+
+    botMessage.typing = false;
+    botMessage.time = new Date().toLocaleTimeString([], { hour: '2-digit', minute: '2-digit' });
+    displayMessages();
+    scrollToBottom();
 }
 
 function generateAIResponse(userMessage) {
@@ -0,0 +1,19 @@
+import pytest
+from agent.batch import read_items
+
+
+def test_items_are_keyed_by_id_or_line_number():
+    lines = ['{"id": "a", "question": "3 days in Goa"}', "", '{"question": "Jaipur for 2"}',
+             '{"request_id": 7, "question": "Kerala"}']
+    assert read_items(lines) == [
+        {"id": "a", "question": "3 days in Goa"},
+        {"id": "line-3", "question": "Jaipur for 2"},
+        {"id": "7", "question": "Kerala"},
+    ]
+
+
+@pytest.mark.parametrize("line", ['["3 days in Goa"]', '"3 days in Goa"', "42", "null",
+                                  '{"id": "a"}', '{"question": 5}'])
+def test_lines_that_are_not_question_objects_are_rejected(line):
+    with pytest.raises(ValueError, match="line 1"):
+        read_items([line])
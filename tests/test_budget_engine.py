@@ -0,0 +1,19 @@
+from utils.budget_engine import BudgetEngine, LineItem
+
+
+def test_items_without_a_currency_are_in_the_report_currency():
+    hotel = LineItem(category="Accommodation", amount=3000, basis="per_night")
+    report = BudgetEngine().compute([hotel], days=3, currency="INR")
+
+    assert report.total == 6000
+    assert report.by_currency == {"INR": 6000}
+
+
+def test_items_in_other_currencies_are_converted():
+    items = [LineItem(category="Accommodation", amount=3000, basis="per_night"),
+             LineItem(category="Flights", amount=100, currency="usd")]
+    engine = BudgetEngine(lambda: {"USD": 1.0, "INR": 80.0})
+    report = engine.compute(items, days=3, currency="INR")
+
+    assert report.total == 6000 + 8000
+    assert report.by_currency == {"INR": 6000, "USD": 100}
@@ -0,0 +1,44 @@
+import json
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+from agent.context import ContextBudget
+
+SYSTEM = [SystemMessage(content="You plan trips.")]
+
+
+def tool_turn(question: str, payload_chars: int) -> list:
+    call = {"name": "search_places", "args": {"place": question}, "id": f"call_{len(question)}"}
+    return [
+        HumanMessage(content=question),
+        AIMessage(content="", tool_calls=[call]),
+        ToolMessage(content=json.dumps({"results": "x" * payload_chars}), name="search_places",
+                    tool_call_id=call["id"]),
+    ]
+
+
+def test_current_tool_results_are_kept_when_over_budget():
+    budget = ContextBudget(max_input_tokens=300, max_tool_output_chars=2000)
+    history = tool_turn("Earlier question about Goa", 100) + [AIMessage(content="Goa plan")]
+    history += tool_turn("3 days in Jaipur", 5000)
+
+    messages = budget.build(SYSTEM, history)
+
+    assert isinstance(messages[-1], ToolMessage)
+    assert isinstance(messages[-2], AIMessage) and messages[-2].tool_calls
+    assert messages[-3].content == "3 days in Jaipur"
+    assert len(messages[-1].content) < 2000
+    assert budget.count_tokens(messages) <= 300
+
+
+def test_only_questions_actually_dropped_are_noted():
+    budget = ContextBudget(max_input_tokens=120)
+    history = [HumanMessage(content="Old question about Goa"), AIMessage(content="g" * 800),
+               HumanMessage(content="Follow-up about Jaipur"), AIMessage(content="Jaipur plan"),
+               HumanMessage(content="And Udaipur?")]
+
+    messages = budget.build(SYSTEM, history)
+    notes = [m.content for m in messages if isinstance(m, SystemMessage)][1:]
+
+    assert len(notes) == 1
+    assert "Old question about Goa" in notes[0]
+    assert "Udaipur" not in notes[0]
+    assert messages[-1].content == "And Udaipur?"
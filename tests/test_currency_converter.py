@@ -0,0 +1,16 @@
+from utils.currency_converter import CurrencyConverter
+
+
+def test_convert_many_reads_the_rate_table_once(monkeypatch):
+    converter = CurrencyConverter("test-key")
+    lookups = []
+
+    def get_rates(base=None):
+        lookups.append(base)
+        return {"USD": 1.0, "INR": 80.0, "EUR": 0.9}
+
+    monkeypatch.setattr(converter, "get_rates", get_rates)
+    converted = converter.convert_many([(10, "usd", "INR"), (90, "EUR", "USD"), (5, "INR", "INR")])
+
+    assert converted == [800.0, 100.0, 5.0]
+    assert len(lookups) == 1
@@ -0,0 +1,21 @@
+import pytest
+from utils.currency_localizer import CurrencyLocalizer, get_detector
+
+
+@pytest.mark.parametrize("question, currency", [
+    ("10 days in India", "INR"),
+    ("Himachal trip", "INR"),
+    ("trip to Japan", "JPY"),
+    ("Thailand beaches", "THB"),
+    ("2 weeks in Italy", "EUR"),
+    ("Paris trip", "EUR"),
+    ("Goa under €500", "EUR"),
+    ("a nice trip", None),
+])
+def test_currency_comes_from_countries_states_and_destinations(question, currency):
+    assert get_detector().detect(question) == currency
+
+
+def test_a_destination_qualified_by_another_country_is_not_relabelled():
+    assert get_detector().detect("Paris, Texas road trip") == "USD"
+    assert CurrencyLocalizer.for_message("Paris, Texas road trip").localize("about $300") == "about $300"
@@ -0,0 +1,27 @@
+import pytest
+from utils.destination_index import get_index, resolve
+
+
+@pytest.mark.parametrize("place, expected", [
+    ("Paris", "paris-fr"),
+    ("Paris, France", "paris-fr"),
+    ("Manali, HP", "manali-in"),
+    ("Manali India", "manali-in"),
+    ("Edinburgh, Scotland", "edinburgh-gb"),
+    ("Jaipurr", "jaipur-in"),
+])
+def test_places_resolve_with_their_own_qualifiers(place, expected):
+    assert resolve(place).id == expected
+
+
+@pytest.mark.parametrize("place", [
+    "Paris, Texas", "Melbourne, Florida", "Sydney Nova Scotia", "London, Ontario", "Pariss, Texas",
+])
+def test_a_qualifier_from_another_country_means_another_place(place):
+    assert resolve(place) is None
+
+
+def test_free_text_skips_a_name_qualified_by_another_country():
+    assert get_index().match_in_text("3 days in Paris, Texas") is None
+    assert get_index().match_in_text("London, Ontario then Toronto")[0].id == "toronto-ca"
+    assert get_index().match_in_text("Dubai and Turkey in May")[0].id == "dubai-ae"
@@ -0,0 +1,36 @@
+import json
+from langchain_core.utils.json import parse_partial_json
+from utils.itinerary import Itinerary, partial_markdown
+
+PLAN = {
+    "destination": "Goa",
+    "currency": "INR",
+    "summary": "Beaches and old churches.",
+    "days": [
+        {"day": 1, "title": "North Goa", "activities": [{"name": "Calangute", "time": "Morning", "cost": 500}]},
+        {"day": 2, "title": "Old Goa", "activities": [{"name": "Basilica of Bom Jesus"}]},
+    ],
+    "hotels": [{"name": "Casa Anjuna", "area": "Anjuna", "price_per_night": 4000}],
+    "costs": [{"category": "Accommodation", "amount": 8000}],
+    "notes": ["Carry sunscreen."],
+}
+
+
+def test_partial_markdown_is_always_a_prefix_of_the_final_rendering():
+    args = json.dumps(PLAN)
+    final = Itinerary.model_validate(PLAN).to_markdown()
+    seen = ""
+    for end in range(1, len(args) + 1):
+        data = parse_partial_json(args[:end])
+        markdown = partial_markdown(data) if isinstance(data, dict) else ""
+        assert final.startswith(markdown)
+        seen = max(seen, markdown, key=len)
+    assert "### Where to stay" in seen
+
+
+def test_partial_markdown_waits_for_a_day_to_finish():
+    args = json.dumps(PLAN)
+    cut = args.index("Basilica")
+    markdown = partial_markdown(parse_partial_json(args[:cut]))
+    assert "### Day 1: North Goa" in markdown
+    assert "### Day 2" not in markdown
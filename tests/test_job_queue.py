@@ -0,0 +1,51 @@
+import asyncio
+import pytest
+from exception.exceptionhandling import InvalidWebhookError, SchedulerQueueFullError
+from utils import job_queue as job_queue_module
+from utils.job_queue import SUCCEEDED, JobQueue
+
+
+@pytest.mark.parametrize("url", [
+    "http://example.com/hook",
+    "https://127.0.0.1/hook",
+    "https://localhost/hook",
+    "https://10.0.0.5/hook",
+    "https://169.254.169.254/latest/meta-data",
+    "https://[::1]/hook",
+    "not a url",
+])
+def test_webhooks_to_private_hosts_or_without_https_are_refused(url):
+    with pytest.raises(InvalidWebhookError):
+        asyncio.run(JobQueue().check_webhook(url))
+
+
+def test_allowed_hosts_replace_the_address_check():
+    queue = JobQueue(webhook_allowed_hosts=["hooks.internal"])
+    asyncio.run(queue.check_webhook("https://hooks.internal/done"))
+    with pytest.raises(InvalidWebhookError):
+        asyncio.run(queue.check_webhook("https://example.com/done"))
+
+
+def test_requeued_job_keeps_its_place_and_does_not_hold_the_worker(monkeypatch):
+    monkeypatch.setattr(job_queue_module, "REQUEUE_DELAY_SECONDS", 0.01)
+    runs = []
+
+    async def runner(job):
+        runs.append(job.question)
+        if job.question == "first" and job.requeues == 0:
+            raise SchedulerQueueFullError("busy")
+        await asyncio.sleep(0.05)
+        return {"answer": job.question}
+
+    async def main():
+        queue = JobQueue(workers=1)
+        queue.start(runner)
+        jobs = [queue.submit(question)[0] for question in ("first", "second", "third")]
+        while not all(job.finished for job in jobs):
+            await asyncio.sleep(0.01)
+        await queue.stop()
+        return jobs
+
+    jobs = asyncio.run(main())
+    assert runs == ["first", "second", "first", "third"]
+    assert all(job.status == SUCCEEDED for job in jobs)
@@ -0,0 +1,47 @@
+import asyncio
+import pytest
+from langchain_core.messages import HumanMessage
+from utils.fake_llm import FakeChatModel
+from utils.llm_router import LLMRouter, ModelRoute
+
+
+class UpstreamError(Exception):
+    def __init__(self, status_code: int):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+def route(name: str, tier: str = "main", **kwargs) -> ModelRoute:
+    return ModelRoute(name, FakeChatModel(responses=[f"answer from {name}"], **kwargs), tier)
+
+
+def test_a_429_fails_over_and_cools_the_route_down():
+    limited, backup = route("limited", error=UpstreamError(429)), route("backup")
+    router = LLMRouter([limited, backup])
+
+    assert router.invoke([HumanMessage(content="hi")]).content == "answer from backup"
+    assert router.stats()["limited"]["cooling_down"]
+    assert [r.name for r in router.candidates()] == ["backup", "limited"]
+
+
+def test_async_calls_fail_over_too():
+    router = LLMRouter([route("limited", error=UpstreamError(503)), route("backup")])
+    assert asyncio.run(router.ainvoke([HumanMessage(content="hi")])).content == "answer from backup"
+
+
+def test_a_client_error_is_raised_without_failover():
+    router = LLMRouter([route("broken", error=UpstreamError(400)), route("backup")])
+    with pytest.raises(UpstreamError):
+        router.invoke([HumanMessage(content="hi")])
+
+
+def test_routes_are_ordered_by_rolling_p95_within_the_tier():
+    slow, quick, fast_tier = route("slow"), route("quick"), route("fast-tier", tier="fast")
+    for _ in range(20):
+        slow.stats.record(2.0, ok=True)
+        quick.stats.record(0.2, ok=True)
+    router = LLMRouter([fast_tier, slow, quick])
+
+    assert [r.name for r in router.candidates()] == ["quick", "slow", "fast-tier"]
+    assert router.invoke([HumanMessage(content="hi")]).content == "answer from quick"
+    assert [r.name for r in router.for_tier("fast").candidates()][0] == "fast-tier"
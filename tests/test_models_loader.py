@@ -0,0 +1,22 @@
+import pytest
+from utils.models_loader import ModelLoader
+
+
+def loader(provider: str, llm: dict) -> ModelLoader:
+    model_loader = ModelLoader(model_provider=provider)
+    model_loader.config.config = {"llm": llm}
+    return model_loader
+
+
+def test_every_accepted_provider_has_a_configured_model():
+    model_loader = ModelLoader()
+    for provider in ("groq", "openai", "fake"):
+        assert model_loader._model_name(provider)
+
+
+def test_a_missing_model_name_is_a_configuration_error():
+    model_loader = loader("openai", {"groq": {"model_name": "llama"}})
+    with pytest.raises(ValueError, match="llm.openai.model_name"):
+        model_loader.model_label()
+    with pytest.raises(ValueError, match="llm.openai.model_name"):
+        model_loader.load_chat_model("openai")
@@ -0,0 +1,35 @@
+import sqlite3
+from utils.plan_store import PlanStore
+
+
+def itinerary(total: float, currency: str = "INR") -> dict:
+    return {"destination": "Goa", "currency": currency, "days": [{"day": 1}],
+            "costs": [{"category": "Everything", "amount": total}]}
+
+
+def test_budget_search_uses_the_itinerary_total():
+    store = PlanStore(path=":memory:")
+    store.save("3 days in Goa under 50k", "cheap plan", itinerary=itinerary(42_000))
+    store.save("3 days in Goa under 50k", "over budget plan", itinerary=itinerary(65_000))
+    store.save("Goa trip with budget 30k", "plan without itinerary")
+
+    answers = {plan["answer"] for plan in store.search_question("plans for Goa under 50k")}
+
+    assert answers == {"cheap plan", "plan without itinerary"}
+    cheap = store.search(destination="Goa", max_budget=45_000, currency="INR")
+    assert sorted(plan["answer"] for plan in cheap) == ["cheap plan", "plan without itinerary"]
+
+
+def test_older_databases_gain_the_cost_columns(tmp_path):
+    path = str(tmp_path / "plans.sqlite3")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE plans (id INTEGER PRIMARY KEY, created_at REAL NOT NULL, question TEXT NOT NULL, "
+                 "destination TEXT, destination_id TEXT, days INTEGER, party TEXT, budget INTEGER, "
+                 "currency TEXT, model TEXT, latency_ms REAL, thread_id TEXT, answer TEXT NOT NULL)")
+    conn.commit()
+    conn.close()
+
+    store = PlanStore(path=path)
+    store.save("3 days in Goa", "plan", itinerary=itinerary(20_000))
+    assert store.search(destination="Goa", max_budget=25_000)[0]["cost_currency"] == "INR"
+    store.close()
@@ -0,0 +1,84 @@
+import pytest
+from utils.response_cache import HashingEmbedder, ResponseCache, normalize_query
+
+
+@pytest.fixture
+def cache():
+    return ResponseCache(path=":memory:")
+
+
+@pytest.mark.parametrize("question, budget", [
+    ("Goa trip under 50k", 50_000),
+    ("Goa trip with budget 30k", 30_000),
+    ("Goa for 1.5 lakh", 150_000),
+    ("Goa trip under 30000", 30_000),
+    ("Goa under ₹50k", 50_000),
+])
+def test_budget_without_currency_is_parsed(question, budget):
+    assert normalize_query(question).budget == budget
+
+
+@pytest.mark.parametrize("question, travellers", [
+    ("5 days in Goa for 2 people", 2),
+    ("Goa for 4", 4),
+    ("family of 4 in Jaipur", 4),
+    ("Goa for 4 days", None),
+])
+def test_numeric_party_size_is_parsed(question, travellers):
+    assert normalize_query(question).travellers == travellers
+
+
+def test_family_of_n_keeps_the_party_word():
+    assert normalize_query("family of 4 in Jaipur").party == "family"
+
+
+@pytest.mark.parametrize("question, days", [
+    ("Goa for a week", 7),
+    ("Goa for 2 weeks", 14),
+    ("Goa weekend", 2),
+    ("Goa long weekend", 3),
+    ("Plan a Goa trip", None),
+])
+def test_weeks_and_weekends_are_durations(question, days):
+    assert normalize_query(question).days == days
+
+
+@pytest.mark.parametrize("first, second", [
+    ("Goa trip under $800", "Goa trip under ₹800"),
+    ("Goa trip under $800", "Goa 800 rupees"),
+    ("Goa for a week", "Goa weekend"),
+    ("Goa weekend", "Plan a Goa trip"),
+    ("Goa trip under 50k", "Goa trip under 90k"),
+    ("5 days in Goa for 2 people", "5 days in Goa for 6 people"),
+    ("top 5 beaches in Goa", "top 10 beaches in Goa"),
+])
+def test_different_budgets_and_party_sizes_do_not_share_an_entry(cache, first, second):
+    assert normalize_query(first) != normalize_query(second)
+    cache.put(first, "plan for the first question", "model", "v1")
+    assert cache.get(second, "model", "v1") is None
+    assert cache.get(first, "model", "v1") == "plan for the first question"
+
+
+def test_rephrasing_still_shares_an_entry(cache):
+    cache.put("3 days in Jaipur with family", "jaipur plan", "model", "v1")
+    assert cache.get("Jaipur 3-day family trip", "model", "v1") == "jaipur plan"
+
+
+@pytest.fixture
+def fuzzy_cache():
+    return ResponseCache(path=":memory:", embedder=HashingEmbedder())
+
+
+def test_misspelled_unknown_destination_shares_an_entry(fuzzy_cache):
+    fuzzy_cache.put("3 days in Chikmagalur", "chikmagalur plan", "model", "v1")
+    assert fuzzy_cache.get("3 days in Chikmagaluru", "model", "v1") == "chikmagalur plan"
+
+
+@pytest.mark.parametrize("stored, asked", [
+    ("3 days in Jaipur", "3 days in Jaipur veg"),
+    ("3 days in Jaipur veg", "3 days in Jaipur"),
+    ("3 days in Chikmagalur", "3 days in Chikmagalur coffee"),
+])
+def test_extra_words_never_match_fuzzily(fuzzy_cache, stored, asked):
+    fuzzy_cache.put(stored, "plan", "model", "v1")
+    assert fuzzy_cache.get(asked, "model", "v1") is None
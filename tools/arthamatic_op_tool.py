@@ -2,7 +2,6 @@ import os
 from dotenv import load_dotenv
 load_dotenv()
 from langchain.tools import tool
-from langchain_community.utilities.alpha_vantage import AlphaVantageAPIWrapper
 
 @tool
 def multiply(a: int, b: int) -> int:
@@ -45,6 +44,8 @@ def currency_converter(from_curr: str, to_curr: str, value: float)->float:
     Returns:
         float: The converted amount in the target currency
     """
+    # langchain_community is slow to import and only this tool needs it
+    from langchain_community.utilities.alpha_vantage import AlphaVantageAPIWrapper
     os.environ["ALPHAVANTAGE_API_KEY"] = os.getenv('ALPHAVANTAGE_API_KEY')
     alpha_vantage = AlphaVantageAPIWrapper()
     response = alpha_vantage._get_exchange_rate(from_curr, to_curr)
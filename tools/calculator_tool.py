@@ -1,41 +1,36 @@
+import os
 from langchain.tools import tool
-from typing import List
-import math
+from typing import List, Optional
+from dotenv import load_dotenv
+from utils.budget_engine import BudgetEngine, LineItem
+from utils.currency_converter import CurrencyConverter
 
 class CalculatorTool:
     def __init__(self):
-        self.calculator_tool_list = [
-            self.calculate_expense,
-            self.calculate_budget
-        ]
-    
-    @tool
-    def calculate_expense(self, amount: float, currency: str = "USD") -> str:
-        """Calculate basic expenses and provide cost breakdown"""
-        try:
-            # Basic expense calculation
-            tax_rate = 0.08  # 8% tax rate
-            tax_amount = amount * tax_rate
-            total = amount + tax_amount
-            
-            return f"Expense breakdown for {currency} {amount:.2f}:\n" \
-                   f"Base amount: {currency} {amount:.2f}\n" \
-                   f"Tax (8%): {currency} {tax_amount:.2f}\n" \
-                   f"Total: {currency} {total:.2f}"
-        except Exception as e:
-            return f"Error calculating expense: {str(e)}"
-    
-    @tool
-    def calculate_budget(self, total_budget: float, expenses: str) -> str:
-        """Calculate remaining budget after listing expenses"""
-        try:
-            # This is a simplified version - you could enhance it to parse actual expense lists
-            estimated_expenses = total_budget * 0.7  # Assume 70% for expenses
-            remaining = total_budget - estimated_expenses
-            
-            return f"Budget analysis:\n" \
-                   f"Total budget: ${total_budget:.2f}\n" \
-                   f"Estimated expenses: ${estimated_expenses:.2f}\n" \
-                   f"Remaining budget: ${remaining:.2f}"
-        except Exception as e:
-            return f"Error calculating budget: {str(e)}"
+        load_dotenv()
+        api_key = os.environ.get("EXCHANGE_RATE_API_KEY")
+        # Without a key the engine still prices single-currency budgets
+        self.currency_service = CurrencyConverter(api_key) if api_key else None
+        self.engine = BudgetEngine(self.currency_service.get_rates if self.currency_service else None)
+        self.calculator_tool_list = self._setup_tools()
+
+    def _setup_tools(self) -> List:
+        """Setup all tools for the calculator tool"""
+        @tool
+        def calculate_trip_budget(items: List[LineItem], days: int, travellers: int = 1, currency: str = "USD",
+                                  nights: Optional[int] = None, tax_rate: float = 0.0,
+                                  budget: Optional[float] = None, also_in: Optional[List[str]] = None) -> dict:
+            """Price a whole trip in one call: pass every expense as a line item instead of adding numbers up.
+
+            Returns the total in `currency` with tax, per-day and per-person costs, a breakdown by
+            category, what is spent in each original currency, the total in each `also_in` currency,
+            and what is left of `budget` when one is given. Nights default to days - 1.
+            """
+            try:
+                report = self.engine.compute(items, days, nights=nights, travellers=travellers, currency=currency,
+                                             tax_rate=tax_rate, budget=budget, also_in=also_in)
+                return report.to_dict()
+            except Exception as e:
+                return {"error": f"Error calculating budget: {e}"}
+
+        return [calculate_trip_budget]
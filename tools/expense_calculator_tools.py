@@ -1,41 +1,25 @@
-from langchain.tools import tool
-from typing import List
-import math
+from utils.budget_engine import BudgetEngine, LineItem
 
-class CalculatorTool:
-    def __init__(self):
-        self.calculator_tool_list = [
-            self.calculate_expense,
-            self.calculate_budget
-        ]
-    
-    @tool
-    def calculate_expense(self, amount: float, currency: str = "USD") -> str:
-        """Calculate basic expenses and provide cost breakdown"""
-        try:
-            # Basic expense calculation
-            tax_rate = 0.08  # 8% tax rate
-            tax_amount = amount * tax_rate
-            total = amount + tax_amount
-            
-            return f"Expense breakdown for {currency} {amount:.2f}:\n" \
-                   f"Base amount: {currency} {amount:.2f}\n" \
-                   f"Tax (8%): {currency} {tax_amount:.2f}\n" \
-                   f"Total: {currency} {total:.2f}"
-        except Exception as e:
-            return f"Error calculating expense: {str(e)}"
-    
-    @tool
-    def calculate_budget(self, total_budget: float, expenses: str) -> str:
-        """Calculate remaining budget after listing expenses"""
-        try:
-            # This is a simplified version - you could enhance it to parse actual expense lists
-            estimated_expenses = total_budget * 0.7  # Assume 70% for expenses
-            remaining = total_budget - estimated_expenses
-            
-            return f"Budget analysis:\n" \
-                   f"Total budget: ${total_budget:.2f}\n" \
-                   f"Estimated expenses: ${estimated_expenses:.2f}\n" \
-                   f"Remaining budget: ${remaining:.2f}"
-        except Exception as e:
-            return f"Error calculating budget: {str(e)}"
+
+def calculate_travel_expenses(flight_cost: float, accommodation_cost: float, daily_budget: float,
+                              trip_duration: int) -> dict:
+    """Trip total for the web form's expense calculator, priced by the budget engine.
+
+    The flight and accommodation costs are totals for the trip; the daily
+    budget covers everything else, per day. Amounts share one currency.
+    """
+    items = [
+        LineItem(category="Flights", amount=flight_cost),
+        LineItem(category="Accommodation", amount=accommodation_cost),
+        LineItem(category="Daily spending", amount=daily_budget, basis="per_day"),
+    ]
+    report = BudgetEngine().compute(items, trip_duration)
+    return {
+        'flight_cost': flight_cost,
+        'accommodation_cost': accommodation_cost,
+        'daily_budget': daily_budget,
+        'trip_duration': trip_duration,
+        'total_daily_cost': report.by_category["Daily spending"],
+        'total_cost': report.total,
+        'average_daily_cost': report.per_day,
+    }
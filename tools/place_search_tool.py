@@ -5,30 +5,31 @@ import os
 
 class PlaceSearchTool:
     def __init__(self):
-        self.place_search_tool_list = [
-            self.search_places,
-            self.get_place_details
-        ]
-    
-    @tool
-    def search_places(self, query: str, location: str = None) -> str:
-        """Search for places (restaurants, attractions, hotels) in a specific location"""
-        try:
-            # This is a placeholder - you would need to integrate with Google Places API or similar
-            # For now, returning mock data
-            if location:
-                return f"Found places matching '{query}' in {location}: Sample Restaurant, Tourist Attraction, Local Hotel"
-            else:
-                return f"Found places matching '{query}': Sample Restaurant, Tourist Attraction, Local Hotel"
-        except Exception as e:
-            return f"Error searching for places: {str(e)}"
+        self.place_search_tool_list = self._setup_tools()
+
+    def _setup_tools(self) -> List:
+        """Setup all tools for the place search tool"""
+        @tool
+        def search_places(query: str, location: str = None) -> str:
+            """Search for places (restaurants, attractions, hotels) in a specific location"""
+            try:
+                # This is a placeholder - you would need to integrate with Google Places API or similar
+                # For now, returning mock data
+                if location:
+                    return f"Found places matching '{query}' in {location}: Sample Restaurant, Tourist Attraction, Local Hotel"
+                else:
+                    return f"Found places matching '{query}': Sample Restaurant, Tourist Attraction, Local Hotel"
+            except Exception as e:
+                return f"Error searching for places: {str(e)}"
     
-    @tool
-    def get_place_details(self, place_name: str, location: str = None) -> str:
-        """Get detailed information about a specific place"""
-        try:
-            # This is a placeholder - you would need to integrate with Google Places API or similar
-            # For now, returning mock data
-            return f"Details for {place_name}: Address: 123 Main St, Rating: 4.5/5, Hours: 9 AM - 10 PM, Phone: (555) 123-4567"
-        except Exception as e:
-            return f"Error getting details for {place_name}: {str(e)}"
+        @tool
+        def get_place_details(place_name: str, location: str = None) -> str:
+            """Get detailed information about a specific place"""
+            try:
+                # This is a placeholder - you would need to integrate with Google Places API or similar
+                # For now, returning mock data
+                return f"Details for {place_name}: Address: 123 Main St, Rating: 4.5/5, Hours: 9 AM - 10 PM, Phone: (555) 123-4567"
+            except Exception as e:
+                return f"Error getting details for {place_name}: {str(e)}"
+
+        return [search_places, get_place_details]
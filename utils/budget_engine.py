@@ -0,0 +1,150 @@
+from dataclasses import dataclass, asdict
+from typing import Callable, Dict, List, Literal, Optional
+import numpy as np
+from pydantic import BaseModel, Field, field_validator
+
+# How often a line item is paid over the trip
+BASES = ("per_day", "per_night", "one_off")
+
+
+class LineItem(BaseModel):
+    """One expense of the trip, in the currency it is paid in."""
+    category: str = Field(description="e.g. Flights, Accommodation, Food, Local transport, Activities")
+    amount: float = Field(ge=0, description="Price of one unit, in `currency`")
+    basis: Literal["per_day", "per_night", "one_off"] = Field(
+        default="one_off", description="per_day (meals, transport), per_night (hotels) or one_off (flights, tickets)")
+    currency: Optional[str] = Field(default=None,
+                                    description="ISO 4217 code the amount is quoted in; defaults to the report currency")
+    per_person: bool = Field(default=False, description="True if every traveller pays it (meals, tickets, flights)")
+    quantity: float = Field(default=1, ge=0, description="Units bought, e.g. rooms per night")
+    tax_rate: Optional[float] = Field(default=None, ge=0, le=1,
+                                      description="Tax not included in the price, e.g. 0.18; defaults to the budget's")
+
+    @field_validator("currency")
+    @classmethod
+    def _upper(cls, value: Optional[str]) -> Optional[str]:
+        return value.strip().upper() if value else None
+
+
+@dataclass
+class BudgetReport:
+    currency: str
+    days: int
+    nights: int
+    travellers: int
+    subtotal: float
+    tax: float
+    total: float
+    per_day: float
+    per_person: float
+    recurring_per_day: float
+    one_off: float
+    by_category: Dict[str, float]
+    # What is spent in each currency it is paid in, before conversion
+    by_currency: Dict[str, float]
+    # The total in each currency asked for with ``also_in``
+    total_in: Dict[str, float]
+    items: List[dict]
+    budget: Optional[float] = None
+    remaining: Optional[float] = None
+    # Why some ``also_in`` totals are missing
+    note: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        return {key: value for key, value in asdict(self).items() if value is not None}
+
+
+def _rounded(values: np.ndarray) -> List[float]:
+    return np.round(values, 2).tolist()
+
+
+class BudgetEngine:
+    """Prices a whole list of line items in one vectorized pass.
+
+    Each item's cost is ``amount * units * people * quantity`` where units is
+    the number of days, nights or 1 for its basis and people is the party
+    size for per-person items. Amounts are converted to the report currency
+    with one rate per distinct currency, tax is applied per item, and
+    category and currency rollups are single ``bincount`` calls, so a long
+    list of items is priced in about the time of a short one.
+
+    ``rate_table`` returns an ExchangeRate-API style table (units per pivot
+    currency); it is only called when more than one currency is involved.
+    """
+
+    def __init__(self, rate_table: Callable[[], Dict[str, float]] = None):
+        self.rate_table = rate_table
+
+    def _factors(self, codes: List[str], target: str) -> np.ndarray:
+        """Multipliers from each of ``codes`` to ``target``."""
+        if all(code == target for code in codes):
+            return np.ones(len(codes))
+        if self.rate_table is None:
+            raise ValueError(f"Exchange rates are unavailable; give every amount in {target}")
+        rates = self.rate_table()
+        missing = sorted({code for code in [*codes, target] if code not in rates})
+        if missing:
+            raise ValueError(f"No exchange rate for {', '.join(missing)}")
+        return rates[target] / np.array([rates[code] for code in codes], dtype=float)
+
+    def compute(self, items: List[LineItem], days: int, nights: int = None, travellers: int = 1,
+                currency: str = "USD", tax_rate: float = 0.0, budget: float = None,
+                also_in: List[str] = None) -> BudgetReport:
+        """Price ``items`` for a trip of ``days`` days and ``nights`` nights (``days - 1`` by default)."""
+        if days < 1:
+            raise ValueError("days must be at least 1")
+        if travellers < 1:
+            raise ValueError("travellers must be at least 1")
+        currency = currency.upper()
+        nights = max(days - 1, 0) if nights is None else nights
+        also_in = [code.upper() for code in also_in or [] if code.upper() != currency]
+
+        amount = np.array([item.amount for item in items], dtype=float)
+        quantity = np.array([item.quantity for item in items], dtype=float)
+        units = np.array([days, nights, 1], dtype=float)[[BASES.index(item.basis) for item in items]]
+        people = np.where([item.per_person for item in items], travellers, 1)
+        rates = np.array([tax_rate if item.tax_rate is None else item.tax_rate for item in items], dtype=float)
+        local = amount * units * people * quantity
+
+        # One conversion factor per distinct currency, spread over the items by index
+        codes, code_index = np.unique(np.array([item.currency or currency for item in items], dtype=str),
+                                      return_inverse=True)
+        factors = self._factors(codes.tolist(), currency)
+        converted = local * factors[code_index]
+        tax = converted * rates
+        cost = converted + tax
+
+        categories, category_index = np.unique(np.array([item.category for item in items], dtype=str),
+                                               return_inverse=True)
+        by_category = np.bincount(category_index, weights=cost, minlength=len(categories))
+        by_currency = np.bincount(code_index, weights=local * (1 + rates), minlength=len(codes))
+        recurring = cost[[item.basis != "one_off" for item in items]].sum() if items else 0.0
+
+        total = float(cost.sum())
+        # Extra currencies are a convenience; without their rates the report is still complete
+        total_in, note = {}, None
+        if also_in:
+            try:
+                total_in = dict(zip(also_in, _rounded(total / self._factors(also_in, currency))))
+            except ValueError as e:
+                note = str(e)
+        report = BudgetReport(
+            currency=currency, days=days, nights=nights, travellers=travellers,
+            subtotal=round(float(converted.sum()), 2),
+            tax=round(float(tax.sum()), 2),
+            total=round(total, 2),
+            per_day=round(total / days, 2),
+            per_person=round(total / travellers, 2),
+            recurring_per_day=round(float(recurring) / days, 2),
+            one_off=round(total - float(recurring), 2),
+            by_category=dict(zip(categories.tolist(), _rounded(by_category))),
+            by_currency={code: value for code, value in zip(codes.tolist(), _rounded(by_currency)) if value},
+            total_in=total_in,
+            items=[{"category": item.category, "basis": item.basis, "cost": value}
+                   for item, value in zip(items, _rounded(cost))],
+            note=note,
+        )
+        if budget is not None:
+            report.budget = budget
+            report.remaining = round(budget - total, 2)
+        return report
@@ -1,8 +1,11 @@
 import yaml
 import os
 
-def load_config(config_path: str = "config/config.yaml") -> dict:
-    with open(config_path, "r") as file:
+# Point at another config file, e.g. for offline benchmarks
+CONFIG_PATH = os.getenv("TRIP_PLANNER_CONFIG", "config/config.yaml")
+
+def load_config(config_path: str = None) -> dict:
+    with open(config_path or CONFIG_PATH, "r") as file:
         config = yaml.safe_load(file)
         # print(config)
     return config
\ No newline at end of file
@@ -1,16 +1,79 @@
+import os
+import time
 import requests
+from typing import Iterable, List, Tuple
+from utils.ttl_cache import TTLCache
+from utils.metrics import upstream
+
+# Rate tables keyed by base currency, shared by every CurrencyConverter in the process
+_rate_cache = TTLCache(maxsize=64, name="exchange_rates")
+
 
 class CurrencyConverter:
-    def __init__(self, api_key: str):
-        self.base_url = f"https://v6.exchangerate-api.com/v6/{api_key}/latest/"
-    
-    def convert(self, amount:float, from_currency:str, to_currency:str):
-        """Convert the amount from one currency to another"""
-        url = f"{self.base_url}/{from_currency}"
-        response = requests.get(url)
+    """ExchangeRate-API client that fetches one rate table and derives every pair from it.
+
+    The table for ``pivot_currency`` is fetched once and cached until the
+    provider's next scheduled refresh (``time_next_update_unix``), capped at
+    ``max_ttl`` seconds. Any pair is answered as a cross rate through that
+    base, so a budget with many line items costs a single upstream call.
+    Concurrent misses share one in-flight fetch.
+    """
+
+    def __init__(self, api_key: str, pivot_currency: str = "USD", timeout: tuple = (3.05, 10),
+                 max_ttl: float = 86400):
+        provider_url = os.getenv("EXCHANGE_RATE_BASE_URL", "https://v6.exchangerate-api.com/v6")
+        self.base_url = f"{provider_url}/{api_key}/latest"
+        self.pivot_currency = pivot_currency.upper()
+        self.timeout = timeout
+        self.max_ttl = max_ttl
+        self.cache = _rate_cache
+        self.session = requests.Session()
+
+    def _fetch_rates(self, base: str) -> dict:
+        with upstream("exchangerate") as span:
+            response = self.session.get(f"{self.base_url}/{base}", timeout=self.timeout)
+            span["status"] = str(response.status_code)
         if response.status_code != 200:
             raise Exception("API call failed:", response.json())
-        rates = response.json()["conversion_rates"]
-        if to_currency not in rates:
-            raise ValueError(f"{to_currency} not found in exchange rates.")
-        return amount * rates[to_currency]
\ No newline at end of file
+        return response.json()
+
+    def _ttl(self, payload: dict) -> float:
+        next_update = payload.get("time_next_update_unix")
+        if not next_update:
+            return self.max_ttl
+        return max(60, min(self.max_ttl, next_update - time.time()))
+
+    def get_rates(self, base: str = None) -> dict:
+        """Return the conversion_rates table for ``base`` (the pivot currency by default)."""
+        base = (base or self.pivot_currency).upper()
+        payload = self.cache.get_or_load(base, lambda: self._fetch_rates(base), ttl=self._ttl)
+        return payload["conversion_rates"]
+
+    @staticmethod
+    def _cross(rates: dict, from_currency: str, to_currency: str) -> float:
+        from_currency, to_currency = from_currency.upper(), to_currency.upper()
+        if from_currency == to_currency:
+            return 1.0
+        for code in (from_currency, to_currency):
+            if code not in rates:
+                raise ValueError(f"{code} not found in exchange rates.")
+        return rates[to_currency] / rates[from_currency]
+
+    def rate(self, from_currency: str, to_currency: str) -> float:
+        """Exchange rate from ``from_currency`` to ``to_currency`` via the pivot table."""
+        if from_currency.upper() == to_currency.upper():
+            return 1.0
+        return self._cross(self.get_rates(), from_currency, to_currency)
+
+    def convert(self, amount:float, from_currency:str, to_currency:str):
+        """Convert the amount from one currency to another"""
+        return amount * self.rate(from_currency, to_currency)
+
+    def convert_many(self, items: Iterable[Tuple[float, str, str]]) -> List[float]:
+        """Convert many ``(amount, from_currency, to_currency)`` items with one rate-table lookup."""
+        items = list(items)
+        if all(from_currency.upper() == to_currency.upper() for _, from_currency, to_currency in items):
+            return [float(amount) for amount, _, _ in items]
+        rates = self.get_rates()
+        return [amount * self._cross(rates, from_currency, to_currency)
+                for amount, from_currency, to_currency in items]
@@ -0,0 +1,180 @@
+import re
+import threading
+import unicodedata
+from typing import Dict, Iterator, Optional, Tuple
+
+from utils.destination_index import (COMMON_WORDS, COUNTRY_NAMES, REGION_NAMES, DestinationIndex, get_index,
+                                     normalize_place, qualifier_words)
+
+# Signs that name a currency outright; "$" is left out since the model writes it for every currency
+CURRENCY_SIGNS = {"₹": "INR", "€": "EUR", "£": "GBP", "¥": "JPY", "฿": "THB", "₫": "VND", "₩": "KRW", "₺": "TRY"}
+
+CURRENCY_WORDS = {
+    "rupee": "INR", "rupees": "INR", "euro": "EUR", "euros": "EUR", "pound": "GBP", "pounds": "GBP",
+    "sterling": "GBP", "yen": "JPY", "baht": "THB", "dirham": "AED", "dirhams": "AED", "ringgit": "MYR",
+    "rupiah": "IDR", "lira": "TRY", "dong": "VND", "franc": "CHF", "francs": "CHF",
+}
+
+# Codes that are also English words only count through their sign or name
+_WORD_CODES = {"TRY"}
+
+# Country names that are also everyday words; like COMMON_WORDS they only count when capitalised
+_COMMON_COUNTRY_WORDS = {"turkey"}
+
+# How each currency is written in front of an amount
+CURRENCY_SYMBOLS = {**{code: sign for sign, code in CURRENCY_SIGNS.items()}, "USD": "$"}
+
+
+def _trie_regex(words) -> str:
+    """One regex alternation for ``words``, factored on shared prefixes."""
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+    return _node_regex(trie)
+
+
+def _node_regex(node: dict) -> str:
+    branches = [re.escape(char) + _node_regex(child) for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ""
+    pattern = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    # Optional and greedy, so the longest keyword wins ("new york city" over "new york")
+    return f"(?:{pattern})?" if "" in node else pattern
+
+
+def _fold(text: str) -> str:
+    """Strip accents so "Zürich" matches the index's "zurich"."""
+    return "".join(ch for ch in unicodedata.normalize("NFKD", text) if not unicodedata.combining(ch))
+
+
+class KeywordMatcher:
+    """Find any of many keywords in text with a single compiled regex.
+
+    The keywords are merged into a character trie and compiled as one
+    pattern, so a scan is one pass over the text and adding keywords does
+    not add passes. Word keywords match whole words only; keywords that
+    start or end with a symbol ("₹") match anywhere. Matching ignores case.
+    """
+
+    def __init__(self, keywords: Dict[str, object]):
+        self._values = {key.lower(): value for key, value in keywords.items()}
+        words = [key for key in self._values if re.fullmatch(r"\w(?:.*\w)?", key)]
+        symbols = [key for key in self._values if not re.fullmatch(r"\w(?:.*\w)?", key)]
+        parts = []
+        if words:
+            parts.append(rf"(?<!\w){_trie_regex(words)}(?!\w)")
+        if symbols:
+            parts.append(_trie_regex(symbols))
+        self.pattern = re.compile("|".join(parts) or r"(?!)", re.IGNORECASE)
+
+    def __len__(self):
+        return len(self._values)
+
+    def finditer(self, text: str) -> Iterator[Tuple[re.Match, object]]:
+        """``(match, value)`` for every keyword in ``text``, left to right."""
+        for match in self.pattern.finditer(text):
+            yield match, self._values[match.group().lower()]
+
+    def find(self, text: str) -> Optional[object]:
+        """Value of the first keyword in ``text``."""
+        return next((value for _, value in self.finditer(text)), None)
+
+
+class CurrencyDetector:
+    """Currency a trip question implies, from one scan of the question.
+
+    A currency the user names ("INR", "rupees", "€") wins; otherwise the
+    local currency of the first place mentioned: a destination in the index,
+    a country ("Japan") or a state ("Himachal", "Texas"). A destination
+    followed by another country's name or state ("Paris, Texas") is skipped,
+    as in ``DestinationIndex.match_in_text``. Place names that are everyday
+    words ("nice") only count when capitalised.
+    """
+
+    def __init__(self, index: DestinationIndex):
+        self.index = index
+        local = {destination.country: destination.currency for destination in index.by_id.values()}
+        keywords = {}
+        for country, names in [*COUNTRY_NAMES.items(), *REGION_NAMES.items()]:
+            if country in local:
+                keywords.update({name: (False, local[country], None) for name in names})
+        keywords.update({name: (False, destination.currency, destination) for name, destination in index.names()})
+        codes = set(local.values()) | set(CURRENCY_SIGNS.values())
+        keywords.update({code: (True, code, None) for code in codes - _WORD_CODES})
+        keywords.update({word: (True, code, None) for word, code in CURRENCY_WORDS.items()})
+        keywords.update({sign: (True, code, None) for sign, code in CURRENCY_SIGNS.items()})
+        self.matcher = KeywordMatcher(keywords)
+
+    def detect(self, text: str) -> Optional[str]:
+        text = _fold(text or "")
+        local = None
+        for match, (explicit, currency, destination) in self.matcher.finditer(text):
+            if explicit:
+                return currency
+            word = match.group()
+            if local is not None or (word.lower() in COMMON_WORDS | _COMMON_COUNTRY_WORDS and word[0].islower()):
+                continue
+            following = normalize_place(text[match.end():match.end() + 80]).split()
+            if destination is None or self.index.qualifies(destination, qualifier_words(following)):
+                local = currency
+        return local
+
+
+# A dollar sign in front of an amount, optionally spaced: "$500", "$ 1,200"
+_DOLLAR_AMOUNT = re.compile(r"\$\s*(?=\d)")
+
+
+class CurrencyLocalizer:
+    """Relabel ``$`` amounts in an answer with the currency the question implies.
+
+    ``localize`` handles a whole answer. For a streamed answer pass each
+    chunk through ``feed`` and finish with ``flush``: a ``$`` at the end of a
+    chunk is held back until the next one shows whether an amount follows,
+    so the answer is still scanned once. Only the symbol changes; amounts
+    are not converted.
+    """
+
+    def __init__(self, currency: Optional[str]):
+        self.currency = currency
+        self.symbol = None if currency in (None, "USD") else CURRENCY_SYMBOLS.get(currency, f"{currency} ")
+        self._pending = ""
+
+    @classmethod
+    def for_message(cls, user_message: str) -> "CurrencyLocalizer":
+        return cls(get_detector().detect(user_message))
+
+    def localize(self, text: str) -> str:
+        if self.symbol is None or not isinstance(text, str):
+            return text
+        return _DOLLAR_AMOUNT.sub(lambda _: self.symbol, text)
+
+    def feed(self, chunk: str) -> str:
+        if self.symbol is None:
+            return chunk
+        text = self._pending + chunk
+        stripped = text.rstrip()
+        cut = len(stripped) - 1 if stripped.endswith("$") else len(text)
+        self._pending = text[cut:]
+        return self.localize(text[:cut])
+
+    def flush(self) -> str:
+        """Whatever ``feed`` held back; a trailing ``$`` with no amount is left as is."""
+        text, self._pending = self._pending, ""
+        return text
+
+
+_detector = None
+_detector_lock = threading.Lock()
+
+
+def get_detector() -> CurrencyDetector:
+    """The process-wide detector over the destination index, compiled on first use."""
+    global _detector
+    if _detector is None:
+        with _detector_lock:
+            if _detector is None:
+                _detector = CurrencyDetector(get_index())
+    return _detector
@@ -0,0 +1,239 @@
+import csv
+import os
+import re
+import threading
+import unicodedata
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "destinations.csv")
+
+# Country names that only qualify a place ("Manali India"); dropped when normalizing questions
+COUNTRY_NAMES = {
+    "IN": {"india"}, "NP": {"nepal"}, "BT": {"bhutan"}, "LK": {"sri", "lanka"}, "MV": {"maldives"},
+    "AE": {"uae", "emirates"}, "SG": set(), "TH": {"thailand"}, "ID": {"indonesia"}, "MY": {"malaysia"},
+    "VN": {"vietnam"}, "JP": {"japan"}, "KR": {"korea"}, "HK": set(), "AU": {"australia"},
+    "NZ": {"zealand"}, "TR": {"turkey", "turkiye"}, "EG": {"egypt"}, "ZA": {"africa"}, "KE": {"kenya"},
+    "GB": {"uk", "england", "scotland", "britain"}, "FR": {"france"}, "IT": {"italy"}, "ES": {"spain"},
+    "PT": {"portugal"}, "NL": {"netherlands", "holland"}, "DE": {"germany"}, "AT": {"austria"},
+    "CZ": {"czech", "czechia"}, "CH": {"switzerland"}, "GR": {"greece"}, "IS": {"iceland"},
+    "US": {"usa", "america"}, "CA": {"canada"}, "MX": {"mexico"}, "BR": {"brazil"},
+}
+
+# States and provinces, for India and for countries whose towns often share a name with a famous
+# city elsewhere ("Paris, Texas", "London, Ontario"); a qualifier naming one rules out a destination
+# in another country
+REGION_NAMES = {
+    "IN": {
+        "andhra pradesh", "arunachal pradesh", "assam", "bihar", "chhattisgarh", "goa", "gujarat", "haryana",
+        "himachal", "himachal pradesh", "jharkhand", "karnataka", "kerala", "madhya pradesh", "maharashtra",
+        "manipur", "meghalaya", "mizoram", "nagaland", "odisha", "orissa", "punjab", "rajasthan", "sikkim",
+        "tamil nadu", "telangana", "tripura", "uttar pradesh", "uttarakhand", "west bengal", "jammu",
+        "kashmir", "ladakh", "andaman", "lakshadweep", "puducherry",
+    },
+    "US": {
+        "alabama", "alaska", "arizona", "arkansas", "california", "colorado", "connecticut", "delaware",
+        "florida", "georgia", "hawaii", "idaho", "illinois", "indiana", "iowa", "kansas", "kentucky",
+        "louisiana", "maine", "maryland", "massachusetts", "michigan", "minnesota", "mississippi",
+        "missouri", "montana", "nebraska", "nevada", "new hampshire", "new jersey", "new mexico",
+        "new york", "north carolina", "north dakota", "ohio", "oklahoma", "oregon", "pennsylvania",
+        "rhode island", "south carolina", "south dakota", "tennessee", "texas", "utah", "vermont",
+        "virginia", "washington", "west virginia", "wisconsin", "wyoming",
+    },
+    "CA": {
+        "alberta", "british columbia", "manitoba", "new brunswick", "newfoundland", "nova scotia",
+        "ontario", "prince edward island", "quebec", "saskatchewan", "yukon", "nunavut",
+    },
+    "AU": {
+        "new south wales", "queensland", "south australia", "tasmania", "victoria", "western australia",
+    },
+}
+
+# Place names that are also everyday words; in free text they only count when capitalised
+COMMON_WORDS = {"nice", "male", "rio", "kl", "sf"}
+
+# Longest place name, in words, tried when scanning free text
+_MAX_NAME_WORDS = 4
+# Words that end the qualifier after a place named in free text ("Dubai and Turkey" is two places)
+_CONNECTORS = {"and", "or", "to", "then", "via", "from", "vs", "versus", "with", "for", "in", "plus"}
+_TOKEN = re.compile(r"[A-Za-z0-9]+")
+
+
+def _tokens(text: str) -> List[str]:
+    """Words of ``text`` with accents stripped and case kept."""
+    text = unicodedata.normalize("NFKD", text or "")
+    return _TOKEN.findall("".join(ch for ch in text if not unicodedata.combining(ch)))
+
+
+def normalize_place(text: str) -> str:
+    """Lowercase, strip accents and punctuation: "Zürich, CH" -> "zurich ch"."""
+    return " ".join(_tokens(text)).lower()
+
+
+def qualifier_words(words: List[str]) -> List[str]:
+    """The lowercase words right after a place name that may qualify it, up to a connector ("and")."""
+    qualifier = []
+    for word in words[:_MAX_NAME_WORDS]:
+        if word in _CONNECTORS:
+            break
+        qualifier.append(word)
+    return qualifier
+
+
+def _trigrams(text: str) -> set:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+@dataclass(frozen=True)
+class Destination:
+    """One row of the destination table."""
+    id: str
+    name: str
+    country: str
+    lat: float
+    lon: float
+    currency: str
+
+    @property
+    def display_name(self) -> str:
+        """Unambiguous name for upstream queries, e.g. "Manali, IN"."""
+        return f"{self.name}, {self.country}"
+
+
+class DestinationIndex:
+    """In-memory lookup from free-text place names to canonical destinations.
+
+    Every name and alias is stored under its normalized form for exact hits.
+    "manali, HP" and "Manali India" still resolve, because a miss on the full
+    text is retried on ever shorter leading word runs of the part before the
+    first comma. Misspellings fall back to a character-trigram index: the
+    candidate with the highest Dice similarity wins if it reaches
+    ``fuzzy_threshold``. Whatever follows the name is a qualifier; one that
+    names another country or one of its states ("Paris, Texas", "Sydney Nova
+    Scotia") means a different place, so nothing is returned. Upstream clients and caches key on ``Destination.id``,
+    so every spelling of a place shares one entry.
+    """
+
+    def __init__(self, destinations: List[Tuple[Destination, List[str]]], fuzzy_threshold: float = 0.6):
+        self.fuzzy_threshold = fuzzy_threshold
+        self.by_id = {}
+        self._names = {}
+        self._grams = defaultdict(set)
+        for destination, aliases in destinations:
+            self.by_id[destination.id] = destination
+            for name in [destination.name, *aliases]:
+                key = normalize_place(name)
+                if key:
+                    self._names.setdefault(key, destination)
+                    for gram in _trigrams(key):
+                        self._grams[gram].add(key)
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_PATH, **kwargs) -> "DestinationIndex":
+        rows = []
+        with open(path, newline="", encoding="utf-8") as file:
+            for row in csv.DictReader(file):
+                destination = Destination(
+                    id=row["id"], name=row["name"], country=row["country"],
+                    lat=float(row["lat"]), lon=float(row["lon"]), currency=row["currency"],
+                )
+                rows.append((destination, [alias for alias in row["aliases"].split("|") if alias]))
+        return cls(rows, **kwargs)
+
+    def __len__(self):
+        return len(self.by_id)
+
+    def names(self):
+        """Every normalized name and alias, paired with its destination."""
+        return self._names.items()
+
+    @staticmethod
+    def qualifies(destination: Destination, qualifier: List[str]) -> bool:
+        """False if the qualifier words name a country, state or province other than the destination's."""
+        text = f" {' '.join(qualifier)} "
+        for country, words in COUNTRY_NAMES.items():
+            if country != destination.country and any(f" {word} " in text for word in words):
+                return False
+        for country, regions in REGION_NAMES.items():
+            if country != destination.country and any(f" {region} " in text for region in regions):
+                return False
+        return True
+
+    def _fuzzy(self, key: str) -> Optional[Destination]:
+        grams = _trigrams(key)
+        overlap = defaultdict(int)
+        for gram in grams:
+            for name in self._grams.get(gram, ()):
+                overlap[name] += 1
+        best, best_score = None, 0.0
+        for name, shared in overlap.items():
+            score = 2 * shared / (len(grams) + len(_trigrams(name)))
+            if score > best_score:
+                best, best_score = name, score
+        return self._names[best] if best is not None and best_score >= self.fuzzy_threshold else None
+
+    def lookup(self, place: str, fuzzy: bool = True) -> Optional[Destination]:
+        """Resolve a place name ("Manali", "manali, HP", "Jaipurr") to its destination."""
+        if not place:
+            return None
+        head, _, rest = place.partition(",")
+        destination = self._names.get(normalize_place(place))
+        if destination is not None:
+            return destination
+        words, qualifier = normalize_place(head).split(), normalize_place(rest).split()
+        for length in range(min(len(words), _MAX_NAME_WORDS), 0, -1):
+            destination = self._names.get(" ".join(words[:length]))
+            if destination is not None:
+                return destination if self.qualifies(destination, words[length:] + qualifier) else None
+        destination = self._fuzzy(" ".join(words)) if fuzzy and words else None
+        return destination if destination is not None and self.qualifies(destination, qualifier) else None
+
+    def match_in_text(self, text: str) -> Optional[Tuple[Destination, str]]:
+        """First known destination named in ``text`` and the normalized words naming it.
+
+        Only exact names and aliases count here (longest match first), since
+        fuzzy matching arbitrary words of a sentence gives false hits. Pass the
+        original text: "a nice trip" must not become Nice, France. A name
+        followed by another country's state or country ("Paris, Texas") is
+        skipped.
+        """
+        raw = _tokens(text)
+        words = [word.lower() for word in raw]
+        for start in range(len(words)):
+            for length in range(min(_MAX_NAME_WORDS, len(words) - start), 0, -1):
+                name = " ".join(words[start:start + length])
+                destination = self._names.get(name)
+                if destination is None:
+                    continue
+                if name in COMMON_WORDS and raw[start][0].islower():
+                    continue
+                if not self.qualifies(destination, qualifier_words(words[start + length:])):
+                    continue
+                return destination, name
+        return None
+
+    def find_in_text(self, text: str) -> Optional[Destination]:
+        """First known destination named anywhere in ``text``."""
+        match = self.match_in_text(text)
+        return match[0] if match else None
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_index() -> DestinationIndex:
+    """The process-wide index over data/destinations.csv, loaded on first use."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = DestinationIndex.load(os.getenv("DESTINATIONS_PATH", DEFAULT_PATH))
+    return _index
+
+
+def resolve(place: str) -> Optional[Destination]:
+    """Shortcut for ``get_index().lookup(place)``."""
+    return get_index().lookup(place)
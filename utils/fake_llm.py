@@ -0,0 +1,120 @@
+import asyncio
+import itertools
+import json
+import time
+import uuid
+from typing import Any, List, Optional
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from pydantic import Field, PrivateAttr
+
+# Characters of tool-call arguments per streamed chunk
+ARGS_CHUNK_SIZE = 64
+
+
+def scripted_turn(turn) -> AIMessage:
+    """Build an AIMessage from a config entry: a string, or ``{"content": ..., "tool_calls": [...]}``."""
+    if isinstance(turn, AIMessage):
+        return turn
+    if isinstance(turn, str):
+        return AIMessage(content=turn)
+    return AIMessage(
+        content=turn.get("content", ""),
+        tool_calls=[
+            {"name": call["name"], "args": call.get("args", {}), "id": call.get("id") or f"call_{uuid.uuid4().hex[:8]}"}
+            for call in turn.get("tool_calls", [])
+        ],
+    )
+
+
+class FakeChatModel(BaseChatModel):
+    """Offline chat model that replays scripted replies.
+
+    With ``script`` set, the reply depends only on the conversation: turn N
+    after the latest human message gets ``script[N]`` (the last entry is
+    reused beyond the end), so concurrent runs stay deterministic. Script
+    entries may carry ``tool_calls`` to drive the tool node. Without a
+    script, ``responses`` are returned in order and then cycled.
+    ``latency`` seconds are slept per call and streamed replies are split
+    into word chunks, tool-call arguments into pieces of JSON. ``error`` —
+    if set — is raised instead of answering, which is how tests exercise
+    router failover.
+    """
+
+    responses: List[Any] = Field(default_factory=lambda: ["This is a fake trip plan."])
+    script: List[Any] = Field(default_factory=list)
+    latency: float = 0.0
+    error: Optional[Exception] = None
+    model_name: str = "fake"
+
+    _cursor: Any = PrivateAttr(default=None)
+
+    class Config:
+        arbitrary_types_allowed = True
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat-model"
+
+    def _next_message(self, messages: List[BaseMessage]) -> AIMessage:
+        if self.script:
+            turn = 0
+            for message in reversed(messages):
+                if isinstance(message, HumanMessage):
+                    break
+                if isinstance(message, AIMessage):
+                    turn += 1
+            message = scripted_turn(self.script[min(turn, len(self.script) - 1)])
+            return message.model_copy(update={"tool_calls": [
+                {**call, "id": f"call_{uuid.uuid4().hex[:8]}"} for call in message.tool_calls
+            ]})
+        if self._cursor is None:
+            self._cursor = itertools.cycle(self.responses)
+        response = next(self._cursor)
+        if isinstance(response, AIMessage):
+            return response.model_copy()
+        return AIMessage(content=str(response))
+
+    def _generate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs) -> ChatResult:
+        if self.latency:
+            time.sleep(self.latency)
+        if self.error is not None:
+            raise self.error
+        return ChatResult(generations=[ChatGeneration(message=self._next_message(messages))])
+
+    async def _agenerate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs) -> ChatResult:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.error is not None:
+            raise self.error
+        return ChatResult(generations=[ChatGeneration(message=self._next_message(messages))])
+
+    async def _astream(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.error is not None:
+            raise self.error
+        message = self._next_message(messages)
+        words = message.content.split(" ") if message.content else []
+        for i, word in enumerate(words):
+            text = word if i == len(words) - 1 else word + " "
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=text))
+            if run_manager:
+                await run_manager.on_llm_new_token(text, chunk=chunk)
+            yield chunk
+        if not message.tool_calls and not words:
+            yield ChatGenerationChunk(message=AIMessageChunk(content=""))
+        for i, call in enumerate(message.tool_calls):
+            # Arguments arrive in pieces as with provider APIs; only the first carries the name and id
+            args = json.dumps(call["args"])
+            for start in range(0, max(len(args), 1), ARGS_CHUNK_SIZE):
+                first = start == 0
+                yield ChatGenerationChunk(message=AIMessageChunk(content="", tool_call_chunks=[{
+                    "name": call["name"] if first else None, "args": args[start:start + ARGS_CHUNK_SIZE],
+                    "id": call["id"] if first else None, "index": i,
+                }]))
+
+    def bind_tools(self, tools, **kwargs):
+        # Replies are scripted, so the tool schemas are not needed
+        return self
@@ -0,0 +1,200 @@
+from typing import List, Optional, Tuple
+from pydantic import BaseModel, Field, ValidationError, field_validator
+
+# Name the model calls to submit its final plan (the schema class below, bound as a tool)
+ITINERARY_TOOL = "Itinerary"
+
+
+def _money(amount: float, currency: str) -> str:
+    return f"{amount:,.0f} {currency}"
+
+
+def _currency_code(value: str) -> str:
+    value = value.strip().upper()
+    if len(value) != 3 or not value.isalpha():
+        raise ValueError("currency must be a 3-letter ISO 4217 code")
+    return value
+
+
+class Activity(BaseModel):
+    """One stop or activity within a day."""
+    name: str = Field(description="Place or activity")
+    time: Optional[str] = Field(default=None, description="Time of day, e.g. 'Morning' or '09:00'")
+    description: str = Field(default="", description="What to do there, in a sentence or two")
+    cost: Optional[float] = Field(default=None, ge=0, description="Approximate cost per person in the itinerary currency")
+
+    def markdown_line(self, currency: str) -> str:
+        line = f"- **{self.time}:** {self.name}" if self.time else f"- {self.name}"
+        if self.description:
+            line += f" - {self.description}"
+        if self.cost:
+            line += f" ({_money(self.cost, currency)})"
+        return line
+
+
+class DayPlan(BaseModel):
+    """The plan for one day of the trip."""
+    day: int = Field(ge=1, description="Day number, starting at 1")
+    title: str = Field(default="", description="Theme of the day, e.g. 'Old Goa and Panjim'")
+    activities: List[Activity] = Field(default_factory=list)
+
+    @property
+    def cost(self) -> float:
+        return sum(activity.cost or 0 for activity in self.activities)
+
+    def markdown_lines(self, currency: str) -> List[str]:
+        lines = ["", f"### Day {self.day}" + (f": {self.title}" if self.title else "")]
+        return lines + [activity.markdown_line(currency) for activity in self.activities]
+
+
+class Hotel(BaseModel):
+    """A recommended place to stay."""
+    name: str
+    area: Optional[str] = Field(default=None, description="Neighbourhood or beach")
+    price_per_night: Optional[float] = Field(default=None, ge=0, description="In the itinerary currency")
+    notes: str = ""
+
+    def markdown_line(self, currency: str) -> str:
+        line = f"- **{self.name}**" + (f", {self.area}" if self.area else "")
+        if self.price_per_night is not None:
+            line += f": about {_money(self.price_per_night, currency)} per night"
+        if self.notes:
+            line += f". {self.notes}"
+        return line
+
+
+class CostItem(BaseModel):
+    """One line of the cost breakdown."""
+    category: str = Field(description="e.g. Accommodation, Food, Local transport, Activities")
+    amount: float = Field(ge=0, description="Total for the whole trip in the itinerary currency")
+    note: str = ""
+
+
+class Itinerary(BaseModel):
+    """Submit the finished trip plan. Call this once, when the plan is complete, instead of
+    writing the plan as text; it is shown to the user as formatted Markdown."""
+    destination: str
+    currency: str = Field(description="ISO 4217 code that every amount is in, e.g. INR")
+    summary: str = Field(default="", description="Two or three sentences introducing the trip")
+    days: List[DayPlan] = Field(min_length=1)
+    hotels: List[Hotel] = Field(default_factory=list)
+    costs: List[CostItem] = Field(default_factory=list, description="Cost breakdown by category")
+    notes: List[str] = Field(default_factory=list,
+                             description="Weather, transport, restaurants, rating, off-beat options and tips")
+
+    @field_validator("currency")
+    @classmethod
+    def _currency_code(cls, value: str) -> str:
+        return _currency_code(value)
+
+    @field_validator("days")
+    @classmethod
+    def _in_order(cls, days: List[DayPlan]) -> List[DayPlan]:
+        return sorted(days, key=lambda day: day.day)
+
+    @property
+    def total_cost(self) -> float:
+        """The cost breakdown's total, or the activities' costs when there is no breakdown."""
+        if self.costs:
+            return sum(item.amount for item in self.costs)
+        return sum(day.cost for day in self.days)
+
+    @property
+    def per_day_cost(self) -> float:
+        return self.total_cost / len(self.days)
+
+    def converted(self, currency: str, rate: float) -> "Itinerary":
+        """The same plan with every amount multiplied by ``rate`` and labelled ``currency``."""
+        def scale(amount):
+            return None if amount is None else round(amount * rate, 2)
+
+        data = self.model_dump()
+        data["currency"] = currency
+        for day in data["days"]:
+            for activity in day["activities"]:
+                activity["cost"] = scale(activity["cost"])
+        for hotel in data["hotels"]:
+            hotel["price_per_night"] = scale(hotel["price_per_night"])
+        for item in data["costs"]:
+            item["amount"] = scale(item["amount"])
+        return Itinerary.model_validate(data)
+
+    def _money(self, amount: float) -> str:
+        return _money(amount, self.currency)
+
+    def to_markdown(self) -> str:
+        """The plan as the Markdown the chat UI shows."""
+        lines = [f"## Trip to {self.destination}"]
+        if self.summary:
+            lines += ["", self.summary]
+        for day in self.days:
+            lines += day.markdown_lines(self.currency)
+        if self.hotels:
+            lines += ["", "### Where to stay"] + [hotel.markdown_line(self.currency) for hotel in self.hotels]
+        if self.costs:
+            lines += ["", "### Cost breakdown", "", "| Category | Amount |", "| --- | --- |"]
+            lines += [f"| {item.category} | {self._money(item.amount)} |" for item in self.costs]
+            lines.append(f"| **Total** | **{self._money(self.total_cost)}** |")
+            lines += ["", f"About {self._money(self.per_day_cost)} per day."]
+        if self.notes:
+            lines += ["", "### Good to know"] + [f"- {note}" for note in self.notes]
+        return "\n".join(lines)
+
+
+def partial_markdown(data: dict) -> str:
+    """The part of ``to_markdown`` already settled by a half-streamed ``Itinerary`` call.
+
+    ``data`` is the partially parsed JSON of the tool-call arguments. Fields
+    arrive in schema order, so a field is finished once a later one has
+    started and a list item once the next item has; days and hotels are
+    rendered when finished, the summary as it grows. The result is a prefix
+    of the final rendering as long as the model keeps that order.
+    """
+    keys = list(data)
+
+    def finished(field):
+        return field in keys[:-1]
+
+    def finished_items(field):
+        items = data.get(field) or []
+        return items if finished(field) else items[:-1]
+
+    if not finished("destination") or not isinstance(data["destination"], str):
+        return ""
+    lines = [f"## Trip to {data['destination']}"]
+    try:
+        currency = _currency_code(str(data["currency"])) if finished("currency") else None
+        if currency is None:
+            return "\n".join(lines)
+        if isinstance(data.get("summary"), str) and data["summary"]:
+            lines += ["", data["summary"]]
+        if "summary" in data and not finished("summary"):
+            return "\n".join(lines)
+        for day in finished_items("days"):
+            lines += DayPlan.model_validate(day).markdown_lines(currency)
+        if "days" in data and not finished("days"):
+            return "\n".join(lines)
+        hotels = [Hotel.model_validate(hotel) for hotel in finished_items("hotels")]
+        if hotels:
+            lines += ["", "### Where to stay"] + [hotel.markdown_line(currency) for hotel in hotels]
+    except (ValidationError, ValueError, TypeError):
+        pass
+    return "\n".join(lines)
+
+
+def cache_payload(answer: str, itinerary: Optional[dict]) -> str:
+    """What the response cache stores: the itinerary as compact JSON when there is one, else the text."""
+    if itinerary:
+        return Itinerary.model_validate(itinerary).model_dump_json(exclude_defaults=True)
+    return answer
+
+
+def from_cache_payload(payload: str) -> Tuple[str, Optional[dict]]:
+    """``(answer, itinerary)`` from a cached payload; the Markdown is rendered here, at the edge."""
+    if payload.startswith("{"):
+        try:
+            itinerary = Itinerary.model_validate_json(payload)
+            return itinerary.to_markdown(), itinerary.model_dump()
+        except ValidationError:
+            pass
+    return payload, None
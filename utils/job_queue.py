@@ -0,0 +1,288 @@
+import asyncio
+import heapq
+import ipaddress
+import itertools
+import re
+import socket
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, List, Optional
+import httpx
+from exception.exceptionhandling import InvalidWebhookError, JobQueueFullError, SchedulerQueueFullError
+from LOGGER.logging import get_logger
+
+logger = get_logger(__name__)
+
+QUEUED, RUNNING, SUCCEEDED, FAILED, CANCELLED = "queued", "running", "succeeded", "failed", "cancelled"
+_ACTIVE = (QUEUED, RUNNING)
+
+# Jobs turned away by a saturated scheduler are retried after this delay, doubling per retry up to the cap
+REQUEUE_DELAY_SECONDS = 1.0
+MAX_REQUEUE_DELAY_SECONDS = 30.0
+
+
+def dedup_key(question: str, thread_id: Optional[str]) -> str:
+    """Identical questions (ignoring case and spacing) in the same thread share one job."""
+    normalized = re.sub(r"\s+", " ", question.strip().lower())
+    return f"{thread_id or ''}|{normalized}"
+
+
+@dataclass
+class Job:
+    question: str
+    thread_id: Optional[str] = None
+    priority: int = 0
+    webhooks: List[str] = field(default_factory=list)
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    status: str = QUEUED
+    result: Optional[dict] = None
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    task: Optional[asyncio.Task] = field(default=None, repr=False)
+    # Submission order, kept across requeues so equal priorities stay first in, first out
+    seq: Optional[int] = field(default=None, repr=False)
+    requeues: int = 0
+
+    @property
+    def key(self) -> str:
+        return dedup_key(self.question, self.thread_id)
+
+    @property
+    def finished(self) -> bool:
+        return self.status not in _ACTIVE
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "status": self.status,
+            "question": self.question,
+            "thread_id": self.thread_id,
+            "priority": self.priority,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class JobQueue:
+    """In-process priority queue of agent runs, served by a pool of asyncio workers.
+
+    Higher ``priority`` runs first and equal priorities run in submission
+    order. Submitting a question that is already queued or running in the
+    same thread returns the existing job rather than planning it twice.
+    Queued jobs can be cancelled before they start and running ones are
+    interrupted. When a job finishes, its result is POSTed to every webhook
+    registered for it. Finished jobs are kept for ``retention_seconds`` so
+    clients can poll them.
+
+    Webhooks must be https. Their host must be in ``webhook_allowed_hosts``
+    when that is set, and must otherwise resolve only to public addresses,
+    so a job cannot make the server call its own network or a cloud
+    metadata endpoint.
+    """
+
+    def __init__(self, workers: int = 4, max_pending: int = 500, timeout: float = 600,
+                 retention_seconds: float = 3600, webhook_timeout: float = 10, webhook_retries: int = 3,
+                 webhook_allowed_hosts: List[str] = None):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.retention_seconds = retention_seconds
+        self.webhook_timeout = webhook_timeout
+        self.webhook_retries = webhook_retries
+        self.webhook_allowed_hosts = {host.lower() for host in webhook_allowed_hosts or []}
+        self._jobs = {}
+        self._active_by_key = {}
+        self._heap = []
+        self._seq = itertools.count()
+        self._available = None
+        self._worker_tasks = []
+        self._deliveries = set()
+        self._requeues = set()
+        self._http = None
+
+    @classmethod
+    def from_config(cls, config: dict) -> "JobQueue":
+        settings = config.get("jobs", {}) or {}
+        return cls(
+            workers=settings.get("workers", 4),
+            max_pending=settings.get("max_pending", 500),
+            timeout=settings.get("timeout_seconds", 600),
+            retention_seconds=settings.get("retention_seconds", 3600),
+            webhook_timeout=settings.get("webhook_timeout_seconds", 10),
+            webhook_retries=settings.get("webhook_retries", 3),
+            webhook_allowed_hosts=settings.get("webhook_allowed_hosts"),
+        )
+
+    def start(self, runner: Callable[[Job], Awaitable[dict]]):
+        """Start the workers; ``runner(job)`` plans one job and returns its result."""
+        self._available = asyncio.Semaphore(0)
+        self._http = httpx.AsyncClient(timeout=self.webhook_timeout)
+        self._worker_tasks = [asyncio.create_task(self._worker(runner)) for _ in range(self.workers)]
+
+    async def stop(self):
+        for handle in self._requeues:
+            handle.cancel()
+        self._requeues.clear()
+        tasks = self._worker_tasks + [job.task for job in self._jobs.values() if job.task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, *self._deliveries, return_exceptions=True)
+        self._worker_tasks = []
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    def _push(self, job: Job):
+        if job.seq is None:
+            job.seq = next(self._seq)
+        heapq.heappush(self._heap, (-job.priority, job.seq, job.id))
+        self._available.release()
+
+    def _requeue(self, job: Job):
+        """Put the job back in its original place after a backoff, without holding up a worker."""
+        job.status, job.task = QUEUED, None
+        delay = min(REQUEUE_DELAY_SECONDS * 2 ** job.requeues, MAX_REQUEUE_DELAY_SECONDS)
+        job.requeues += 1
+
+        def push():
+            self._requeues.discard(handle)
+            self._push(job)
+
+        handle = asyncio.get_running_loop().call_later(delay, push)
+        self._requeues.add(handle)
+
+    async def check_webhook(self, url: str):
+        """Raise ``InvalidWebhookError`` unless ``url`` is https to an allowed, public host."""
+        try:
+            parsed = httpx.URL(url)
+        except (httpx.InvalidURL, TypeError) as e:
+            raise InvalidWebhookError(f"Invalid webhook URL: {e}") from e
+        if parsed.scheme != "https" or not parsed.host:
+            raise InvalidWebhookError("Webhook URL must be an https URL")
+        host = parsed.host.lower()
+        if self.webhook_allowed_hosts:
+            if host not in self.webhook_allowed_hosts:
+                raise InvalidWebhookError(f"Webhook host {host} is not allowed")
+            return
+        try:
+            infos = await asyncio.get_running_loop().getaddrinfo(host, parsed.port or 443, type=socket.SOCK_STREAM)
+        except OSError as e:
+            raise InvalidWebhookError(f"Webhook host {host} does not resolve") from e
+        for info in infos:
+            address = ipaddress.ip_address(info[4][0].split("%")[0])
+            if getattr(address, "ipv4_mapped", None):
+                address = address.ipv4_mapped
+            # Covers private, loopback, link-local (cloud metadata), reserved and unspecified ranges
+            if not address.is_global or address.is_multicast:
+                raise InvalidWebhookError(f"Webhook host {host} resolves to a non-public address")
+
+    def _prune(self):
+        cutoff = time.time() - self.retention_seconds
+        for job_id in [j.id for j in self._jobs.values() if j.finished and j.finished_at < cutoff]:
+            del self._jobs[job_id]
+
+    def submit(self, question: str, thread_id: str = None, priority: int = 0, webhook: str = None):
+        """Queue a plan and return ``(job, deduplicated)``.
+
+        Raises ``JobQueueFullError`` when ``max_pending`` jobs are already queued.
+        """
+        self._prune()
+        existing = self._active_by_key.get(dedup_key(question, thread_id))
+        if existing is not None:
+            if webhook and webhook not in existing.webhooks:
+                existing.webhooks.append(webhook)
+            return existing, True
+        pending = sum(1 for job in self._active_by_key.values() if job.status == QUEUED)
+        if pending >= self.max_pending:
+            raise JobQueueFullError(f"{pending} jobs already queued (limit {self.max_pending})")
+        job = Job(question=question, thread_id=thread_id, priority=priority,
+                  webhooks=[webhook] if webhook else [])
+        self._jobs[job.id] = job
+        self._active_by_key[job.key] = job
+        self._push(job)
+        return job, False
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """Cancel a queued job, or interrupt a running one (it reads "cancelled" once it has stopped).
+
+        Finished jobs are returned unchanged.
+        """
+        job = self._jobs.get(job_id)
+        if job is None or job.finished:
+            return job
+        if job.status == RUNNING and job.task is not None:
+            job.task.cancel()
+        else:
+            self._finish(job, CANCELLED)
+        return job
+
+    def _finish(self, job: Job, status: str, result: dict = None, error: str = None):
+        job.status, job.result, job.error = status, result, error
+        job.finished_at = time.time()
+        job.task = None
+        if self._active_by_key.get(job.key) is job:
+            del self._active_by_key[job.key]
+
+    async def _worker(self, runner):
+        while True:
+            await self._available.acquire()
+            _, _, job_id = heapq.heappop(self._heap)
+            job = self._jobs.get(job_id)
+            if job is None or job.status != QUEUED:
+                continue
+            job.status, job.started_at = RUNNING, time.time()
+            job.task = asyncio.create_task(asyncio.wait_for(runner(job), self.timeout))
+            await asyncio.wait({job.task})
+            task = job.task
+            if task.cancelled():
+                self._finish(job, CANCELLED)
+            elif isinstance(task.exception(), SchedulerQueueFullError):
+                # Interactive traffic has the server saturated; try again shortly
+                self._requeue(job)
+                continue
+            elif task.exception() is not None:
+                error = task.exception()
+                message = "Trip planning timed out" if isinstance(error, TimeoutError) else str(error)
+                logger.warning("job failed", extra={"job_id": job.id, "error": repr(error)})
+                self._finish(job, FAILED, error=message)
+            else:
+                self._finish(job, SUCCEEDED, result=task.result())
+            logger.info("job finished", extra={"job_id": job.id, "status": job.status,
+                                               "duration_ms": round((job.finished_at - job.started_at) * 1000, 1)})
+            for url in job.webhooks:
+                delivery = asyncio.create_task(self._deliver(url, job))
+                self._deliveries.add(delivery)
+                delivery.add_done_callback(self._deliveries.discard)
+
+    async def _deliver(self, url: str, job: Job):
+        payload = job.to_dict()
+        for attempt in range(self.webhook_retries):
+            try:
+                # Checked again on delivery, as the host may resolve elsewhere by now
+                await self.check_webhook(url)
+            except InvalidWebhookError as e:
+                logger.error("webhook refused", extra={"job_id": job.id, "url": url, "error": str(e)})
+                return
+            try:
+                response = await self._http.post(url, json=payload)
+                if response.status_code < 500:
+                    return
+            except httpx.HTTPError as e:
+                logger.warning("webhook delivery failed", extra={"job_id": job.id, "url": url, "error": repr(e)})
+            await asyncio.sleep(2 ** attempt)
+        logger.error("webhook gave up", extra={"job_id": job.id, "url": url})
+
+    def stats(self) -> dict:
+        counts = {status: 0 for status in (QUEUED, RUNNING, SUCCEEDED, FAILED, CANCELLED)}
+        for job in self._jobs.values():
+            counts[job.status] += 1
+        return {**counts, "workers": self.workers, "max_pending": self.max_pending}
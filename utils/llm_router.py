@@ -0,0 +1,147 @@
+import threading
+import time
+from collections import deque
+from typing import Any, List, Optional
+from langchain_core.runnables import Runnable, RunnableConfig
+from LOGGER.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Upstream answers that mean "try another model" rather than "this request is bad"
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+_RETRYABLE_ERROR_NAMES = ("RateLimit", "Timeout", "Connection", "InternalServer", "ServiceUnavailable",
+                          "Overloaded")
+
+
+def is_retryable(error: Exception) -> bool:
+    """Whether ``error`` should fail over to the next route (429, 5xx, timeouts, network)."""
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    if status is not None:
+        return status in RETRYABLE_STATUS_CODES
+    return any(name in type(error).__name__ for name in _RETRYABLE_ERROR_NAMES)
+
+
+class RouteStats:
+    """Rolling latency and error window for one route."""
+
+    def __init__(self, window: int = 50):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.cooldown_until = 0.0
+
+    def record(self, latency: float, ok: bool):
+        with self._lock:
+            self._samples.append((latency, ok))
+
+    def p95(self) -> float:
+        with self._lock:
+            latencies = sorted(latency for latency, _ in self._samples)
+        if not latencies:
+            return 0.0
+        return latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+
+    def error_rate(self) -> float:
+        with self._lock:
+            if not self._samples:
+                return 0.0
+            return sum(1 for _, ok in self._samples if not ok) / len(self._samples)
+
+    def snapshot(self) -> dict:
+        return {"p95_seconds": round(self.p95(), 3), "error_rate": round(self.error_rate(), 3),
+                "cooling_down": self.cooldown_until > time.monotonic()}
+
+
+class ModelRoute:
+    """One configured provider/model, its tier and its rolling stats."""
+
+    def __init__(self, name: str, runnable: Any, tier: str = "main", stats: RouteStats = None):
+        self.name = name
+        self.runnable = runnable
+        self.tier = tier
+        self.stats = stats or RouteStats()
+
+    def with_runnable(self, runnable: Any) -> "ModelRoute":
+        return ModelRoute(self.name, runnable, self.tier, self.stats)
+
+    def score(self) -> float:
+        """Lower is better: p95 latency inflated by the recent error rate."""
+        return self.stats.p95() * (1 + 4 * self.stats.error_rate())
+
+
+class LLMRouter(Runnable):
+    """Chat-model front that picks among several configured models.
+
+    Routes of the requested ``tier`` are tried first, ordered by rolling p95
+    latency weighted by error rate; routes of other tiers are the last
+    resort. A retryable failure (429, 5xx, timeout, connection error) puts the
+    route on cooldown for ``cooldown_seconds`` and the call fails over to the
+    next route. Any other error is raised straight away. ``bind_tools`` and
+    ``for_tier`` return routers that share the same stats, so latency seen
+    through one view informs all of them.
+    """
+
+    def __init__(self, routes: List[ModelRoute], tier: str = "main", cooldown_seconds: float = 30):
+        if not routes:
+            raise ValueError("LLMRouter needs at least one route")
+        self.routes = routes
+        self.tier = tier
+        self.cooldown_seconds = cooldown_seconds
+
+    def bind_tools(self, tools, **kwargs) -> "LLMRouter":
+        routes = [route.with_runnable(route.runnable.bind_tools(tools, **kwargs)) for route in self.routes]
+        return LLMRouter(routes, self.tier, self.cooldown_seconds)
+
+    def for_tier(self, tier: str) -> "LLMRouter":
+        """A view of this router that prefers ``tier`` (e.g. "fast" for cheap sub-tasks)."""
+        return LLMRouter(self.routes, tier, self.cooldown_seconds)
+
+    def candidates(self) -> List[ModelRoute]:
+        now = time.monotonic()
+        return sorted(
+            self.routes,
+            key=lambda route: (route.tier != self.tier, route.stats.cooldown_until > now, route.score()),
+        )
+
+    def _failed(self, route: ModelRoute, started: float, error: Exception):
+        route.stats.record(time.monotonic() - started, ok=False)
+        route.stats.cooldown_until = time.monotonic() + self.cooldown_seconds
+        logger.warning("LLM route failed, failing over", extra={"route": route.name, "error": type(error).__name__})
+
+    def invoke(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> Any:
+        last_error = None
+        for route in self.candidates():
+            started = time.monotonic()
+            try:
+                result = route.runnable.invoke(input, config, **kwargs)
+            except Exception as e:
+                if not is_retryable(e):
+                    route.stats.record(time.monotonic() - started, ok=False)
+                    raise
+                self._failed(route, started, e)
+                last_error = e
+                continue
+            route.stats.record(time.monotonic() - started, ok=True)
+            return result
+        raise last_error
+
+    async def ainvoke(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> Any:
+        last_error = None
+        for route in self.candidates():
+            started = time.monotonic()
+            try:
+                result = await route.runnable.ainvoke(input, config, **kwargs)
+            except Exception as e:
+                if not is_retryable(e):
+                    route.stats.record(time.monotonic() - started, ok=False)
+                    raise
+                self._failed(route, started, e)
+                last_error = e
+                continue
+            route.stats.record(time.monotonic() - started, ok=True)
+            return result
+        raise last_error
+
+    def stats(self) -> dict:
+        return {route.name: {"tier": route.tier, **route.stats.snapshot()} for route in self.routes}
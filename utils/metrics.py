@@ -0,0 +1,97 @@
+import time
+from contextlib import contextmanager
+from LOGGER.logging import get_logger
+
+try:
+    import prometheus_client
+except ImportError:  # metrics are optional; spans are still logged
+    prometheus_client = None
+
+logger = get_logger("metrics")
+
+# Agent runs take tens of seconds, single calls milliseconds
+_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 40, 60, 120)
+
+if prometheus_client is not None:
+    REQUEST_SECONDS = prometheus_client.Histogram(
+        "trip_planner_request_seconds", "HTTP request handling time", ["path", "status"], buckets=_BUCKETS)
+    GRAPH_BUILD_SECONDS = prometheus_client.Histogram(
+        "trip_planner_graph_build_seconds", "Time to build and compile the agent graph", buckets=_BUCKETS)
+    LLM_TURN_SECONDS = prometheus_client.Histogram(
+        "trip_planner_llm_turn_seconds", "Time per LLM turn", ["model"], buckets=_BUCKETS)
+    LLM_TOKENS = prometheus_client.Histogram(
+        "trip_planner_llm_turn_tokens", "Tokens per LLM turn", ["model", "kind"],
+        buckets=(50, 100, 250, 500, 1000, 2000, 4000, 8000, 16000, 32000))
+    TOOL_SECONDS = prometheus_client.Histogram(
+        "trip_planner_tool_call_seconds", "Time per tool call", ["tool", "status"], buckets=_BUCKETS)
+    UPSTREAM_SECONDS = prometheus_client.Histogram(
+        "trip_planner_upstream_seconds", "Time per upstream HTTP call", ["service", "status"], buckets=_BUCKETS)
+    CACHE_LOOKUPS = prometheus_client.Counter(
+        "trip_planner_cache_lookups", "Cache lookups by cache and outcome", ["cache", "result"])
+
+
+def _observe(metric: str, labels: dict, seconds: float):
+    if prometheus_client is not None:
+        histogram = globals()[metric]
+        (histogram.labels(**labels) if labels else histogram).observe(seconds)
+
+
+@contextmanager
+def span(name: str, metric: str = None, **labels):
+    """Time the enclosed block, log it and record it in ``metric``.
+
+    The block may update ``labels`` (e.g. ``labels["status"]``) through the
+    yielded dict before it ends; an exception turns a ``status`` label into
+    ``error``.
+    """
+    start = time.perf_counter()
+    try:
+        yield labels
+    except BaseException:
+        if "status" in labels:
+            labels["status"] = "error"
+        raise
+    finally:
+        seconds = time.perf_counter() - start
+        if metric is not None:
+            _observe(metric, labels, seconds)
+        logger.info("span", extra={"span": name, "duration_ms": round(seconds * 1000, 1), **labels})
+
+
+def observe_request(path: str, status: int, seconds: float):
+    _observe("REQUEST_SECONDS", {"path": path, "status": str(status)}, seconds)
+
+
+def observe_llm_turn(model: str, seconds: float, usage: dict = None):
+    """Record one LLM turn and, when the provider reported them, its token counts."""
+    _observe("LLM_TURN_SECONDS", {"model": model}, seconds)
+    usage = usage or {}
+    if prometheus_client is not None:
+        for kind in ("input_tokens", "output_tokens"):
+            if usage.get(kind) is not None:
+                LLM_TOKENS.labels(model=model, kind=kind.split("_")[0]).observe(usage[kind])
+    logger.info("llm turn", extra={"model": model, "duration_ms": round(seconds * 1000, 1),
+                                   "input_tokens": usage.get("input_tokens"),
+                                   "output_tokens": usage.get("output_tokens")})
+
+
+def observe_tool_call(tool: str, status: str, seconds: float):
+    _observe("TOOL_SECONDS", {"tool": tool, "status": status}, seconds)
+    logger.info("tool call", extra={"tool": tool, "status": status, "duration_ms": round(seconds * 1000, 1)})
+
+
+def upstream(service: str):
+    """Span around one upstream HTTP call; set ``labels["status"]`` to the HTTP status."""
+    return span(f"upstream.{service}", "UPSTREAM_SECONDS", service=service, status="ok")
+
+
+def record_cache_lookup(cache: str, hit: bool):
+    if prometheus_client is not None:
+        CACHE_LOOKUPS.labels(cache=cache, result="hit" if hit else "miss").inc()
+
+
+def render():
+    """Prometheus exposition of every metric as ``(body, content_type)``, or None without prometheus_client."""
+    if prometheus_client is None:
+        return None
+    return prometheus_client.generate_latest(), prometheus_client.CONTENT_TYPE_LATEST
@@ -3,26 +3,32 @@ from dotenv import load_dotenv
 from typing import Literal, Optional, Any
 from pydantic import BaseModel, Field
 from utils.config_loader import load_config
-from langchain_groq import ChatGroq
+from utils.llm_router import LLMRouter, ModelRoute
+from LOGGER.logging import get_logger
 
 # Load environment variables from .env
 load_dotenv()
 
+logger = get_logger(__name__)
+
 
 class ConfigLoader:
     """Loads configuration from YAML and provides dictionary-like access."""
 
     def __init__(self):
-        print("Loaded config.....")
+        logger.debug("config loaded")
         self.config = load_config()
 
     def __getitem__(self, key):
         return self.config[key]
 
+    def get(self, key, default=None):
+        return self.config.get(key, default)
+
 
 class ModelLoader(BaseModel):
 
-    model_provider: Literal["groq"] = "groq"
+    model_provider: Literal["groq", "openai", "fake"] = "groq"
     config: Optional[ConfigLoader] = Field(default=None, exclude=True)
 
     class Config:
@@ -31,22 +37,83 @@ class ModelLoader(BaseModel):
     def model_post_init(self, __context: Any = None) -> None:
         self.config = ConfigLoader()
 
-    def load_llm(self):
-        
-        print("LLM loading...")
-        print(f"Loading model from provider: {self.model_provider}")
+    def _router_settings(self) -> dict:
+        return self.config["llm"].get("router") or {}
+
+    def model_label(self) -> str:
+        """Name identifying the model(s) answering requests, used in cache keys."""
+        router = self._router_settings()
+        if router.get("enabled"):
+            return "router:" + ",".join(
+                f"{route['provider']}/{route['model_name']}" for route in router.get("routes", [])
+            )
+        return self._model_name(self.model_provider)
+
+    def _model_name(self, provider: str) -> str:
+        """Configured llm.<provider>.model_name, or a ValueError naming the missing key."""
+        settings = self.config["llm"].get(provider) or {}
+        model_name = settings.get("model_name")
+        if not model_name:
+            raise ValueError(f"llm.{provider}.model_name is missing in config.yaml!")
+        return model_name
+
+    def load_chat_model(self, provider: str, model_name: Optional[str] = None):
+        """Build a single chat model for ``provider``."""
+        settings = self.config["llm"].get(provider) or {}
+        if provider in ("groq", "openai"):
+            model_name = model_name or self._model_name(provider)
+        else:
+            model_name = model_name or settings.get("model_name")
 
-        if self.model_provider == "groq":
-            print("Loading LLM from Groq..............")
+        if provider == "groq":
+            logger.info("loading chat model", extra={"provider": "groq", "model": model_name})
+            # Provider SDKs are heavy to import, so only the configured ones are loaded
+            from langchain_groq import ChatGroq
             groq_api_key = os.getenv("GROQ_API_KEY")
             if not groq_api_key:
                 raise ValueError("GROQ_API_KEY is missing in environment variables!")
-            
-            model_name = self.config["llm"]["groq"]["model_name"]
-            llm = ChatGroq(model=model_name, api_key=groq_api_key)
+            return ChatGroq(model=model_name, api_key=groq_api_key)
+
+        if provider == "openai":
+            logger.info("loading chat model", extra={"provider": "openai", "model": model_name})
+            from langchain_openai import ChatOpenAI
+            openai_api_key = os.getenv("OPENAI_API_KEY")
+            if not openai_api_key:
+                raise ValueError("OPENAI_API_KEY is missing in environment variables!")
+            return ChatOpenAI(model=model_name, api_key=openai_api_key)
+
+        if provider == "fake":
+            logger.info("loading chat model", extra={"provider": "fake", "model": model_name})
+            from utils.fake_llm import FakeChatModel
+            return FakeChatModel(
+                model_name=model_name or "fake",
+                responses=settings.get("responses") or ["This is a fake trip plan."],
+                script=settings.get("script") or [],
+                latency=settings.get("latency_seconds", 0.0),
+            )
 
+        raise ValueError(f"Unknown model provider: {provider}")
+
+    def load_router(self) -> LLMRouter:
+        """Build an LLMRouter over every route listed under llm.router in config.yaml."""
+        router = self._router_settings()
+        routes = [
+            ModelRoute(
+                name=f"{route['provider']}/{route['model_name']}",
+                runnable=self.load_chat_model(route["provider"], route["model_name"]),
+                tier=route.get("tier", "main"),
+            )
+            for route in router.get("routes", [])
+        ]
+        return LLMRouter(routes, cooldown_seconds=router.get("cooldown_seconds", 30))
+
+    def load_llm(self):
+        if self._router_settings().get("enabled"):
+            logger.info("loading LLM router over configured routes")
+            llm = self.load_router()
         else:
-            raise ValueError(f"Unknown model provider: {self.model_provider}")
+            logger.info("loading LLM", extra={"provider": self.model_provider})
+            llm = self.load_chat_model(self.model_provider)
 
-        print("LLM loaded successfully.")
+        logger.info("LLM loaded")
         return llm
@@ -1,10 +1,23 @@
+import asyncio
 import os
-import json
-from langchain_tavily import TavilySearch
-from langchain_google_community import GooglePlacesTool, GooglePlacesAPIWrapper 
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from utils.ttl_cache import TTLCache
+from utils.metrics import upstream
+from utils.destination_index import resolve
+
+def canonical_place(place: str):
+    """``(cache key, query text)`` for a place: the destination id and "Name, CC" when known."""
+    destination = resolve(place)
+    if destination is not None:
+        return destination.id, destination.display_name
+    return place.strip().lower(), place
+
 
 class GooglePlaceSearchTool:
     def __init__(self, api_key: str):
+        # Imported here so loading the module does not pull in the Google SDK
+        from langchain_google_community import GooglePlacesTool, GooglePlacesAPIWrapper
         self.places_wrapper = GooglePlacesAPIWrapper(gplaces_api_key=api_key)
         self.places_tool = GooglePlacesTool(api_wrapper=self.places_wrapper)
     
@@ -12,67 +25,131 @@ class GooglePlaceSearchTool:
         """
         Searches for attractions in the specified place using GooglePlaces API.
         """
-        return self.places_tool.run(f"top attractive places in and around {place}")
+        return self.places_tool.run(f"top attractive places in and around {canonical_place(place)[1]}")
     
     def google_search_restaurants(self, place: str) -> dict:
         """
         Searches for available restaurants in the specified place using GooglePlaces API.
         """
-        return self.places_tool.run(f"what are the top 10 restaurants and eateries in and around {place}?")
+        return self.places_tool.run(
+            f"what are the top 10 restaurants and eateries in and around {canonical_place(place)[1]}?")
     
     def google_search_activity(self, place: str) -> dict:
         """
         Searches for popular activities in the specified place using GooglePlaces API.
         """
-        return self.places_tool.run(f"Activities in and around {place}")
+        return self.places_tool.run(f"Activities in and around {canonical_place(place)[1]}")
 
     def google_search_transportation(self, place: str) -> dict:
         """
         Searches for available modes of transportation in the specified place using GooglePlaces API.
         """
-        return self.places_tool.run(f"What are the different modes of transportations available in {place}")
+        return self.places_tool.run(
+            f"What are the different modes of transportations available in {canonical_place(place)[1]}")
+
+# Answers per (category, destination id) shared by every TavilyPlaceSearchTool in the process
+_place_cache = TTLCache(maxsize=1024, ttl=6 * 3600, name="places")
+
 
 class TavilyPlaceSearchTool:
-    def __init__(self):
-        pass
+    """Place research through a single TavilySearch client.
+
+    Results are cached per (category, destination id), so every spelling of a
+    known place shares one entry; ``search_all`` runs every
+    category concurrently so the research phase takes about as long as the
+    slowest single query.
+    """
+
+    QUERIES = {
+        "attractions": "top attractive places in and around {place}",
+        "restaurants": "what are the top 10 restaurants and eateries in and around {place}.",
+        "activities": "activities in and around {place}",
+        "transportation": "What are the different modes of transportations available in {place}",
+    }
+
+    def __init__(self, max_workers: int = 4):
+        self.max_workers = max_workers
+        self.cache = _place_cache
+        self._client = None
+        self._client_lock = threading.Lock()
+
+    @property
+    def client(self):
+        """TavilySearch client, created (and the SDK imported) on first use."""
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    from langchain_tavily import TavilySearch
+                    options = {"topic": "general", "include_answer": "advanced"}
+                    if os.getenv("TAVILY_API_BASE_URL"):
+                        options["api_base_url"] = os.getenv("TAVILY_API_BASE_URL")
+                    self._client = TavilySearch(**options)
+        return self._client
+
+    @staticmethod
+    def _answer(result):
+        if isinstance(result, dict) and result.get("answer"):
+            return result["answer"]
+        return result
+
+    def _fetch(self, query: str):
+        with upstream("tavily"):
+            return self._answer(self.client.invoke({"query": query}))
+
+    def _search(self, category: str, place: str):
+        place_key, place = canonical_place(place)
+        key = (category, place_key)
+        query = self.QUERIES[category].format(place=place)
+        return self.cache.get_or_load(key, lambda: self._fetch(query))
+
+    async def _asearch(self, category: str, place: str):
+        place_key, place = canonical_place(place)
+        key = (category, place_key)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        query = self.QUERIES[category].format(place=place)
+        with upstream("tavily"):
+            result = self._answer(await self.client.ainvoke({"query": query}))
+        self.cache.set(key, result)
+        return result
 
     def tavily_search_attractions(self, place: str) -> dict:
         """
         Searches for attractions in the specified place using TavilySearch.
         """
-        tavily_tool = TavilySearch(topic="general", include_answer="advanced")
-        result = tavily_tool.invoke({"query": f"top attractive places in and around {place}"})
-        if isinstance(result, dict) and result.get("answer"):
-            return result["answer"]
-        return result
+        return self._search("attractions", place)
     
     def tavily_search_restaurants(self, place: str) -> dict:
         """
         Searches for available restaurants in the specified place using TavilySearch.
         """
-        tavily_tool = TavilySearch(topic="general", include_answer="advanced")
-        result = tavily_tool.invoke({"query": f"what are the top 10 restaurants and eateries in and around {place}."})
-        if isinstance(result, dict) and result.get("answer"):
-            return result["answer"]
-        return result
+        return self._search("restaurants", place)
     
     def tavily_search_activity(self, place: str) -> dict:
         """
         Searches for popular activities in the specified place using TavilySearch.
         """
-        tavily_tool = TavilySearch(topic="general", include_answer="advanced")
-        result = tavily_tool.invoke({"query": f"activities in and around {place}"})
-        if isinstance(result, dict) and result.get("answer"):
-            return result["answer"]
-        return result
+        return self._search("activities", place)
 
     def tavily_search_transportation(self, place: str) -> dict:
         """
         Searches for available modes of transportation in the specified place using TavilySearch.
         """
-        tavily_tool = TavilySearch(topic="general", include_answer="advanced")
-        result = tavily_tool.invoke({"query": f"What are the different modes of transportations available in {place}"})
-        if isinstance(result, dict) and result.get("answer"):
-            return result["answer"]
-        return result
-    
\ No newline at end of file
+        return self._search("transportation", place)
+
+    def search_all(self, place: str) -> dict:
+        """
+        Runs the attractions, restaurants, activities and transportation searches concurrently.
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {category: pool.submit(self._search, category, place) for category in self.QUERIES}
+            return {category: future.result() for category, future in futures.items()}
+
+    async def asearch_all(self, place: str) -> dict:
+        """
+        Async variant of search_all for use from the async agent.
+        """
+        categories = list(self.QUERIES)
+        results = await asyncio.gather(*(self._asearch(category, place) for category in categories))
+        return dict(zip(categories, results))
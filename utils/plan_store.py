@@ -0,0 +1,246 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Optional
+from utils.destination_index import Destination, get_index
+from utils.itinerary import Itinerary
+from utils.response_cache import budget_currency, normalize_query
+from LOGGER.logging import get_logger
+
+logger = get_logger(__name__)
+
+_COLUMNS = ("id", "created_at", "question", "destination", "destination_id", "days", "party",
+            "budget", "currency", "total_cost", "cost_currency", "model", "latency_ms", "thread_id", "answer")
+
+# Columns added after the first release; older databases get them on open
+_ADDED_COLUMNS = {"total_cost": "REAL", "cost_currency": "TEXT"}
+
+# What a plan costs: the itinerary's total when it has one, else the budget stated in the question
+_COST = "COALESCE(p.total_cost, p.budget)"
+_COST_CURRENCY = "CASE WHEN p.total_cost IS NULL THEN p.currency ELSE p.cost_currency END"
+
+_FTS_WORD = re.compile(r"\w+")
+
+# Words of a search request that are not about the trip itself
+_SEARCH_WORDS = {"find", "show", "list", "previous", "past", "earlier", "saved", "old", "plans", "trips"}
+
+
+def _fts_query(text: str) -> Optional[str]:
+    """Quote every word so user text cannot inject FTS5 syntax; words are ANDed."""
+    words = _FTS_WORD.findall(text or "")
+    return " ".join(f'"{word}"' for word in words) or None
+
+
+def _destination(question: str, place_words: str) -> Optional[Destination]:
+    """The destination named in a question, allowing for misspellings ("Pariss")."""
+    known = get_index().match_in_text(question)
+    if known is not None:
+        return known[0]
+    return get_index().lookup(place_words) if place_words else None
+
+
+class PlanStore:
+    """Every generated plan with its metadata, in SQLite with an FTS5 index.
+
+    ``save_async`` hands plans to a single writer thread, so answering a
+    request never waits on the disk. Plans are stored with the destination
+    (its canonical id when the destination index knows it), duration, party,
+    stated budget and its currency, the submitted itinerary's total cost and
+    currency, model and latency. ``search`` filters on that metadata through
+    ordinary indexes and on free text through the FTS5 index over question,
+    destination and answer, so "previous plans for Goa under ₹50k" is an
+    index lookup rather than a scan of every plan. A budget filter compares
+    the plan's real total, falling back to the budget stated in the question
+    for plans without an itinerary. Without FTS5 in the local SQLite build,
+    free-text search falls back to LIKE.
+    """
+
+    def __init__(self, path: str = "./output/plans.sqlite3"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="plan-store")
+        self._pending = 0
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS plans (
+                   id INTEGER PRIMARY KEY,
+                   created_at REAL NOT NULL,
+                   question TEXT NOT NULL,
+                   destination TEXT,
+                   destination_id TEXT,
+                   days INTEGER,
+                   party TEXT,
+                   budget INTEGER,
+                   currency TEXT,
+                   total_cost REAL,
+                   cost_currency TEXT,
+                   model TEXT,
+                   latency_ms REAL,
+                   thread_id TEXT,
+                   answer TEXT NOT NULL
+               )"""
+        )
+        existing = {row["name"] for row in self._conn.execute("PRAGMA table_info(plans)")}
+        for column, kind in _ADDED_COLUMNS.items():
+            if column not in existing:
+                self._conn.execute(f"ALTER TABLE plans ADD COLUMN {column} {kind}")
+        self._conn.execute("DROP INDEX IF EXISTS idx_plans_destination")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_plans_destination_cost "
+                           "ON plans(destination_id, COALESCE(total_cost, budget))")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_plans_created ON plans(created_at)")
+        try:
+            self._conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS plans_fts USING "
+                "fts5(question, destination, answer, content='plans', content_rowid='id')"
+            )
+            self.fts = True
+        except sqlite3.OperationalError:
+            logger.warning("SQLite has no FTS5; plan text search falls back to LIKE")
+            self.fts = False
+        self._conn.commit()
+
+    @classmethod
+    def from_config(cls, config: dict) -> Optional["PlanStore"]:
+        """Build the store from the ``plans`` config section, or None if disabled."""
+        settings = config.get("plans", {}) or {}
+        if not settings.get("enabled", False):
+            return None
+        return cls(path=settings.get("path", "./output/plans.sqlite3"))
+
+    def save(self, question: str, answer: str, model: str = None, latency_ms: float = None,
+             thread_id: str = None, itinerary: dict = None) -> int:
+        """Store a plan and return its id; ``itinerary`` is the submitted plan, if there was one."""
+        normalized = normalize_query(question)
+        destination = _destination(question, normalized.destination)
+        currency = budget_currency(question) or (destination.currency if destination else None)
+        total_cost = cost_currency = None
+        if itinerary:
+            plan = Itinerary.model_validate(itinerary)
+            if plan.total_cost:
+                total_cost, cost_currency = round(plan.total_cost, 2), plan.currency
+        row = (
+            time.time(), question,
+            destination.name if destination else normalized.destination or None,
+            destination.id if destination else None,
+            normalized.days, normalized.party, normalized.budget,
+            currency if normalized.budget is not None else None,
+            total_cost, cost_currency,
+            model, latency_ms, thread_id, answer,
+        )
+        with self._lock:
+            cursor = self._conn.execute(
+                f"INSERT INTO plans ({', '.join(_COLUMNS[1:])}) VALUES ({', '.join('?' * len(row))})", row
+            )
+            plan_id = cursor.lastrowid
+            if self.fts:
+                self._conn.execute(
+                    "INSERT INTO plans_fts (rowid, question, destination, answer) VALUES (?, ?, ?, ?)",
+                    (plan_id, question, row[2], answer),
+                )
+            self._conn.commit()
+        return plan_id
+
+    def _save_logged(self, *args, **kwargs) -> Optional[int]:
+        try:
+            return self.save(*args, **kwargs)
+        except Exception:
+            logger.exception("saving plan failed")
+            return None
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def save_async(self, question: str, answer: str, model: str = None, latency_ms: float = None,
+                   thread_id: str = None, itinerary: dict = None) -> Future:
+        """Queue a plan for the writer thread; failures are logged, not raised."""
+        with self._lock:
+            self._pending += 1
+        return self._writer.submit(self._save_logged, question, answer, model=model,
+                                   latency_ms=latency_ms, thread_id=thread_id, itinerary=itinerary)
+
+    def search(self, destination: str = None, max_budget: int = None, currency: str = None,
+               days: int = None, text: str = None, limit: int = 10) -> List[dict]:
+        """Plans matching every filter given, best text match first, else newest first.
+
+        ``destination`` may be any spelling the destination index knows; an
+        unknown place is matched as text against the stored destination.
+        ``max_budget`` and ``currency`` apply to what the plan costs.
+        """
+        where, params = [], []
+        if destination:
+            known = get_index().lookup(destination)
+            if known is not None:
+                where.append("p.destination_id = ?")
+                params.append(known.id)
+            else:
+                where.append("p.destination LIKE ?")
+                params.append(f"%{destination.strip()}%")
+        if max_budget is not None:
+            where.append(f"{_COST} <= ?")
+            params.append(max_budget)
+        if currency:
+            where.append(f"{_COST_CURRENCY} = ?")
+            params.append(currency.upper())
+        if days is not None:
+            where.append("p.days = ?")
+            params.append(days)
+
+        match = _fts_query(text)
+        columns = ", ".join(f"p.{column}" for column in _COLUMNS)
+        if match and self.fts:
+            sql = (f"SELECT {columns} FROM plans_fts JOIN plans p ON p.id = plans_fts.rowid "
+                   f"WHERE plans_fts MATCH ?{''.join(' AND ' + clause for clause in where)} "
+                   f"ORDER BY bm25(plans_fts) LIMIT ?")
+            params = [match, *params]
+        else:
+            if match:
+                for word in _FTS_WORD.findall(text):
+                    where.append("(p.question LIKE ? OR p.answer LIKE ?)")
+                    params.extend([f"%{word}%"] * 2)
+            sql = (f"SELECT {columns} FROM plans p"
+                   f"{' WHERE ' + ' AND '.join(where) if where else ''} "
+                   f"ORDER BY p.created_at DESC LIMIT ?")
+        with self._lock:
+            rows = self._conn.execute(sql, [*params, limit]).fetchall()
+        return [dict(row) for row in rows]
+
+    def search_question(self, question: str, limit: int = 10) -> List[dict]:
+        """Previous plans for a request in plain words: "plans for Goa under ₹50k".
+
+        The destination, budget (as an upper bound, in its currency, else
+        the destination's) and duration are read from the question the same
+        way new requests are normalized; they become filters. A place the
+        destination index does not know is searched as text.
+        """
+        normalized = normalize_query(question)
+        place = " ".join(word for word in normalized.destination.split() if word not in _SEARCH_WORDS)
+        destination = _destination(question, place)
+        return self.search(
+            destination=destination.name if destination else None,
+            text=None if destination else place,
+            max_budget=normalized.budget,
+            currency=(budget_currency(question) or (destination.currency if destination else None))
+            if normalized.budget is not None else None,
+            days=normalized.days,
+            limit=limit,
+        )
+
+    def stats(self) -> dict:
+        with self._lock:
+            count = self._conn.execute("SELECT COUNT(*) FROM plans").fetchone()[0]
+            pending = self._pending
+        return {"plans": count, "full_text_search": self.fts, "pending_writes": pending}
+
+    def close(self):
+        """Finish queued writes, then close the database."""
+        self._writer.shutdown(wait=True)
+        with self._lock:
+            self._conn.close()
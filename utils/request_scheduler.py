@@ -0,0 +1,71 @@
+import asyncio
+from contextlib import asynccontextmanager
+from exception.exceptionhandling import SchedulerQueueFullError
+
+
+class RequestScheduler:
+    """Bounds how many agent runs are in flight and how many may wait for a slot.
+
+    Requests beyond ``max_concurrent`` wait in FIFO order on a semaphore. Once
+    ``max_queued`` requests are already waiting, new ones are rejected with
+    ``SchedulerQueueFullError`` so the caller can answer 503 immediately
+    instead of piling more work onto an overloaded worker.
+    """
+
+    def __init__(self, max_concurrent: int = 32, max_queued: int = 64, timeout: float = 120):
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self.timeout = timeout
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._waiting = 0
+        self._running = 0
+
+    @classmethod
+    def from_config(cls, config: dict) -> "RequestScheduler":
+        server = config.get("server", {}) or {}
+        return cls(
+            max_concurrent=server.get("max_concurrent_requests", 32),
+            max_queued=server.get("max_queued_requests", 64),
+            timeout=server.get("request_timeout_seconds", 120),
+        )
+
+    def check_capacity(self):
+        """Raise ``SchedulerQueueFullError`` if a new request would be shed."""
+        if self._semaphore.locked() and self._waiting >= self.max_queued:
+            raise SchedulerQueueFullError(
+                f"{self._waiting} requests already queued (limit {self.max_queued})"
+            )
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold one concurrency slot for the duration of the ``async with`` block."""
+        self.check_capacity()
+        self._waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._waiting -= 1
+        self._running += 1
+        try:
+            yield
+        finally:
+            self._running -= 1
+            self._semaphore.release()
+
+    async def run(self, coro_factory, timeout: float = None):
+        """Run ``coro_factory()`` once a slot is free.
+
+        The timeout covers both the queue wait and the run itself and raises
+        ``TimeoutError`` when exceeded.
+        """
+        async with asyncio.timeout(timeout or self.timeout):
+            async with self.slot():
+                return await coro_factory()
+
+    def stats(self) -> dict:
+        return {
+            "running": self._running,
+            "queued": self._waiting,
+            "max_concurrent": self.max_concurrent,
+            "max_queued": self.max_queued,
+        }
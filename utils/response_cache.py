@@ -0,0 +1,364 @@
+import hashlib
+import json
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from array import array
+from dataclasses import dataclass, asdict
+from typing import List, Optional
+from utils.metrics import record_cache_lookup
+from utils.destination_index import COUNTRY_NAMES, get_index
+
+_DURATION = re.compile(r"\b(\d{1,3})\s*-?\s*(?:days?|nights?|d|n)\b")
+# Durations in weeks: "a week", "2 weeks", "weekend", "long weekend"
+_WEEKS = re.compile(r"\b(?:(\d{1,2})|an?|one)\s*-?\s*weeks?\b|\b(long\s+)?weekend\b")
+_BUDGET = re.compile(
+    r"(?:₹|\$|€|£|\brs\.?|\binr|\busd|\beur|\bgbp)\s*(\d[\d,]*(?:\.\d+)?)\s*(k|lakhs?|lacs?)?\b"
+    r"|\b(\d[\d,]*(?:\.\d+)?)\s*(k|lakhs?|lacs?)?\s*(?:₹|rupees|inr|usd|dollars|eur|euros|gbp|pounds)\b"
+)
+# Amounts without a currency: "50k", "1.5 lakh", or a plain number after "under", "budget" and the like
+_BARE_BUDGET = re.compile(
+    r"\b(\d[\d,]*(?:\.\d+)?)\s*(k|lakhs?|lacs?)\b"
+    r"|\b(?:under|within|below|budget(?:\s+of)?|up\s*to|upto|max(?:imum)?|less\s+than)\s+(\d[\d,]*(?:\.\d+)?)\b"
+    r"(?!\s*-?\s*(?:days?|nights?|weeks?|people|persons?|pax|adults?|travell?ers?|guests?|d|n)\b)"
+)
+# Numeric party sizes: "2 people", "family of 4", "for 3"
+_PARTY_SIZE = re.compile(
+    r"\b(\d{1,2})\s*(?:people|persons?|pax|adults?|travell?ers?|guests?|of\s+us)\b"
+    r"|\b(?:family|group|party)\s+of\s+(\d{1,2})\b"
+    r"|\bfor\s+(\d{1,2})\b(?![\d.,]|\s*-?\s*(?:days?|nights?|weeks?|d|n|k|lakhs?|lacs?)\b)"
+)
+# Numbers left over after budget, duration and party size are kept in the key
+_WORD = re.compile(r"[a-z0-9][a-z0-9'\-]*")
+
+# Currency written next to a budget amount
+_BUDGET_CURRENCIES = {
+    "₹": "INR", "rs": "INR", "inr": "INR", "rupees": "INR", "$": "USD", "usd": "USD", "dollars": "USD",
+    "€": "EUR", "eur": "EUR", "euros": "EUR", "£": "GBP", "gbp": "GBP", "pounds": "GBP",
+}
+
+_PARTY_WORDS = {
+    "family": "family", "kids": "family", "children": "family", "parents": "family",
+    "couple": "couple", "honeymoon": "couple", "wife": "couple", "husband": "couple",
+    "partner": "couple", "girlfriend": "couple", "boyfriend": "couple",
+    "solo": "solo", "alone": "solo", "myself": "solo",
+    "friends": "friends", "group": "friends", "buddies": "friends",
+}
+
+_STOPWORDS = {
+    "a", "an", "the", "in", "to", "for", "of", "with", "and", "or", "at", "on", "my", "our", "me",
+    "we", "us", "i", "is", "are", "be", "from", "by", "around", "near", "about", "under", "within",
+    "plan", "planning", "trip", "travel", "tour", "itinerary", "visit", "visiting", "vacation",
+    "holiday", "holidays", "day", "days", "night", "nights", "please", "can", "you", "give",
+    "make", "create", "suggest", "want", "need", "going", "go", "budget", "cost", "costs",
+    "rs", "inr", "usd", "rupees", "dollars", "k", "lakh", "lakhs", "week", "weekend",
+    "below", "upto", "up", "max", "maximum", "less", "than", "people", "persons", "pax", "adults",
+}
+
+
+@dataclass(frozen=True)
+class NormalizedQuery:
+    """The parts of a trip question that decide what the plan looks like."""
+    destination: str
+    days: Optional[int]
+    party: Optional[str]
+    budget: Optional[int]
+    travellers: Optional[int] = None
+    # Currency written with the budget ("$800" vs "₹800"), when there is one
+    currency: Optional[str] = None
+
+    def facets(self) -> str:
+        """Everything except the destination; fuzzy hits must match these exactly."""
+        return json.dumps([self.days, self.party, self.budget, self.currency, self.travellers])
+
+
+def _parse_amount(number: str, unit: Optional[str]) -> int:
+    value = float(number.replace(",", ""))
+    if unit:
+        unit = unit.lower()
+        value *= 1_000 if unit == "k" else 100_000
+    return int(value)
+
+
+def normalize_query(question: str) -> NormalizedQuery:
+    """Reduce a free-text question to destination, duration, party and budget.
+
+    "3 days in Jaipur with family" and "Jaipur 3-day family trip" both become
+    ``NormalizedQuery(destination="jaipur-in", days=3, party="family", budget=None)``.
+    Budgets are read with or without a currency ("₹50k", "under 50k", "1.5
+    lakh"), keeping the currency when one is written, "a week" and
+    "weekend" count as 7 and 2 days, and numeric party sizes ("for 2
+    people", "family of 4") are kept apart from the party word, so none of
+    them is lost from the key.
+    A place found in the destination index is replaced by its canonical id, so
+    "Bombay", "Mumbai" and "Mumbai, India" share one cache entry.
+    """
+    known = get_index().match_in_text(question)
+    text = question.lower()
+
+    budget = currency = None
+    match = _BUDGET.search(text)
+    if match:
+        currency = _currency_of(match.group(0))
+        if match.group(1):
+            budget = _parse_amount(match.group(1), match.group(2))
+        else:
+            budget = _parse_amount(match.group(3), match.group(4))
+        text = text[:match.start()] + " " + text[match.end():]
+    else:
+        match = _BARE_BUDGET.search(text)
+        if match:
+            if match.group(1):
+                budget = _parse_amount(match.group(1), match.group(2))
+            else:
+                budget = _parse_amount(match.group(3), None)
+            text = text[:match.start()] + " " + text[match.end():]
+
+    days = None
+    match = _DURATION.search(text)
+    if match:
+        days = int(match.group(1))
+        text = text[:match.start()] + " " + text[match.end():]
+    else:
+        match = _WEEKS.search(text)
+        if match:
+            if match.group(0).endswith("weekend"):
+                days = 3 if match.group(2) else 2
+            else:
+                days = 7 * int(match.group(1) or 1)
+            text = text[:match.start()] + " " + text[match.end():]
+
+    travellers = None
+    match = _PARTY_SIZE.search(text)
+    if match:
+        travellers = int(next(group for group in match.groups() if group))
+        # "family of 4" still says who is travelling
+        kept = match.group(0).split()[0] if match.group(2) else ""
+        text = text[:match.start()] + f" {kept} " + text[match.end():]
+
+    party = None
+    place_words = []
+    for word in _WORD.findall(text):
+        word = word.strip("'-")
+        if word in _PARTY_WORDS:
+            party = party or _PARTY_WORDS[word]
+        elif word and word not in _STOPWORDS:
+            place_words.append(word)
+    if known is not None:
+        destination, name = known
+        qualifiers = set(name.split()) | COUNTRY_NAMES.get(destination.country, set())
+        place_words = [word for word in place_words if word not in qualifiers] + [destination.id]
+
+    return NormalizedQuery(
+        destination=" ".join(sorted(set(place_words))),
+        days=days,
+        party=party,
+        budget=budget,
+        travellers=travellers,
+        currency=currency,
+    )
+
+
+def budget_currency(question: str) -> Optional[str]:
+    """Currency code of the budget in a question ("under ₹50k" -> "INR"), or None."""
+    match = _BUDGET.search(question.lower())
+    return _currency_of(match.group(0)) if match else None
+
+
+def _currency_of(amount: str) -> Optional[str]:
+    """Currency code of the symbol or word in a matched budget amount."""
+    for token in re.findall(r"[₹$€£]|[a-z]+", amount):
+        if token in _BUDGET_CURRENCIES:
+            return _BUDGET_CURRENCIES[token]
+    return None
+
+
+class HashingEmbedder:
+    """Dependency-free embedding: hashed character trigrams, L2-normalized.
+
+    Good enough to match re-orderings and small spelling differences of the
+    normalized query. Any object with ``embed_query(text) -> List[float]``
+    (e.g. a LangChain ``Embeddings``) can be used instead.
+    """
+
+    def __init__(self, dimensions: int = 256):
+        self.dimensions = dimensions
+
+    def embed_query(self, text: str) -> List[float]:
+        vector = [0.0] * self.dimensions
+        padded = f"  {text} "
+        for i in range(len(padded) - 2):
+            digest = hashlib.blake2b(padded[i:i + 3].encode("utf-8"), digest_size=4).digest()
+            vector[int.from_bytes(digest, "little") % self.dimensions] += 1.0
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        return [v / norm for v in vector]
+
+
+def _spelling_variant(destination: str) -> bool:
+    """True if the destination is one word the index did not resolve, the only kind fuzzy-matched."""
+    words = destination.split()
+    return len(words) == 1 and words[0] not in get_index().by_id
+
+
+class ResponseCache:
+    """SQLite-backed cache of final answers keyed on the normalized question.
+
+    Entries expire after ``ttl_seconds`` and the least recently used entries
+    are evicted once more than ``max_entries`` are stored. When an embedder is
+    given, a miss on the exact key for a destination the index could not
+    resolve falls back to the stored query whose destination is the most
+    similar spelling, among those with the same model, prompt version and
+    facets, if its cosine similarity is at least ``similarity_threshold``.
+    Only single-word destinations take part on either side, so extra words
+    such as "jaipur veg" never match a plain "jaipur" entry.
+    """
+
+    def __init__(self, path: str = "./cache/responses.sqlite3", ttl_seconds: int = 86400,
+                 max_entries: int = 5000, embedder=None, similarity_threshold: float = 0.85):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.embedder = embedder
+        self.similarity_threshold = similarity_threshold
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "fuzzy_hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS responses (
+                   key TEXT PRIMARY KEY,
+                   scope TEXT NOT NULL,
+                   facets TEXT NOT NULL,
+                   answer TEXT NOT NULL,
+                   embedding BLOB,
+                   created_at REAL NOT NULL,
+                   expires_at REAL NOT NULL,
+                   last_access REAL NOT NULL
+               )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_lru ON responses(last_access)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_scope ON responses(scope, facets)")
+        self._conn.commit()
+
+    @classmethod
+    def from_config(cls, config: dict) -> Optional["ResponseCache"]:
+        """Build the cache from the ``cache.response`` config section, or None if disabled."""
+        settings = (config.get("cache", {}) or {}).get("response", {}) or {}
+        if not settings.get("enabled", False):
+            return None
+        embedder = HashingEmbedder() if settings.get("similarity_lookup", False) else None
+        return cls(
+            path=settings.get("path", "./cache/responses.sqlite3"),
+            ttl_seconds=settings.get("ttl_seconds", 86400),
+            max_entries=settings.get("max_entries", 5000),
+            embedder=embedder,
+            similarity_threshold=settings.get("similarity_threshold", 0.85),
+        )
+
+    @staticmethod
+    def _scope(model_name: str, prompt_version: str) -> str:
+        return f"{model_name}|{prompt_version}"
+
+    @staticmethod
+    def _key(normalized: NormalizedQuery, scope: str) -> str:
+        payload = json.dumps([scope, asdict(normalized)], sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, question: str, model_name: str, prompt_version: str) -> Optional[str]:
+        """Return a cached answer for the question, or None on a miss."""
+        normalized = normalize_query(question)
+        if not normalized.destination:
+            return None
+        scope = self._scope(model_name, prompt_version)
+        key = self._key(normalized, scope)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT answer FROM responses WHERE key = ? AND expires_at > ?", (key, now)
+            ).fetchone()
+            if row is not None:
+                self._touch(key, now)
+                self._stats["hits"] += 1
+                record_cache_lookup("response", True)
+                return row[0]
+
+            if self.embedder is not None and _spelling_variant(normalized.destination):
+                match = self._nearest(normalized, scope, now)
+                if match is not None:
+                    self._touch(match[0], now)
+                    self._stats["fuzzy_hits"] += 1
+                    record_cache_lookup("response", True)
+                    return match[1]
+
+            self._stats["misses"] += 1
+            record_cache_lookup("response", False)
+            return None
+
+    def put(self, question: str, answer: str, model_name: str, prompt_version: str):
+        """Store the final answer for the question."""
+        normalized = normalize_query(question)
+        if not normalized.destination:
+            return
+        scope = self._scope(model_name, prompt_version)
+        key = self._key(normalized, scope)
+        embedding = None
+        if self.embedder is not None and _spelling_variant(normalized.destination):
+            embedding = array("f", self.embedder.embed_query(normalized.destination)).tobytes()
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, scope, normalized.facets(), answer, embedding,
+                 now, now + self.ttl_seconds, now),
+            )
+            self._stats["stores"] += 1
+            self._evict(now)
+            self._conn.commit()
+
+    def _touch(self, key: str, now: float):
+        self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+        self._conn.commit()
+
+    def _nearest(self, normalized: NormalizedQuery, scope: str, now: float):
+        query = self.embedder.embed_query(normalized.destination)
+        best, best_score = None, self.similarity_threshold
+        rows = self._conn.execute(
+            "SELECT key, answer, embedding FROM responses "
+            "WHERE scope = ? AND facets = ? AND expires_at > ? AND embedding IS NOT NULL",
+            (scope, normalized.facets(), now),
+        )
+        for key, answer, blob in rows:
+            stored = array("f")
+            stored.frombytes(blob)
+            if len(stored) != len(query):
+                continue
+            score = sum(a * b for a, b in zip(query, stored))
+            if score >= best_score:
+                best, best_score = (key, answer), score
+        return best
+
+    def _evict(self, now: float):
+        expired = self._conn.execute("DELETE FROM responses WHERE expires_at <= ?", (now,)).rowcount
+        overflow = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0] - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN "
+                "(SELECT key FROM responses ORDER BY last_access ASC LIMIT ?)",
+                (overflow,),
+            )
+        self._stats["evictions"] += expired + max(overflow, 0)
+
+    def stats(self) -> dict:
+        """Hit/miss counters plus the overall hit rate."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        lookups = stats["hits"] + stats["fuzzy_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["hits"] + stats["fuzzy_hits"]) / lookups if lookups else 0.0
+        return stats
@@ -1,5 +1,9 @@
 import os
 import datetime
+import uuid
+from LOGGER.logging import get_logger
+
+logger = get_logger(__name__)
 
 def save_document(response_text: str, directory: str = "./output"):
     """Export travel plan to Markdown file with proper formatting"""
@@ -23,18 +27,17 @@ def save_document(response_text: str, directory: str = "./output"):
             
     try:
         # Write to markdown file with UTF-8 encoding
-        # Generate timestamp-based filename
+        # Generate timestamp-based filename; the random suffix keeps plans saved in the same second apart
         timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-        filename = f"{directory}/AI_Trip_Planner_{timestamp}.md"
-
-        print(filename)
+        filename = f"{directory}/AI_Trip_Planner_{timestamp}_{uuid.uuid4().hex[:8]}.md"
 
-        with open(filename, 'w', encoding='utf-8') as f:
+        # "x" refuses to overwrite an existing plan
+        with open(filename, 'x', encoding='utf-8') as f:
             f.write(markdown_content)
         
-        print(f"Markdown file saved as: {filename}")
+        logger.info("travel plan saved", extra={"path": filename})
         return filename
         
     except Exception as e:
-        print(f"Error saving markdown file: {e}")
+        logger.exception("saving travel plan failed")
         return None
\ No newline at end of file
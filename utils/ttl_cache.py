@@ -0,0 +1,108 @@
+import threading
+import time
+from collections import OrderedDict
+from utils.metrics import record_cache_lookup
+
+
+class TTLCache:
+    """Thread-safe in-memory cache with per-entry expiry and LRU eviction.
+
+    Shared by the upstream clients (weather, currency, place search) so that
+    repeated lookups for the same key within the TTL never leave the process.
+    Hits and misses of a cache given a ``name`` are exported as metrics.
+    """
+
+    _MISSING = object()
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 600, name: str = None):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        """Return the cached value for ``key`` or ``default`` if absent or expired."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key, self._MISSING)
+            if entry is self._MISSING or entry[0] <= now:
+                if entry is not self._MISSING:
+                    del self._data[key]
+                self.misses += 1
+                hit, value = False, default
+            else:
+                self._data.move_to_end(key)
+                self.hits += 1
+                hit, value = True, entry[1]
+        if self.name:
+            record_cache_lookup(self.name, hit)
+        return value
+
+    def set(self, key, value, ttl: float = None):
+        """Store ``value`` for ``ttl`` seconds (the cache default when omitted)."""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_load(self, key, loader, ttl=None):
+        """Return the cached value for ``key``, calling ``loader()`` on a miss.
+
+        Concurrent misses for the same key are collapsed into a single
+        ``loader()`` call (single-flight); the other callers wait for its
+        result, or its exception. ``ttl`` may be a number or a callable that
+        receives the loaded value and returns the number of seconds to keep it.
+        """
+        value = self.get(key, self._MISSING)
+        if value is not self._MISSING:
+            return value
+
+        with self._lock:
+            # Another leader may have filled the entry since the miss above
+            entry = self._data.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                return entry[1]
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = loader()
+            self.set(key, flight.value, ttl=ttl(flight.value) if callable(ttl) else ttl)
+            return flight.value
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            flight.done.set()
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class _Flight:
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
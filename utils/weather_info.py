@@ -1,34 +1,250 @@
+import asyncio
+import datetime
+import os
 import requests
+import httpx
+from array import array
+from collections import Counter
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from utils.ttl_cache import TTLCache
+from utils.metrics import upstream
+from utils.destination_index import resolve
+
+# Retried on these statuses as well as on connection errors
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# OpenWeather's free forecast covers 5 days in 3-hour slots
+SLOTS_PER_DAY = 8
+MAX_FORECAST_SLOTS = 40
+
+# Shared by every WeatherForecastTool in the process, keyed on (endpoint, place, ...)
+_weather_cache = TTLCache(maxsize=2048, name="weather")
+
+
+def _build_session(pool_size: int, retries: int, backoff: float) -> requests.Session:
+    session = requests.Session()
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset(["GET"]),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def describe_condition(code: int) -> str:
+    """Human-readable group for an OpenWeather condition code."""
+    if code == 800:
+        return "clear"
+    groups = {2: "thunderstorm", 3: "drizzle", 5: "rain", 6: "snow", 7: "haze/fog", 8: "cloudy"}
+    return groups.get(code // 100, "unknown")
+
+
+class DailyForecast:
+    """One day of a ForecastRecord, aggregated from its 3-hour slots."""
+    __slots__ = ("date", "temp_min", "temp_max", "precipitation_probability", "condition_code")
+
+    def __init__(self, date: str, temp_min: float, temp_max: float,
+                 precipitation_probability: float, condition_code: int):
+        self.date = date
+        self.temp_min = temp_min
+        self.temp_max = temp_max
+        self.precipitation_probability = precipitation_probability
+        self.condition_code = condition_code
+
+    def to_dict(self) -> dict:
+        return {
+            "date": self.date,
+            "min_c": round(self.temp_min, 1),
+            "max_c": round(self.temp_max, 1),
+            "rain_chance": round(self.precipitation_probability, 2),
+            "condition": describe_condition(self.condition_code),
+        }
+
+
+class ForecastRecord:
+    """Compact, array-backed forecast: one entry per 3-hour slot.
+
+    Holds only what the planner needs (time, min/max temperature,
+    precipitation probability, condition code) instead of the provider's
+    nested JSON, so a full 5-day horizon stays small in memory, in the cache
+    and in the prompt.
+    """
+    __slots__ = ("place", "country", "utc_offset", "timestamps", "temp_min", "temp_max",
+                 "precipitation_probability", "condition_codes")
+
+    def __init__(self, place: str, country: str = None, utc_offset: int = 0):
+        self.place = place
+        self.country = country
+        self.utc_offset = utc_offset
+        self.timestamps = array("q")
+        self.temp_min = array("f")
+        self.temp_max = array("f")
+        self.precipitation_probability = array("f")
+        self.condition_codes = array("H")
+
+    @classmethod
+    def from_openweather(cls, payload: dict) -> "ForecastRecord":
+        city = payload.get("city", {})
+        record = cls(city.get("name", ""), city.get("country"), city.get("timezone", 0))
+        for slot in payload.get("list", []):
+            main = slot.get("main", {})
+            weather = slot.get("weather") or [{}]
+            record.timestamps.append(int(slot.get("dt", 0)))
+            record.temp_min.append(float(main.get("temp_min", main.get("temp", 0.0))))
+            record.temp_max.append(float(main.get("temp_max", main.get("temp", 0.0))))
+            record.precipitation_probability.append(float(slot.get("pop", 0.0)))
+            record.condition_codes.append(int(weather[0].get("id", 0)))
+        return record
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def daily(self) -> list:
+        """Aggregate the slots into per-day forecasts in the destination's local time."""
+        days = {}
+        for i, ts in enumerate(self.timestamps):
+            local = datetime.datetime.fromtimestamp(ts + self.utc_offset, tz=datetime.timezone.utc)
+            days.setdefault(local.date().isoformat(), []).append(i)
+        result = []
+        for date, idx in days.items():
+            codes = Counter(self.condition_codes[i] for i in idx)
+            result.append(DailyForecast(
+                date,
+                min(self.temp_min[i] for i in idx),
+                max(self.temp_max[i] for i in idx),
+                max(self.precipitation_probability[i] for i in idx),
+                codes.most_common(1)[0][0],
+            ))
+        return result
+
+    def to_dict(self) -> dict:
+        """Per-day summary, the form handed to the agent."""
+        return {
+            "place": self.place,
+            "country": self.country,
+            "days": [day.to_dict() for day in self.daily()],
+        }
+
 
 class WeatherForecastTool:
-    def __init__(self, api_key:str):
+    """OpenWeather client with a pooled session, timeouts, retries and a TTL cache.
+
+    Current conditions are cached for ``current_ttl`` seconds and forecasts for
+    ``forecast_ttl`` seconds. OpenWeather refreshes forecasts in 3-hour slots
+    and current weather roughly every 10 minutes, so there is no point asking
+    again for every request.
+    """
+
+    def __init__(self, api_key:str, timeout: tuple = (3.05, 10), retries: int = 2,
+                 backoff: float = 0.5, pool_size: int = 10,
+                 current_ttl: float = 600, forecast_ttl: float = 3600):
         self.api_key = api_key
-        self.base_url = "https://api.openweathermap.org/data/2.5"
+        self.base_url = os.getenv("OPENWEATHER_BASE_URL", "https://api.openweathermap.org/data/2.5")
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.current_ttl = current_ttl
+        self.forecast_ttl = forecast_ttl
+        self.cache = _weather_cache
+        self.session = _build_session(pool_size, retries, backoff)
+        self._async_client = None
+
+    @staticmethod
+    def _cache_key(endpoint: str, params: dict, parse=None):
+        place = str(params.get("q", "")).strip().lower()
+        extra = tuple(sorted((k, v) for k, v in params.items() if k not in ("q", "appid")))
+        return (endpoint, place, extra, getattr(parse, "__qualname__", None))
+
+    def _get(self, endpoint: str, params: dict, ttl: float, parse=None):
+        key = self._cache_key(endpoint, params, parse)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        with upstream("openweather") as span:
+            response = self.session.get(f"{self.base_url}/{endpoint}",
+                                        params={**params, "appid": self.api_key},
+                                        timeout=self.timeout)
+            span["status"] = str(response.status_code)
+        if response.status_code != 200:
+            return {}
+        data = parse(response.json()) if parse else response.json()
+        self.cache.set(key, data, ttl=ttl)
+        return data
+
+    async def _aget(self, endpoint: str, params: dict, ttl: float, parse=None):
+        key = self._cache_key(endpoint, params, parse)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        if self._async_client is None:
+            connect, read = self.timeout
+            self._async_client = httpx.AsyncClient(
+                timeout=httpx.Timeout(read, connect=connect),
+                transport=httpx.AsyncHTTPTransport(retries=self.retries),
+            )
+        for attempt in range(self.retries + 1):
+            with upstream("openweather") as span:
+                response = await self._async_client.get(f"{self.base_url}/{endpoint}",
+                                                        params={**params, "appid": self.api_key})
+                span["status"] = str(response.status_code)
+            if response.status_code not in RETRY_STATUSES or attempt == self.retries:
+                break
+            await asyncio.sleep(self.backoff * (2 ** attempt))
+        if response.status_code != 200:
+            return {}
+        data = parse(response.json()) if parse else response.json()
+        self.cache.set(key, data, ttl=ttl)
+        return data
+
+    @staticmethod
+    def _place_params(place: str) -> dict:
+        """Coordinates of a known destination, so every spelling hits one cache entry and
+        OpenWeather does no geocoding; unknown places are sent as free text."""
+        destination = resolve(place)
+        if destination is not None:
+            return {"lat": destination.lat, "lon": destination.lon}
+        return {"q": place}
+
+    @classmethod
+    def _forecast_params(cls, place: str, days: int) -> dict:
+        return {**cls._place_params(place), "cnt": min(max(days, 1) * SLOTS_PER_DAY, MAX_FORECAST_SLOTS),
+                "units": "metric"}
 
     def get_current_weather(self, place:str):
         """Get current weather of a place"""
-        try:
-            url = f"{self.base_url}/weather"
-            params = {
-                "q": place,
-                "appid": self.api_key,
-            }
-            response = requests.get(url, params=params)
-            return response.json() if response.status_code == 200 else {}
-        except Exception as e:
-            raise e
-    
+        return self._get("weather", self._place_params(place), self.current_ttl)
+
     def get_forecast_weather(self, place:str):
         """Get weather forecast of a place"""
-        try:
-            url = f"{self.base_url}/forecast"
-            params = {
-                "q": place,
-                "appid": self.api_key,
-                "cnt": 10,
-                "units": "metric"
-            }
-            response = requests.get(url, params=params)
-            return response.json() if response.status_code == 200 else {}
-        except Exception as e:
-            raise e
\ No newline at end of file
+        return self._get("forecast", {**self._place_params(place), "cnt": 10, "units": "metric"},
+                         self.forecast_ttl)
+
+    def get_forecast(self, place: str, days: int = 5):
+        """Get a compact ForecastRecord covering ``days`` days (at most 5), or {} on failure"""
+        return self._get("forecast", self._forecast_params(place, days), self.forecast_ttl,
+                         parse=ForecastRecord.from_openweather)
+
+    async def aget_current_weather(self, place:str):
+        """Async variant of get_current_weather"""
+        return await self._aget("weather", self._place_params(place), self.current_ttl)
+
+    async def aget_forecast_weather(self, place:str):
+        """Async variant of get_forecast_weather"""
+        return await self._aget("forecast", {**self._place_params(place), "cnt": 10, "units": "metric"},
+                                self.forecast_ttl)
+
+    async def aget_forecast(self, place: str, days: int = 5):
+        """Async variant of get_forecast"""
+        return await self._aget("forecast", self._forecast_params(place, days), self.forecast_ttl,
+                                parse=ForecastRecord.from_openweather)
+
+    async def aclose(self):
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None